@@ -7,4 +7,74 @@ class Config:
 
     # Path setup to locate data/mock_db.json relative to this file
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    JSON_DB_PATH = os.path.join(BASE_DIR, '../database/mock_db.json')
\ No newline at end of file
+    JSON_DB_PATH = os.path.join(BASE_DIR, '../database/mock_db.json')
+
+    # Storage mode for app/data_manager.py collections:
+    # 'snapshot' rewrites the whole JSON file on every mutation,
+    # 'wal' appends each mutation to database/wal/<collection>.ndjson,
+    # 'write_behind' applies mutations in memory and flushes them in the background
+    DATA_WRITE_MODE = os.environ.get('DATA_WRITE_MODE') or 'snapshot'
+    # Fold a log into its snapshot once it grows past this many bytes
+    WAL_COMPACT_BYTES = int(os.environ.get('WAL_COMPACT_BYTES') or 1024 * 1024)
+    # Write-behind: flush a collection after this long without writes...
+    WRITE_BEHIND_INTERVAL_MS = int(os.environ.get('WRITE_BEHIND_INTERVAL_MS') or 200)
+    # ...but never leave a write unflushed for longer than this
+    WRITE_BEHIND_MAX_STALENESS_MS = int(os.environ.get('WRITE_BEHIND_MAX_STALENESS_MS') or 2000)
+
+    # 'json' keeps data_manager collections in database/*.json; 'sqlite' stores
+    # them in SQLITE_DB_PATH (import once with `python -m app.tools.sqlite_import`)
+    DATA_STORAGE_ENGINE = os.environ.get('DATA_STORAGE_ENGINE') or 'json'
+    SQLITE_DB_PATH = os.environ.get('SQLITE_DB_PATH') or os.path.join(BASE_DIR, '../database/tutor_support.sqlite3')
+
+    # Binary snapshot of database/*.json used for fast startup while it is up to date
+    # (write it with `python -m app.tools.snapshot_dump`)
+    DATA_SNAPSHOT_PATH = os.environ.get('DATA_SNAPSHOT_PATH') or os.path.join(BASE_DIR, '../database/snapshot.bin')
+
+    # IDs (TS/ASN/BK/slot) reserved per process at a time from database/mock_sequences.json
+    ID_BLOCK_SIZE = int(os.environ.get('ID_BLOCK_SIZE') or 20)
+
+    # Semantic tutor search: 'background' loads the model on a thread at startup,
+    # 'lazy' on the first search; until then search falls back to exact course matches
+    SEMANTIC_SEARCH_WARMUP = os.environ.get('SEMANTIC_SEARCH_WARMUP') or 'background'
+    # Lecturer embeddings persisted per model (memory-mapped .npy + sidecar of content hashes)
+    EMBEDDING_STORE_DIR = os.environ.get('EMBEDDING_STORE_DIR') or os.path.join(BASE_DIR, '../database/embeddings')
+    # Seconds between checks of the datacore for new/edited/deleted tutors (0 disables the watcher)
+    SEMANTIC_SEARCH_REINDEX_SECONDS = float(os.environ.get('SEMANTIC_SEARCH_REINDEX_SECONDS') or 5)
+    # How often each worker checks whether another worker published a rebuilt index
+    SEMANTIC_SEARCH_VERSION_POLL_SECONDS = float(os.environ.get('SEMANTIC_SEARCH_VERSION_POLL_SECONDS') or 1)
+    # Top-k backend for semantic search: 'exact' (scan every tutor) or 'ivf' (k-means inverted lists;
+    # SEMANTIC_SEARCH_IVF_LISTS=0 picks ~sqrt(n) lists, higher NPROBE = better recall, slower queries)
+    SEMANTIC_SEARCH_INDEX = os.environ.get('SEMANTIC_SEARCH_INDEX') or 'exact'
+    SEMANTIC_SEARCH_IVF_LISTS = int(os.environ.get('SEMANTIC_SEARCH_IVF_LISTS') or 0)
+    SEMANTIC_SEARCH_IVF_NPROBE = int(os.environ.get('SEMANTIC_SEARCH_IVF_NPROBE') or 8)
+    # LRU caches of query embeddings and of ranked results (per index version); size 0 disables
+    SEMANTIC_SEARCH_QUERY_CACHE_SIZE = int(os.environ.get('SEMANTIC_SEARCH_QUERY_CACHE_SIZE') or 1024)
+    SEMANTIC_SEARCH_RESULT_CACHE_SIZE = int(os.environ.get('SEMANTIC_SEARCH_RESULT_CACHE_SIZE') or 1024)
+    SEMANTIC_SEARCH_CACHE_TTL_SECONDS = float(os.environ.get('SEMANTIC_SEARCH_CACHE_TTL_SECONDS') or 3600)
+    # Concurrent query encodes are batched: up to BATCH_SIZE texts, waiting at most BATCH_WAIT_MS (size 1 = off)
+    SEMANTIC_SEARCH_BATCH_SIZE = int(os.environ.get('SEMANTIC_SEARCH_BATCH_SIZE') or 32)
+    SEMANTIC_SEARCH_BATCH_WAIT_MS = float(os.environ.get('SEMANTIC_SEARCH_BATCH_WAIT_MS') or 5)
+    # Where query encoding and vector search run: 'thread' or 'process' (each worker process loads the model);
+    # submits beyond WORKERS running + MAX_QUEUE waiting are rejected and the search falls back to exact matches
+    SEMANTIC_SEARCH_POOL = os.environ.get('SEMANTIC_SEARCH_POOL') or 'thread'
+    SEMANTIC_SEARCH_POOL_WORKERS = int(os.environ.get('SEMANTIC_SEARCH_POOL_WORKERS') or 2)
+    SEMANTIC_SEARCH_POOL_MAX_QUEUE = int(os.environ.get('SEMANTIC_SEARCH_POOL_MAX_QUEUE') or 64)
+    # 'hybrid': BM25 over tutor subjects/bio/qualifications picks CANDIDATES tutors, reranked by
+    # FUSION_WEIGHT * cosine + (1 - FUSION_WEIGHT) * normalized BM25; 'semantic': embeddings only
+    SEMANTIC_SEARCH_RETRIEVAL = os.environ.get('SEMANTIC_SEARCH_RETRIEVAL') or 'hybrid'
+    SEMANTIC_SEARCH_CANDIDATES = int(os.environ.get('SEMANTIC_SEARCH_CANDIDATES') or 50)
+    SEMANTIC_SEARCH_FUSION_WEIGHT = float(os.environ.get('SEMANTIC_SEARCH_FUSION_WEIGHT') or 0.7)
+    # Lecturer embeddings in memory: 'float32', 'float16' (half the size) or 'int8' (a quarter, per-row scale);
+    # `python benchmarks/bench_quantization.py` reports footprint and recall@k of each
+    SEMANTIC_SEARCH_EMBEDDING_DTYPE = os.environ.get('SEMANTIC_SEARCH_EMBEDDING_DTYPE') or 'float32'
+    # Availability-aware ranking: WEIGHT x availability score (earliest free slot, free hours in the next
+    # DAYS days, pending bookings) is added to relevance; the summary is rebuilt on slot/booking changes
+    # and at least every REFRESH_SECONDS
+    SEMANTIC_SEARCH_AVAILABILITY_WEIGHT = float(os.environ.get('SEMANTIC_SEARCH_AVAILABILITY_WEIGHT') or 0.1)
+    SEMANTIC_SEARCH_AVAILABILITY_DAYS = float(os.environ.get('SEMANTIC_SEARCH_AVAILABILITY_DAYS') or 14)
+    SEMANTIC_SEARCH_AVAILABILITY_REFRESH_SECONDS = float(
+        os.environ.get('SEMANTIC_SEARCH_AVAILABILITY_REFRESH_SECONDS') or 60)
+    # Recommended tutors: top N tutors per student precomputed from course embeddings and shared courses
+    # (SEMANTIC_WEIGHT is the embedding share of the affinity); refreshed with the semantic index
+    RECOMMENDATIONS_TOP_N = int(os.environ.get('RECOMMENDATIONS_TOP_N') or 50)
+    RECOMMENDATIONS_SEMANTIC_WEIGHT = float(os.environ.get('RECOMMENDATIONS_SEMANTIC_WEIGHT') or 0.5)
@@ -1,6 +1,8 @@
 from flask import Flask, render_template,redirect, url_for
 from .Config import Config
 from .extensions import db, ma
+from .data_manager import MockDataManager
+from . import snapshot
 
 
 def create_app(config_class=Config):
@@ -22,6 +24,7 @@ def create_app(config_class=Config):
     # 1. Initialize Extensions
     db.init_app(app)
     ma.init_app(app)
+    MockDataManager.configure(app.config)
 
     # 2. Register Blueprints
     from app.modules.auth.routes import auth_bp
@@ -37,6 +40,10 @@ def create_app(config_class=Config):
 
     from app.modules.student.routes import student_bp
     app.register_blueprint(student_bp)
+    from app.modules.student import tutorSearchService, tutorRecommender
+    # Registered before warm-up starts, so the first index load builds the table
+    tutorRecommender.configure(app.config)
+    tutorSearchService.configure(app.config)
 
     @app.route("/tutor")
     def tutor_dashboard_page():
@@ -49,4 +56,7 @@ def create_app(config_class=Config):
     def index():
         return redirect(url_for("auth.login_get"))
 
+    # Every store has taken its data from the snapshot by now
+    snapshot.release()
+
     return app
@@ -5,24 +5,549 @@ Provides helper functions to interact with JSON mock data without exposing file
 
 import json
 import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext, ExitStack
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple, Callable
 from datetime import datetime, timezone
 
+from app import snapshot
+from app.file_lock import FileLock, atomic_write_json, write_temp_json
+from app.sqlite_storage import SqliteStorage, SQLITE_TABLES
+from app.write_behind import WriteBehindFlusher, install_shutdown_hooks
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 BASE_DB_PATH = Path(__file__).parent.parent / 'database'
 
+# Collections that get hash indexes: filename -> (collection key, unique field, grouped fields)
+INDEXED_COLLECTIONS = {
+    'mock_datacore.json': ('users', 'id', ('role_in_school', 'subjects')),
+    'mock_tutor_sessions.json': ('sessions', 'session_id', ('tutor_id',)),
+    'mock_assignments.json': ('assignments', 'assignment_id', ('tutor_id', 'student_id')),
+    'mock_student_bookings.json': ('bookings', 'booking_id', ('student_id', 'tutor_id', 'session_id')),
+    'mock_notification_dtb.json': ('notifications', 'id', ('recipient_id',)),
+}
+
+
+class RecordIndex:
+    """
+    Hash indexes over one collection of a loaded JSON snapshot.
+
+    Maps the unique field to its record and each grouped field to the list of
+    records sharing a value (list-valued fields such as 'subjects' are indexed
+    per element). Records are indexed by reference, so in-place edits of
+    non-indexed fields need no maintenance; appended records are picked up by
+    sync().
+    """
+
+    def __init__(self, data: Dict[str, Any], collection: str, key_field: str, group_fields: Tuple[str, ...]):
+        self.data = data
+        self.collection = collection
+        self.key_field = key_field
+        self.group_fields = group_fields
+        self._records: List[Dict] = []
+        self._size = 0
+        self.by_key: Dict[Any, Dict] = {}
+        self.groups: Dict[str, Dict[Any, List[Dict]]] = {}
+        self.sync()
+
+    def _rebuild(self, records: List[Dict]):
+        self._records = records
+        self._size = 0
+        self.by_key = {}
+        self.groups = {field: {} for field in self.group_fields}
+
+    def _add(self, record: Dict):
+        # Keep the first record per key, matching the old linear-scan semantics
+        self.by_key.setdefault(record.get(self.key_field), record)
+        for field in self.group_fields:
+            values = record.get(field)
+            if not isinstance(values, list):
+                values = [values]
+            for value in values:
+                self.groups[field].setdefault(value, []).append(record)
+
+    def sync(self):
+        """Bring the indexes up to date with the snapshot's record list."""
+        records = self.data.get(self.collection)
+        if not isinstance(records, list):
+            records = []
+        if records is not self._records or len(records) < self._size:
+            self._rebuild(records)
+        for record in records[self._size:]:
+            self._add(record)
+        self._size = len(records)
+
+    def reindex(self):
+        """Rebuild the indexes from scratch (after an indexed field changed in place)."""
+        self._rebuild(self._records)
+        self.sync()
+
+    def get(self, value: Any) -> Optional[Dict]:
+        """Return the record whose unique field equals value."""
+        return self.by_key.get(value)
+
+    def group(self, field: str, value: Any) -> List[Dict]:
+        """Return all records whose grouped field equals (or contains) value."""
+        return list(self.groups[field].get(value, []))
+
+    def all(self) -> List[Dict]:
+        """Return every record in the collection."""
+        return self._records
+
+
+def _matches(record: Dict, field: str, value: Any) -> bool:
+    """True if record's field equals value (or contains it, for list fields)."""
+    current = record.get(field)
+    if isinstance(current, list):
+        return value in current
+    return current == value
+
+
+class StagedCollection:
+    """
+    Copy-on-write view of an indexed collection inside data_transaction().
+
+    Reads fall through to the committed index; staged inserts, updates and
+    deletes are kept here (and as log entries) until the transaction commits.
+    """
+
+    def __init__(self, filename: str, base):
+        self.filename = filename
+        self.base = base
+        self.collection, self.key_field, _ = INDEXED_COLLECTIONS[filename]
+        self.changed: Dict[Any, Optional[Dict]] = {}  # key -> staged record, None when deleted
+        self.inserted: Dict[Any, None] = {}  # keys new to the base, in insertion order
+        self.entries: List[Dict[str, Any]] = []
+
+    def get(self, value: Any) -> Optional[Dict]:
+        if value in self.changed:
+            return self.changed[value]
+        return self.base.get(value)
+
+    def group(self, field: str, value: Any) -> List[Dict]:
+        result, seen = [], set()
+        for record in self.base.group(field, value):
+            key = record.get(self.key_field)
+            seen.add(key)
+            record = self.changed.get(key, record)
+            if record is not None and _matches(record, field, value):
+                result.append(record)
+        for key, record in self.changed.items():
+            if key not in seen and record is not None and _matches(record, field, value):
+                result.append(record)
+        return result
+
+    def all(self) -> List[Dict]:
+        records = []
+        for record in self.base.all():
+            key = record.get(self.key_field)
+            record = self.changed.get(key, record)
+            if record is not None:
+                records.append(record)
+        records.extend(self.changed[key] for key in self.inserted if self.changed[key] is not None)
+        return records
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {**self.base.data, self.collection: self.all()}
+
+    def insert(self, record: Dict[str, Any]) -> bool:
+        key = record.get(self.key_field)
+        if self.get(key) is not None:
+            return False
+        if self.base.get(key) is None:
+            self.inserted[key] = None
+        self.changed[key] = record
+        self.entries.append({'op': 'insert', 'record': record})
+        return True
+
+    def update(self, key: Any, changes: Dict[str, Any]) -> Optional[Dict]:
+        record = self.get(key)
+        if record is None:
+            return None
+        record = {**record, **changes}
+        self.changed[key] = record
+        self.entries.append({'op': 'update', 'key': key, 'changes': changes})
+        return record
+
+    def delete(self, key: Any) -> bool:
+        if self.get(key) is None:
+            return False
+        self.changed[key] = None
+        self.entries.append({'op': 'delete', 'key': key})
+        return True
+
+
+class DataTransaction:
+    """Per-thread unit of work opened by data_transaction()."""
+
+    def __init__(self):
+        self.staged: Dict[str, StagedCollection] = {}
+        self.saves: Dict[str, Dict[str, Any]] = {}
+
+    def commit(self):
+        """
+        Write every touched file, all or nothing.
+
+        Exclusive locks on all touched files are taken up front, in name order,
+        so concurrent transactions over the same files cannot deadlock. Each
+        file is first written in a form that can still be undone: JSON files to
+        a temporary file, SQLite collections inside one SQLite transaction,
+        write-ahead log appends remembered so they can be truncated away. Only
+        when every file got that far are the temporary files renamed into place
+        and write-behind changes queued; otherwise all of it is undone and
+        RuntimeError is raised with nothing written.
+        """
+        touched = sorted(set(filename for filename, staged in self.staged.items() if staged.entries)
+                         | set(self.saves))
+        renames: List[Tuple[str, Dict[str, Any], str]] = []  # (filename, data, temporary file)
+        logs: List[Tuple[Path, int]] = []                    # (write-ahead log, size before the append)
+        deferred: List[Tuple[str, List[Dict[str, Any]]]] = []
+        storage = MockDataManager._sqlite
+        uses_sqlite = any(MockDataManager._sqlite_for(filename) is not None for filename in touched)
+        with ExitStack() as stack:
+            for filename in touched:
+                stack.enter_context(MockDataManager.lock(filename).exclusive())
+            current = None
+            try:
+                with storage.transaction() if uses_sqlite else nullcontext():
+                    for current in touched:
+                        self._prepare(current, renames, logs, deferred)
+            except Exception as e:
+                self._undo(touched, renames, logs)
+                raise RuntimeError(f"Transaction flush failed for {current}: {e}") from e
+            # Renames within one directory; only an OS failure here could leave
+            # the unit partly installed
+            for filename, data, tmp_name in renames:
+                MockDataManager._install_snapshot(filename, data, tmp_name)
+        for filename, entries in deferred:
+            MockDataManager._defer(filename, entries)
+
+    def _prepare(self, filename: str, renames: List, logs: List, deferred: List) -> None:
+        """Write one file's changes in a form commit() can still undo (under its exclusive lock)."""
+        staged = self.staged.get(filename)
+        data = self.saves.get(filename)
+        if data is None and any(entry['op'] == 'save' for entry in staged.entries):
+            data = staged.data
+        storage = MockDataManager._sqlite_for(filename)
+        if storage is not None:
+            if data is not None:
+                storage.replace_all(filename, data.get(SQLITE_TABLES[filename][1], []))
+            else:
+                storage.apply(filename, staged.entries)
+            return
+        if data is None:
+            if MockDataManager._uses_wal(filename):
+                wal_path = MockDataManager._wal_path(filename)
+                logs.append((wal_path, wal_path.stat().st_size if wal_path.exists() else 0))
+                if not MockDataManager._write_log(filename, staged.entries):
+                    raise RuntimeError(f"could not append to {wal_path.name}")
+                return
+            if MockDataManager._uses_write_behind(filename):
+                deferred.append((filename, staged.entries))
+                return
+            # Replay onto the current file rather than saving the staged view,
+            # which may predate another process's commit.
+            data = MockDataManager.load_json(filename)
+            MockDataManager._apply_entries(filename, data, staged.entries)
+        renames.append((filename, data, write_temp_json(BASE_DB_PATH / filename, data, indent=2)))
+
+    @staticmethod
+    def _undo(touched: List[str], renames: List, logs: List) -> None:
+        """Discard a failed commit's temporary files and log appends, and drop the touched files' cache."""
+        for _, _, tmp_name in renames:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        for wal_path, size in logs:
+            if not wal_path.exists():
+                continue
+            try:
+                os.truncate(wal_path, size)
+            except OSError as e:
+                logger.error(f"Could not roll back {wal_path.name}: {e}")
+        for filename in touched:
+            MockDataManager.invalidate(filename)
+
+    def rollback(self):
+        """Discard staged changes; drop cached files that callers may have edited in place."""
+        for filename in self.saves:
+            MockDataManager.invalidate(filename)
+        self.staged.clear()
+        self.saves.clear()
+
+
+@contextmanager
+def data_transaction():
+    """
+    Group mutations across managers and NotificationService into one unit of work.
+
+    Inside the block writes are staged in memory and reads see them; on exit each
+    touched file is flushed once. If the block raises, nothing is written; if a
+    flush fails, none of the files are written and RuntimeError is raised.
+    Nested blocks join the outermost transaction.
+    """
+    current = MockDataManager._transaction()
+    if current is not None:
+        yield current
+        return
+
+    txn = DataTransaction()
+    MockDataManager._txn_local.current = txn
+    try:
+        yield txn
+    except BaseException:
+        MockDataManager._txn_local.current = None
+        txn.rollback()
+        raise
+    MockDataManager._txn_local.current = None
+    txn.commit()
+
 
 class MockDataManager:
     """Central manager for mock data operations."""
 
+    # Process-wide parse cache: file path -> (file signature, parsed data).
+    # Parsed data is shared between callers, so treat it as read-only unless
+    # it is written back with save_json(), append_record() or update_record().
+    _cache: Dict[str, Tuple[Tuple, Dict[str, Any]]] = {}
+    _cache_lock = threading.RLock()
+    _cache_hits = 0
+    _cache_misses = 0
+    # Indexes per cached snapshot: file path -> RecordIndex
+    _indexes: Dict[str, RecordIndex] = {}
+
+    # 'snapshot' rewrites the whole file per mutation; 'wal' appends each
+    # mutation of an indexed collection to database/wal/<name>.ndjson;
+    # 'write_behind' applies mutations in memory and flushes them in the background
+    write_mode = 'snapshot'
+    wal_compact_bytes = 1024 * 1024
+    write_behind: Optional[WriteBehindFlusher] = None
+    # Write-behind entries applied in memory but not yet on disk: filename -> entries
+    _pending: Dict[str, List[Dict[str, Any]]] = {}
+    # 'json' or 'sqlite'; the SQLite engine serves the files in SQLITE_TABLES
+    storage_engine = 'json'
+    _sqlite: Optional[SqliteStorage] = None
+    _compacting: set = set()
+    # Current data_transaction() per thread
+    _txn_local = threading.local()
+
+    @staticmethod
+    def _transaction() -> Optional[DataTransaction]:
+        return getattr(MockDataManager._txn_local, 'current', None)
+
+    @staticmethod
+    def configure(config: Dict[str, Any]) -> None:
+        """
+        Apply storage settings from a Flask config mapping.
+
+        Any write-ahead log left over from a WAL-mode run is replayed and folded
+        into its snapshot before the first request, whatever the new write mode
+        or storage engine, so its entries are neither lost nor replayed onto
+        newer data later. Pending write-behind
+        changes are flushed before the settings change. Files still matching
+        the binary snapshot (app/snapshot.py) are cached without parsing JSON.
+        """
+        if MockDataManager.write_behind is not None:
+            MockDataManager.write_behind.stop()
+            MockDataManager.write_behind = None
+        MockDataManager.write_mode = config.get('DATA_WRITE_MODE', MockDataManager.write_mode)
+        MockDataManager.wal_compact_bytes = int(config.get('WAL_COMPACT_BYTES', MockDataManager.wal_compact_bytes))
+        MockDataManager.storage_engine = config.get('DATA_STORAGE_ENGINE', MockDataManager.storage_engine)
+        SequenceManager.block_size = int(config.get('ID_BLOCK_SIZE', SequenceManager.block_size))
+        SequenceManager._blocks.clear()
+        MockDataManager.invalidate()
+        MockDataManager._recover_logs()
+        if MockDataManager.storage_engine == 'sqlite':
+            db_path = config.get('SQLITE_DB_PATH') or BASE_DB_PATH / 'tutor_support.sqlite3'
+            MockDataManager._sqlite = SqliteStorage(Path(db_path))
+            return
+        MockDataManager._sqlite = None
+        if MockDataManager.write_mode == 'write_behind':
+            MockDataManager.write_behind = WriteBehindFlusher(
+                int(config.get('WRITE_BEHIND_INTERVAL_MS', 200)),
+                int(config.get('WRITE_BEHIND_MAX_STALENESS_MS', 2000)))
+            install_shutdown_hooks(MockDataManager.flush_pending)
+        if config.get('DATA_SNAPSHOT_PATH'):
+            snapshot.use(Path(config['DATA_SNAPSHOT_PATH']))
+        MockDataManager._prime_from_snapshot()
+
+    @staticmethod
+    def _recover_logs() -> None:
+        """Fold every non-empty write-ahead log into its JSON snapshot and truncate it."""
+        for filename in INDEXED_COLLECTIONS:
+            wal_path = MockDataManager._wal_path(filename)
+            if not (wal_path.exists() and wal_path.stat().st_size):
+                continue
+            logger.info(f"Recovering {filename} from {wal_path.name}")
+            file_path = BASE_DB_PATH / filename
+            with MockDataManager.lock(filename).exclusive():
+                data = {}
+                if file_path.exists():
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                MockDataManager._apply_log(filename, data, wal_path.read_bytes())
+                atomic_write_json(file_path, data, indent=2)
+                open(wal_path, 'wb').close()
+            MockDataManager.invalidate(filename)
+
+    @staticmethod
+    def _prime_from_snapshot() -> None:
+        """Seed the parse cache with every file the binary snapshot still matches."""
+        primed = 0
+        for filename, (signature, data) in snapshot.fresh_entries(BASE_DB_PATH).items():
+            if MockDataManager._sqlite_for(filename) is not None:
+                continue
+            if MockDataManager._uses_wal(filename):
+                wal_signature = MockDataManager._wal_signature(MockDataManager._wal_path(filename))
+                if wal_signature[1]:
+                    continue
+                signature = (signature, wal_signature)
+            with MockDataManager._cache_lock:
+                MockDataManager._cache[str(BASE_DB_PATH / filename)] = (signature, data)
+            primed += 1
+        if primed:
+            logger.info(f"Primed {primed} files from snapshot")
+
+    @staticmethod
+    def lock(filename: str) -> FileLock:
+        """
+        Return the cross-process reader/writer lock for a database file.
+
+        Hold lock(filename).exclusive() around a read-modify-write of a file so
+        another worker cannot write between the read and the save.
+        """
+        return FileLock(BASE_DB_PATH / filename)
+
+    @staticmethod
+    def _signature(file_path: Path) -> Tuple[int, int, int]:
+        """Return the (mtime, size, inode) triple used to validate cache entries."""
+        stat = file_path.stat()
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @staticmethod
+    def _wal_path(filename: str) -> Path:
+        """Return the write-ahead log path for a collection file."""
+        return BASE_DB_PATH / 'wal' / f"{Path(filename).stem}.ndjson"
+
+    @staticmethod
+    def _uses_wal(filename: str) -> bool:
+        return (MockDataManager.write_mode == 'wal' and filename in INDEXED_COLLECTIONS
+                and MockDataManager._sqlite_for(filename) is None)
+
+    @staticmethod
+    def _uses_write_behind(filename: str) -> bool:
+        return (MockDataManager.write_behind is not None and filename in INDEXED_COLLECTIONS
+                and MockDataManager._sqlite_for(filename) is None)
+
+    @staticmethod
+    def _sqlite_for(filename: str) -> Optional[SqliteStorage]:
+        """Return the SQLite store when it serves filename, else None."""
+        if MockDataManager._sqlite is not None and filename in SQLITE_TABLES:
+            return MockDataManager._sqlite
+        return None
+
+    @staticmethod
+    def _wal_signature(wal_path: Path) -> Tuple[int, int, int]:
+        try:
+            return MockDataManager._signature(wal_path)
+        except FileNotFoundError:
+            return (0, 0, 0)
+
+    @staticmethod
+    def _apply_log(filename: str, data: Dict[str, Any], chunk: bytes) -> int:
+        """
+        Apply the complete NDJSON entries in chunk to data.
+
+        Returns:
+            Number of bytes consumed (a trailing partial line is left for later).
+        """
+        consumed = chunk.rfind(b'\n') + 1
+        if not consumed:
+            return 0
+        entries = []
+        for line in chunk[:consumed].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping corrupt log entry in {filename}: {e}")
+        MockDataManager._apply_entries(filename, data, entries)
+        return consumed
+
+    @staticmethod
+    def _apply_entries(filename: str, data: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """
+        Apply insert/update/delete entries to a collection's data in place.
+
+        Replay is idempotent: inserts of an existing key are skipped and updates
+        only set fields, so re-applying a log over its own snapshot is harmless.
+        """
+        collection, key_field, group_fields = INDEXED_COLLECTIONS[filename]
+        if not isinstance(data.get(collection), list):
+            data[collection] = []
+        key = str(BASE_DB_PATH / filename)
+        index = MockDataManager._indexes.get(key)
+        if index is None or index.data is not data:
+            index = RecordIndex(data, collection, key_field, group_fields)
+            MockDataManager._indexes[key] = index
+        else:
+            index.sync()
+
+        for entry in entries:
+            if entry.get('op') == 'insert':
+                record = entry.get('record') or {}
+                if index.get(record.get(key_field)) is None:
+                    data[collection].append(record)
+                    index.sync()
+            elif entry.get('op') == 'update':
+                record = index.get(entry.get('key'))
+                if record is not None:
+                    changes = entry.get('changes') or {}
+                    record.update(changes)
+                    if key_field in changes or set(changes) & set(group_fields):
+                        index.reindex()
+            elif entry.get('op') == 'delete':
+                record = index.get(entry.get('key'))
+                if record is not None:
+                    data[collection].remove(record)
+                    index.reindex()
+
+    @staticmethod
+    def _catch_up(filename: str, entry: Tuple, signature: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Bring a cached WAL-backed snapshot up to date by replaying only the
+        log bytes appended since it was cached. Returns None when the base file
+        or the log was replaced and a full reload is needed.
+        """
+        (old_base, old_wal), data = entry
+        base, wal = signature
+        if old_base != base or old_wal[2] not in (0, wal[2]) or wal[1] < old_wal[1]:
+            return None
+        consumed = old_wal[1]
+        if wal[1] > old_wal[1]:
+            with open(MockDataManager._wal_path(filename), 'rb') as f:
+                f.seek(old_wal[1])
+                chunk = f.read(wal[1] - old_wal[1])
+            consumed += MockDataManager._apply_log(filename, data, chunk)
+        MockDataManager._cache[str(BASE_DB_PATH / filename)] = ((base, (wal[0], consumed, wal[2])), data)
+        return data
+
     @staticmethod
     def load_json(filename: str) -> Dict[str, Any]:
         """
         Load data from a JSON file in the database directory.
+
+        Results are cached per file and served from memory until the file's
+        mtime, size or inode changes. In WAL mode the collection's log is
+        replayed on top of the snapshot, and later loads replay only new entries.
+        Files are parsed under a shared lock, so a load never observes a write
+        from another process half-way through.
         
         Args:
             filename: Name of the JSON file (e.g., 'mock_datacore.json')
@@ -30,14 +555,72 @@ class MockDataManager:
         Returns:
             Dictionary containing the parsed JSON data, or empty dict if file doesn't exist.
         """
+        txn = MockDataManager._transaction()
+        if txn is not None:
+            if filename in txn.saves:
+                return txn.saves[filename]
+            if filename in txn.staged:
+                return txn.staged[filename].data
+
         file_path = BASE_DB_PATH / filename
+        key = str(file_path)
+        uses_wal = MockDataManager._uses_wal(filename)
         try:
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
+            storage = MockDataManager._sqlite_for(filename)
+            if storage is not None:
+                return storage.collection(filename).data
+
+            try:
+                signature = MockDataManager._signature(file_path)
+            except FileNotFoundError:
                 logger.warning(f"File not found: {file_path}")
+                MockDataManager.invalidate(filename)
                 return {}
+            if uses_wal:
+                signature = (signature, MockDataManager._wal_signature(MockDataManager._wal_path(filename)))
+
+            with MockDataManager._cache_lock:
+                entry = MockDataManager._cache.get(key)
+                if entry is not None and entry[0] == signature:
+                    MockDataManager._cache_hits += 1
+                    return entry[1]
+
+            # Lock order: the file lock is always taken before _cache_lock,
+            # never while holding it.
+            with MockDataManager.lock(filename).shared():
+                if uses_wal:
+                    signature = (MockDataManager._signature(file_path),
+                                 MockDataManager._wal_signature(MockDataManager._wal_path(filename)))
+                    with MockDataManager._cache_lock:
+                        entry = MockDataManager._cache.get(key)
+                        if entry is not None and len(entry[0]) == 2:
+                            data = MockDataManager._catch_up(filename, entry, signature)
+                            if data is not None:
+                                MockDataManager._cache_hits += 1
+                                return data
+                else:
+                    signature = MockDataManager._signature(file_path)
+                with MockDataManager._cache_lock:
+                    MockDataManager._cache_misses += 1
+
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+                with MockDataManager._cache_lock:
+                    if uses_wal:
+                        base, wal = signature
+                        MockDataManager._cache[key] = ((base, (0, 0, wal[2])), data)
+                        data = MockDataManager._catch_up(filename, MockDataManager._cache[key], signature)
+                    else:
+                        MockDataManager._cache[key] = (signature, data)
+                        if MockDataManager._pending.get(filename):
+                            # Another worker rewrote the file; keep our unflushed changes
+                            MockDataManager._apply_entries(filename, data, MockDataManager._pending[filename])
+            return data
+        except FileNotFoundError:
+            logger.warning(f"File not found: {file_path}")
+            MockDataManager.invalidate(filename)
+            return {}
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error in {filename}: {e}")
             return {}
@@ -45,10 +628,90 @@ class MockDataManager:
             logger.error(f"Error loading {filename}: {e}")
             return {}
 
+    @staticmethod
+    def invalidate(filename: Optional[str] = None) -> None:
+        """
+        Drop cached data for one file, or for every file when filename is None.
+
+        Args:
+            filename: Name of the JSON file to evict from the cache
+        """
+        with MockDataManager._cache_lock:
+            if filename is None:
+                MockDataManager._cache.clear()
+                MockDataManager._indexes.clear()
+            else:
+                MockDataManager._cache.pop(str(BASE_DB_PATH / filename), None)
+
+    @staticmethod
+    def signature(filename: str) -> Optional[Tuple]:
+        """
+        Return a token that changes whenever filename's data does: the file (and
+        log) signature its cached data was loaded at, plus the number of
+        write-behind changes not yet flushed. None when the data is not cached
+        from a file (SQLite engine), i.e. when changes cannot be detected this way.
+        """
+        if MockDataManager._sqlite_for(filename) is not None:
+            return None
+        MockDataManager.load_json(filename)
+        with MockDataManager._cache_lock:
+            entry = MockDataManager._cache.get(str(BASE_DB_PATH / filename))
+            if entry is None:
+                return None
+            return entry[0], len(MockDataManager._pending.get(filename, ()))
+
+    @staticmethod
+    def get_index(filename: str) -> RecordIndex:
+        """
+        Return the hash indexes for an indexed collection file.
+
+        Indexes are built once per loaded snapshot and rebuilt only when the
+        file changes on disk; records appended in place are indexed incrementally.
+        Under the SQLite engine this is a SqliteCollection with the same interface.
+
+        Args:
+            filename: Name of a file listed in INDEXED_COLLECTIONS
+        """
+        txn = MockDataManager._transaction()
+        if txn is not None and filename in txn.staged:
+            return txn.staged[filename]
+        return MockDataManager._committed_index(filename)
+
+    @staticmethod
+    def _committed_index(filename: str):
+        storage = MockDataManager._sqlite_for(filename)
+        if storage is not None:
+            return storage.collection(filename)
+
+        collection, key_field, group_fields = INDEXED_COLLECTIONS[filename]
+        data = MockDataManager.load_json(filename)
+        key = str(BASE_DB_PATH / filename)
+        with MockDataManager._cache_lock:
+            index = MockDataManager._indexes.get(key)
+            if index is None or index.data is not data:
+                index = RecordIndex(data, collection, key_field, group_fields)
+                MockDataManager._indexes[key] = index
+            else:
+                index.sync()
+            return index
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Return cache hit/miss counters and the number of cached files."""
+        with MockDataManager._cache_lock:
+            return {
+                'hits': MockDataManager._cache_hits,
+                'misses': MockDataManager._cache_misses,
+                'entries': len(MockDataManager._cache)
+            }
+
     @staticmethod
     def save_json(filename: str, data: Dict[str, Any]) -> bool:
         """
         Save data to a JSON file in the database directory.
+
+        The file is replaced atomically under an exclusive lock. In WAL mode
+        this writes a full snapshot and truncates the collection's log.
         
         Args:
             filename: Name of the JSON file
@@ -57,17 +720,370 @@ class MockDataManager:
         Returns:
             True if successful, False otherwise.
         """
+        txn = MockDataManager._transaction()
+        if txn is not None:
+            txn.staged.pop(filename, None)
+            txn.saves[filename] = data
+            return True
+
         file_path = BASE_DB_PATH / filename
+        MockDataManager.invalidate(filename)
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            storage = MockDataManager._sqlite_for(filename)
+            if storage is not None:
+                storage.replace_all(filename, data.get(SQLITE_TABLES[filename][1], []))
+                return True
+
+            with MockDataManager.lock(filename).exclusive():
+                MockDataManager._install_snapshot(filename, data, write_temp_json(file_path, data, indent=2))
             logger.info(f"Successfully saved {filename}")
             return True
         except Exception as e:
+            MockDataManager.invalidate(filename)
             logger.error(f"Error saving {filename}: {e}")
             return False
 
+    @staticmethod
+    def _install_snapshot(filename: str, data: Dict[str, Any], tmp_name: str) -> None:
+        """Rename a temporary file holding data over filename and cache data (under the exclusive lock)."""
+        file_path = BASE_DB_PATH / filename
+        try:
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        # data is the in-memory state, so it already holds any deferred changes
+        with MockDataManager._cache_lock:
+            MockDataManager._pending.pop(filename, None)
+        signature = MockDataManager._signature(file_path)
+        if MockDataManager._uses_wal(filename):
+            wal_path = MockDataManager._wal_path(filename)
+            wal_path.parent.mkdir(parents=True, exist_ok=True)
+            open(wal_path, 'wb').close()
+            signature = (signature, MockDataManager._wal_signature(wal_path))
+        # The data we just wrote is the new snapshot; keep it warm.
+        with MockDataManager._cache_lock:
+            MockDataManager._cache[str(file_path)] = (signature, data)
+
+    @staticmethod
+    def _write_log(filename: str, entries: List[Dict[str, Any]]) -> bool:
+        """Append mutation entries to a collection's log and catch the cache up."""
+        wal_path = MockDataManager._wal_path(filename)
+        try:
+            with MockDataManager.lock(filename).exclusive():
+                wal_path.parent.mkdir(parents=True, exist_ok=True)
+                payload = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in entries)
+                with open(wal_path, 'a', encoding='utf-8') as f:
+                    f.write(payload)
+                log_size = wal_path.stat().st_size
+                MockDataManager.load_json(filename)
+        except Exception as e:
+            MockDataManager.invalidate(filename)
+            logger.error(f"Error appending to log for {filename}: {e}")
+            return False
+
+        if log_size >= MockDataManager.wal_compact_bytes:
+            MockDataManager._schedule_compaction(filename)
+        return True
+
+    @staticmethod
+    def _schedule_compaction(filename: str) -> None:
+        with MockDataManager._cache_lock:
+            if filename in MockDataManager._compacting:
+                return
+            MockDataManager._compacting.add(filename)
+
+        def run():
+            try:
+                MockDataManager.compact(filename)
+            finally:
+                with MockDataManager._cache_lock:
+                    MockDataManager._compacting.discard(filename)
+
+        threading.Thread(target=run, name=f"compact-{filename}", daemon=True).start()
+
+    @staticmethod
+    def compact(filename: str) -> bool:
+        """
+        Fold a collection's log into its JSON snapshot and truncate the log.
+
+        Args:
+            filename: Name of a file listed in INDEXED_COLLECTIONS
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not MockDataManager._uses_wal(filename):
+            return True
+        with MockDataManager.lock(filename).exclusive():
+            data = MockDataManager.load_json(filename)
+            return MockDataManager.save_json(filename, data)
+
+    @staticmethod
+    def _defer(filename: str, entries: List[Dict[str, Any]]) -> bool:
+        """Apply entries to the cached data now and queue the file for a write-behind flush."""
+        with MockDataManager.lock(filename).exclusive():
+            data = MockDataManager.load_json(filename)
+            with MockDataManager._cache_lock:
+                MockDataManager._apply_entries(filename, data, entries)
+                MockDataManager._pending.setdefault(filename, []).extend(entries)
+        MockDataManager.write_behind.mark_dirty(filename, lambda: MockDataManager._flush_pending_file(filename))
+        return True
+
+    @staticmethod
+    def _flush_pending_file(filename: str) -> bool:
+        with MockDataManager.lock(filename).exclusive():
+            data = MockDataManager.load_json(filename)
+            with MockDataManager._cache_lock:
+                entries = MockDataManager._pending.pop(filename, None)
+                if not entries:
+                    return True
+                # Idempotent; covers entries applied to a snapshot that was since reloaded
+                MockDataManager._apply_entries(filename, data, entries)
+            if MockDataManager.save_json(filename, data):
+                return True
+            with MockDataManager._cache_lock:
+                MockDataManager._pending[filename] = entries + MockDataManager._pending.get(filename, [])
+            return False
+
+    @staticmethod
+    def flush_pending(filename: Optional[str] = None) -> bool:
+        """
+        Write deferred write-behind changes to disk now.
+
+        Args:
+            filename: File to flush, or None to flush every dirty file
+
+        Returns:
+            True if successful (or nothing was pending), False otherwise.
+        """
+        if MockDataManager.write_behind is None:
+            return True
+        return MockDataManager.write_behind.flush(filename)
+
+    @staticmethod
+    def write_behind_stats() -> Dict[str, Any]:
+        """Return write-behind flush latency and coalesced-write counters."""
+        if MockDataManager.write_behind is None:
+            return {}
+        return MockDataManager.write_behind.stats()
+
+    @staticmethod
+    def _staged(filename: str) -> Optional[StagedCollection]:
+        """Return the current transaction's view of filename, creating it on first write."""
+        txn = MockDataManager._transaction()
+        if txn is None:
+            return None
+        if filename in txn.saves:
+            # A whole-file save is already pending; edit that data instead.
+            collection, key_field, group_fields = INDEXED_COLLECTIONS[filename]
+            data = txn.saves.pop(filename)
+            staged = StagedCollection(filename, RecordIndex(data, collection, key_field, group_fields))
+            # Flush as a full save so the earlier whole-file changes are kept
+            staged.entries.append({'op': 'save'})
+            txn.staged[filename] = staged
+        if filename not in txn.staged:
+            txn.staged[filename] = StagedCollection(filename, MockDataManager._committed_index(filename))
+        return txn.staged[filename]
+
+    @staticmethod
+    def append_record(filename: str, record: Dict[str, Any]) -> bool:
+        """
+        Append a record to an indexed collection.
+
+        Args:
+            filename: Name of a file listed in INDEXED_COLLECTIONS
+            record: Record to append
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        staged = MockDataManager._staged(filename)
+        if staged is not None:
+            return staged.insert(record)
+
+        storage = MockDataManager._sqlite_for(filename)
+        if storage is not None:
+            try:
+                return storage.insert(filename, record)
+            except Exception as e:
+                logger.error(f"Error inserting into {filename}: {e}")
+                return False
+
+        if MockDataManager._uses_wal(filename):
+            return MockDataManager._write_log(filename, [{'op': 'insert', 'record': record}])
+        if MockDataManager._uses_write_behind(filename):
+            return MockDataManager._defer(filename, [{'op': 'insert', 'record': record}])
+
+        collection = INDEXED_COLLECTIONS[filename][0]
+        with MockDataManager.lock(filename).exclusive():
+            data = MockDataManager.get_index(filename).data
+            if not isinstance(data.get(collection), list):
+                data[collection] = []
+            data[collection].append(record)
+            return MockDataManager.save_json(filename, data)
+
+    @staticmethod
+    def update_record(filename: str, key: Any, changes: Dict[str, Any]) -> Optional[Dict]:
+        """
+        Update fields of the record whose unique field equals key.
+
+        Args:
+            filename: Name of a file listed in INDEXED_COLLECTIONS
+            key: Value of the collection's unique field
+            changes: Fields to set on the record
+
+        Returns:
+            The updated record, or None if not found or the write failed.
+        """
+        staged = MockDataManager._staged(filename)
+        if staged is not None:
+            return staged.update(key, changes)
+
+        storage = MockDataManager._sqlite_for(filename)
+        if storage is not None:
+            try:
+                return storage.update(filename, key, changes)
+            except Exception as e:
+                logger.error(f"Error updating {filename}: {e}")
+                return None
+
+        with MockDataManager.lock(filename).exclusive():
+            index = MockDataManager.get_index(filename)
+            record = index.get(key)
+            if record is None:
+                return None
+
+            if MockDataManager._uses_wal(filename):
+                if not MockDataManager._write_log(filename, [{'op': 'update', 'key': key, 'changes': changes}]):
+                    return None
+                return MockDataManager.get_index(filename).get(key)
+            if MockDataManager._uses_write_behind(filename):
+                MockDataManager._defer(filename, [{'op': 'update', 'key': key, 'changes': changes}])
+                return MockDataManager.get_index(filename).get(key)
+
+            # The record and index are shared with readers, which sync under _cache_lock
+            with MockDataManager._cache_lock:
+                record.update(changes)
+                if index.key_field in changes or set(changes) & set(index.group_fields):
+                    index.reindex()
+            if MockDataManager.save_json(filename, index.data):
+                return record
+            return None
+
+    @staticmethod
+    def delete_record(filename: str, key: Any) -> bool:
+        """
+        Remove the record whose unique field equals key.
+
+        Args:
+            filename: Name of a file listed in INDEXED_COLLECTIONS
+            key: Value of the collection's unique field
+
+        Returns:
+            True if a record was removed, False otherwise.
+        """
+        staged = MockDataManager._staged(filename)
+        if staged is not None:
+            return staged.delete(key)
+
+        storage = MockDataManager._sqlite_for(filename)
+        if storage is not None:
+            try:
+                return storage.delete(filename, key)
+            except Exception as e:
+                logger.error(f"Error deleting from {filename}: {e}")
+                return False
+
+        with MockDataManager.lock(filename).exclusive():
+            index = MockDataManager.get_index(filename)
+            record = index.get(key)
+            if record is None:
+                return False
+
+            if MockDataManager._uses_wal(filename):
+                return MockDataManager._write_log(filename, [{'op': 'delete', 'key': key}])
+            if MockDataManager._uses_write_behind(filename):
+                return MockDataManager._defer(filename, [{'op': 'delete', 'key': key}])
+
+            with MockDataManager._cache_lock:
+                index.data[index.collection].remove(record)
+                index.reindex()
+            return MockDataManager.save_json(filename, index.data)
+
+
+class SequenceManager:
+    """
+    Allocates IDs from named sequences persisted in mock_sequences.json.
+
+    Each process reserves a block of values under an exclusive file lock and
+    hands them out from memory, so minting an ID does not scan the collection
+    and concurrent creators (threads or worker processes) never collide.
+    Unused values of a block are skipped after a restart.
+    """
+
+    FILENAME = 'mock_sequences.json'
+    block_size = 20
+    _lock = threading.Lock()
+    _blocks: Dict[str, List[int]] = {}  # name -> [next value, last reserved value]
+
+    @staticmethod
+    def _reserve(name: str, seed: Optional[Callable[[], int]]) -> List[int]:
+        """Reserve the next block of a sequence; seed() gives its start value if it is new."""
+        path = BASE_DB_PATH / SequenceManager.FILENAME
+        with FileLock(path).exclusive():
+            sequences = {}
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    sequences = json.load(f)
+            current = sequences.get(name)
+            if current is None:
+                current = seed() if seed else 0
+            sequences[name] = current + SequenceManager.block_size
+            atomic_write_json(path, sequences, indent=2)
+        return [current + 1, current + SequenceManager.block_size]
+
+    @staticmethod
+    def next_value(name: str, seed: Optional[Callable[[], int]] = None) -> int:
+        """
+        Return the next value of a sequence.
+
+        Args:
+            name: Sequence name (e.g. 'BK')
+            seed: Returns the current highest value; only called the first time
+                  the sequence is used, to continue from existing data.
+        """
+        with SequenceManager._lock:
+            block = SequenceManager._blocks.get(name)
+            if block is None or block[0] > block[1]:
+                block = SequenceManager._reserve(name, seed)
+                SequenceManager._blocks[name] = block
+            value = block[0]
+            block[0] += 1
+            return value
+
+    @staticmethod
+    def next_id(prefix: str, filename: str, field: str, width: int = 3) -> str:
+        """
+        Return the next '<prefix><number>' ID for a collection, e.g. 'BK028'.
+
+        The sequence is seeded from the highest existing ID in the collection.
+        """
+        def seed():
+            collection = INDEXED_COLLECTIONS[filename][0]
+            records = MockDataManager.load_json(filename).get(collection, [])
+            return max_id_number([r.get(field) for r in records], prefix)
+
+        return f"{prefix}{SequenceManager.next_value(prefix, seed):0{width}d}"
+
+
+def max_id_number(ids: List[Any], prefix: str) -> int:
+    """Return the highest numeric suffix among IDs that start with prefix (0 if none)."""
+    numbers = [int(i[len(prefix):]) for i in ids
+               if isinstance(i, str) and i.startswith(prefix) and i[len(prefix):].isdigit()]
+    return max(numbers, default=0)
+
 
 class DatacoreManager:
     """Manager for mock_datacore.json operations."""
@@ -75,11 +1091,12 @@ class DatacoreManager:
     @staticmethod
     def get_user_profile(sso_id: str) -> Optional[Dict]:
         """Get user profile by SSO ID from mock_datacore.json."""
-        data = MockDataManager.load_json('mock_datacore.json')
-        for user in data.get('users', []):
-            if user.get('id') == sso_id:
-                return user
-        return None
+        return MockDataManager.get_index('mock_datacore.json').get(sso_id)
+
+    @staticmethod
+    def signature() -> Optional[Tuple]:
+        """Return a token that changes whenever mock_datacore.json does (see MockDataManager.signature)."""
+        return MockDataManager.signature('mock_datacore.json')
 
     @staticmethod
     def get_all_users() -> List[Dict]:
@@ -90,18 +1107,14 @@ class DatacoreManager:
     @staticmethod
     def get_all_tutors() -> List[Dict]:
         """Get all tutors (users with role_in_school='lecturer') from mock_datacore.json."""
-        data = MockDataManager.load_json('mock_datacore.json')
-        tutors = [user for user in data.get('users', []) 
-                  if user.get('role_in_school') == 'lecturer']
-        return tutors
+        index = MockDataManager.get_index('mock_datacore.json')
+        return index.group('role_in_school', 'lecturer')
 
     @staticmethod
     def get_all_students() -> List[Dict]:
         """Get all students (users with role_in_school='student') from mock_datacore.json."""
-        data = MockDataManager.load_json('mock_datacore.json')
-        students = [user for user in data.get('users', []) 
-                    if user.get('role_in_school') == 'student']
-        return students
+        index = MockDataManager.get_index('mock_datacore.json')
+        return index.group('role_in_school', 'student')
 
     @staticmethod
     def find_tutors_by_course(course_name: str) -> List[Dict]:
@@ -114,15 +1127,9 @@ class DatacoreManager:
         Returns:
             List of tutor profiles matching the course.
         """
-        tutors = DatacoreManager.get_all_tutors()
-        matching_tutors = []
-        
-        for tutor in tutors:
-            subjects = tutor.get('subjects', [])
-            if course_name in subjects:
-                matching_tutors.append(tutor)
-        
-        return matching_tutors
+        index = MockDataManager.get_index('mock_datacore.json')
+        return [user for user in index.group('subjects', course_name)
+                if user.get('role_in_school') == 'lecturer']
 
     @staticmethod
     def get_tutor_by_id(tutor_id: str) -> Optional[Dict]:
@@ -155,17 +1162,12 @@ class TutorSessionManager:
         Returns:
             List of sessions belonging to the tutor.
         """
-        all_sessions = TutorSessionManager.get_all_sessions()
-        return [s for s in all_sessions if s.get('tutor_id') == tutor_id]
+        return MockDataManager.get_index('mock_tutor_sessions.json').group('tutor_id', tutor_id)
 
     @staticmethod
     def get_session_by_id(session_id: str) -> Optional[Dict]:
         """Get a specific tutor session by session ID."""
-        all_sessions = TutorSessionManager.get_all_sessions()
-        for session in all_sessions:
-            if session.get('session_id') == session_id:
-                return session
-        return None
+        return MockDataManager.get_index('mock_tutor_sessions.json').get(session_id)
 
     @staticmethod
     def create_session(tutor_id: str, course_name: str, date_time: str, 
@@ -185,12 +1187,7 @@ class TutorSessionManager:
         Returns:
             True if successful, False otherwise.
         """
-        data = MockDataManager.load_json('mock_tutor_sessions.json')
-        
-        # Generate new session ID
-        existing_ids = [s.get('session_id', 'TS000') for s in data.get('sessions', [])]
-        max_num = max([int(id.replace('TS', '')) for id in existing_ids if id.startswith('TS')], default=0)
-        new_session_id = f"TS{max_num + 1:03d}"
+        new_session_id = SequenceManager.next_id('TS', 'mock_tutor_sessions.json', 'session_id')
         
         new_session = {
             'session_id': new_session_id,
@@ -202,8 +1199,7 @@ class TutorSessionManager:
             'duration_minutes': duration_minutes
         }
         
-        data.get('sessions', []).append(new_session)
-        return MockDataManager.save_json('mock_tutor_sessions.json', data)
+        return MockDataManager.append_record('mock_tutor_sessions.json', new_session)
 
     @staticmethod
     def update_session(session_id: str, updates: Dict) -> Optional[Dict]:
@@ -211,20 +1207,10 @@ class TutorSessionManager:
 
         Returns the updated session dict or None if not found.
         """
-        data = MockDataManager.load_json('mock_tutor_sessions.json')
-        sessions = data.get('sessions', [])
-        for i, s in enumerate(sessions):
-            if s.get('session_id') == session_id:
-                # Apply allowed updates
-                allowed = {'date_time', 'location', 'status', 'duration_minutes', 'course_name'}
-                for k, v in updates.items():
-                    if k in allowed:
-                        s[k] = v
-                sessions[i] = s
-                data['sessions'] = sessions
-                success = MockDataManager.save_json('mock_tutor_sessions.json', data)
-                return s if success else None
-        return None
+        # Apply allowed updates
+        allowed = {'date_time', 'location', 'status', 'duration_minutes', 'course_name'}
+        changes = {k: v for k, v in updates.items() if k in allowed}
+        return MockDataManager.update_record('mock_tutor_sessions.json', session_id, changes)
 
 
 class AssignmentManager:
@@ -247,8 +1233,7 @@ class AssignmentManager:
         Returns:
             List of assignments for the tutor.
         """
-        all_assignments = AssignmentManager.get_all_assignments()
-        return [a for a in all_assignments if a.get('tutor_id') == tutor_id]
+        return MockDataManager.get_index('mock_assignments.json').group('tutor_id', tutor_id)
 
     @staticmethod
     def get_assignments_by_student(student_id: str) -> List[Dict]:
@@ -261,17 +1246,12 @@ class AssignmentManager:
         Returns:
             List of assignments for the student.
         """
-        all_assignments = AssignmentManager.get_all_assignments()
-        return [a for a in all_assignments if a.get('student_id') == student_id]
+        return MockDataManager.get_index('mock_assignments.json').group('student_id', student_id)
 
     @staticmethod
     def get_assignment_by_id(assignment_id: str) -> Optional[Dict]:
         """Get a specific assignment by assignment ID."""
-        all_assignments = AssignmentManager.get_all_assignments()
-        for assignment in all_assignments:
-            if assignment.get('assignment_id') == assignment_id:
-                return assignment
-        return None
+        return MockDataManager.get_index('mock_assignments.json').get(assignment_id)
 
     @staticmethod
     def create_assignment(tutor_id: str, student_id: str, student_name: str,
@@ -292,12 +1272,7 @@ class AssignmentManager:
         Returns:
             True if successful, False otherwise.
         """
-        data = MockDataManager.load_json('mock_assignments.json')
-        
-        # Generate new assignment ID
-        existing_ids = [a.get('assignment_id', 'ASN000') for a in data.get('assignments', [])]
-        max_num = max([int(id.replace('ASN', '')) for id in existing_ids if id.startswith('ASN')], default=0)
-        new_assignment_id = f"ASN{max_num + 1:03d}"
+        new_assignment_id = SequenceManager.next_id('ASN', 'mock_assignments.json', 'assignment_id')
         
         new_assignment = {
             'assignment_id': new_assignment_id,
@@ -310,8 +1285,7 @@ class AssignmentManager:
             'rating': rating
         }
         
-        data.get('assignments', []).append(new_assignment)
-        return MockDataManager.save_json('mock_assignments.json', data)
+        return MockDataManager.append_record('mock_assignments.json', new_assignment)
 
 
 class ScheduleManager:
@@ -382,17 +1356,12 @@ class StudentBookingManager:
         Returns:
             List of bookings belonging to the student.
         """
-        all_bookings = StudentBookingManager.get_all_bookings()
-        return [b for b in all_bookings if b.get('student_id') == student_id]
+        return MockDataManager.get_index('mock_student_bookings.json').group('student_id', student_id)
 
     @staticmethod
     def get_booking_by_id(booking_id: str) -> Optional[Dict]:
         """Get a specific booking by booking ID."""
-        all_bookings = StudentBookingManager.get_all_bookings()
-        for booking in all_bookings:
-            if booking.get('booking_id') == booking_id:
-                return booking
-        return None
+        return MockDataManager.get_index('mock_student_bookings.json').get(booking_id)
 
     @staticmethod
     def create_booking(student_id: str, tutor_id: str, session_id: str, 
@@ -413,18 +1382,14 @@ class StudentBookingManager:
         Returns:
             Booking ID if successful, None otherwise.
         """
-        data = MockDataManager.load_json('mock_student_bookings.json')
+        index = MockDataManager.get_index('mock_student_bookings.json')
         
         # Check if student already booked this session
-        for booking in data.get('bookings', []):
-            if (booking['student_id'] == student_id and 
-                booking['session_id'] == session_id):
+        for booking in index.group('student_id', student_id):
+            if booking['session_id'] == session_id:
                 return None  # Already booked
         
-        # Generate new booking ID
-        existing_ids = [b.get('booking_id', 'BK000') for b in data.get('bookings', [])]
-        max_num = max([int(id.replace('BK', '')) for id in existing_ids if id.startswith('BK')], default=0)
-        new_booking_id = f"BK{max_num + 1:03d}"
+        new_booking_id = SequenceManager.next_id('BK', 'mock_student_bookings.json', 'booking_id')
         
         new_booking = {
             'booking_id': new_booking_id,
@@ -438,8 +1403,7 @@ class StudentBookingManager:
             'booked_at': datetime.now(timezone.utc).isoformat()
         }
         
-        data.get('bookings', []).append(new_booking)
-        if MockDataManager.save_json('mock_student_bookings.json', data):
+        if MockDataManager.append_record('mock_student_bookings.json', new_booking):
             return new_booking_id
         return None
 
@@ -454,14 +1418,8 @@ class StudentBookingManager:
         Returns:
             True if successful, False otherwise.
         """
-        data = MockDataManager.load_json('mock_student_bookings.json')
-        
-        for booking in data.get('bookings', []):
-            if booking.get('booking_id') == booking_id:
-                booking['status'] = 'cancelled'
-                return MockDataManager.save_json('mock_student_bookings.json', data)
-        
-        return False
+        updated = MockDataManager.update_record('mock_student_bookings.json', booking_id, {'status': 'cancelled'})
+        return updated is not None
     
     @staticmethod
     def approve_booking(booking_id: str) -> bool:
@@ -474,14 +1432,8 @@ class StudentBookingManager:
         Returns:
             True if successful, False otherwise.
         """
-        data = MockDataManager.load_json('mock_student_bookings.json')
-        
-        for booking in data.get('bookings', []):
-            if booking.get('booking_id') == booking_id:
-                booking['status'] = 'confirmed'
-                return MockDataManager.save_json('mock_student_bookings.json', data)
-        
-        return False
+        updated = MockDataManager.update_record('mock_student_bookings.json', booking_id, {'status': 'confirmed'})
+        return updated is not None
     
     @staticmethod
     def reject_booking(booking_id: str) -> bool:
@@ -494,14 +1446,8 @@ class StudentBookingManager:
         Returns:
             True if successful, False otherwise.
         """
-        data = MockDataManager.load_json('mock_student_bookings.json')
-        
-        for booking in data.get('bookings', []):
-            if booking.get('booking_id') == booking_id:
-                booking['status'] = 'rejected'
-                return MockDataManager.save_json('mock_student_bookings.json', data)
-        
-        return False
+        updated = MockDataManager.update_record('mock_student_bookings.json', booking_id, {'status': 'rejected'})
+        return updated is not None
 
     @staticmethod
     def get_bookings_by_tutor(tutor_id: str) -> List[Dict]:
@@ -514,6 +1460,6 @@ class StudentBookingManager:
         Returns:
             List of bookings for the tutor.
         """
-        all_bookings = StudentBookingManager.get_all_bookings()
-        return [b for b in all_bookings if b.get('tutor_id') == tutor_id and b.get('status') != 'cancelled']
+        bookings = MockDataManager.get_index('mock_student_bookings.json').group('tutor_id', tutor_id)
+        return [b for b in bookings if b.get('status') != 'cancelled']
 
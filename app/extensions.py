@@ -2,6 +2,9 @@ import json
 import os
 from flask_marshmallow import Marshmallow
 
+from app import snapshot
+from app.file_lock import FileLock, atomic_write_json
+
 ma = Marshmallow()
 
 
@@ -20,8 +23,11 @@ class JsonDatabase:
 
     def load(self):
         """Read data from the JSON file into memory"""
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r', encoding='utf-8') as f:
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            self.data = data
+        elif os.path.exists(self.file_path):
+            with FileLock(self.file_path).shared(), open(self.file_path, 'r', encoding='utf-8') as f:
                 try:
                     self.data = json.load(f)
                 except json.JSONDecodeError:
@@ -32,9 +38,8 @@ class JsonDatabase:
 
     def save(self):
         """Write memory data back to the JSON file"""
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=4, ensure_ascii=False)
+        with FileLock(self.file_path).exclusive():
+            atomic_write_json(self.file_path, self.data, indent=4)
 
     # --- Helper Query Methods ---
 
@@ -45,8 +50,10 @@ class JsonDatabase:
         return None
 
     def add_user(self, user_dict):
-        self.data['users'].append(user_dict)
-        self.save()
+        with FileLock(self.file_path).exclusive():
+            self.load()
+            self.data['users'].append(user_dict)
+            self.save()
 
 
 # Create a global instance to be imported by other modules
@@ -0,0 +1,136 @@
+"""
+File Lock Module: cross-process reader/writer locks and atomic file replacement
+for the JSON-backed stores.
+
+Readers take a shared lock and writers an exclusive lock on a sidecar
+'.<name>.lock' file next to the data file, so gunicorn workers do not lose each
+other's updates while concurrent readers still run in parallel. Writes go to a
+temporary file that is renamed over the original, so a reader never sees a
+half-written file.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class FileLock:
+    """
+    Reader/writer lock for one data file, shared across processes via flock().
+
+    Locks are re-entrant per thread: a thread holding the exclusive lock may
+    take either lock again, and a thread holding the shared lock may take the
+    shared lock again. Upgrading shared to exclusive is not supported.
+    """
+
+    _held = threading.local()
+    _fallback_locks: Dict[str, threading.RLock] = {}
+    _fallback_guard = threading.Lock()
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        self.lock_path = path.with_name(f".{path.name}.lock")
+        self.key = str(self.lock_path)
+
+    def _held_locks(self) -> Dict[str, list]:
+        held = getattr(FileLock._held, 'locks', None)
+        if held is None:
+            held = FileLock._held.locks = {}
+        return held
+
+    @contextmanager
+    def _acquire(self, exclusive: bool):
+        held = self._held_locks()
+        current = held.get(self.key)
+        if current is not None:
+            if exclusive and not current[0]:
+                raise RuntimeError(f"Cannot upgrade shared lock on {self.lock_path} to exclusive")
+            current[1] += 1
+            try:
+                yield
+            finally:
+                current[1] -= 1
+            return
+
+        if fcntl is None:
+            with FileLock._fallback_guard:
+                lock = FileLock._fallback_locks.setdefault(self.key, threading.RLock())
+            with lock:
+                held[self.key] = [exclusive, 1]
+                try:
+                    yield
+                finally:
+                    del held[self.key]
+            return
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            held[self.key] = [exclusive, 1]
+            try:
+                yield
+            finally:
+                del held[self.key]
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def shared(self):
+        """Context manager holding the lock in shared (reader) mode."""
+        return self._acquire(exclusive=False)
+
+    def exclusive(self):
+        """Context manager holding the lock in exclusive (writer) mode."""
+        return self._acquire(exclusive=True)
+
+
+def write_temp_bytes(path: Path, payload: bytes) -> str:
+    """
+    Write payload to a synced temporary file next to path and return its name.
+
+    Install it with os.replace(name, path), or unlink it to discard the write;
+    several files can be staged this way and renamed only once all are written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        # mkstemp creates 0600 files; keep the permissions of the file we replace
+        os.chmod(tmp_name, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return tmp_name
+
+
+def write_temp_json(path: Path, data: Any, indent: int = 2) -> str:
+    """Write data as JSON to a temporary file next to path and return its name (see write_temp_bytes)."""
+    return write_temp_bytes(path, json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8'))
+
+
+def atomic_write_bytes(path: Path, payload: bytes):
+    """Write payload to a temporary file and atomically rename it over path."""
+    tmp_name = write_temp_bytes(path, payload)
+    try:
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_json(path: Path, data: Any, indent: int = 2):
+    """Write data as JSON to a temporary file and atomically rename it over path."""
+    atomic_write_bytes(path, json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8'))
@@ -7,6 +7,9 @@ from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Dict, List
 
+from app import snapshot
+from app.file_lock import FileLock, atomic_write_json
+
 
 class MockSSO:
     """Simulates HCMUT_SSO: stores user credentials (username/password) and issues SSO IDs."""
@@ -17,16 +20,19 @@ class MockSSO:
 
     def _load(self):
         """Load SSO data from JSON file."""
-        if self.file_path.exists():
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            return data
+        with FileLock(self.file_path).shared():
+            if self.file_path.exists():
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
         return {"users": []}
 
     def _save(self):
         """Persist SSO data back to JSON file."""
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        with FileLock(self.file_path).exclusive():
+            atomic_write_json(self.file_path, self.data, indent=2)
 
     def authenticate(self, username: str, password: str) -> Optional[Dict]:
         """
@@ -47,10 +53,13 @@ class MockSSO:
 
     def update_last_login(self, sso_id: str):
         """Update last_login timestamp for a user."""
-        user = self.get_user_by_id(sso_id)
-        if user:
-            user['last_login'] = datetime.now(timezone.utc).isoformat()
-            self._save()
+        # Reload under the lock so logins in other workers are not overwritten
+        with FileLock(self.file_path).exclusive():
+            self.data = self._load()
+            user = self.get_user_by_id(sso_id)
+            if user:
+                user['last_login'] = datetime.now(timezone.utc).isoformat()
+                self._save()
 
 
 class MockRoleMap:
@@ -62,9 +71,13 @@ class MockRoleMap:
 
     def _load(self):
         """Load role map data from JSON file."""
-        if self.file_path.exists():
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            return data
+        with FileLock(self.file_path).shared():
+            if self.file_path.exists():
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
         return {"mappings": []}
 
     def get_role(self, sso_id: str) -> Optional[str]:
@@ -84,9 +97,13 @@ class MockDatacore:
 
     def _load(self):
         """Load Datacore data from JSON file."""
-        if self.file_path.exists():
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            return data
+        with FileLock(self.file_path).shared():
+            if self.file_path.exists():
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
         return {"users": []}
 
     def get_user_profile(self, sso_id: str) -> Optional[Dict]:
@@ -106,16 +123,19 @@ class MockSessionStore:
 
     def _load(self):
         """Load session data from JSON file."""
-        if self.file_path.exists():
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            return data
+        with FileLock(self.file_path).shared():
+            if self.file_path.exists():
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
         return {"sessions": []}
 
     def _save(self):
         """Persist session data back to JSON file."""
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        with FileLock(self.file_path).exclusive():
+            atomic_write_json(self.file_path, self.data, indent=2)
 
     def create_session(self, sso_id: str, username: str, role: str, email: str, display_name: str) -> str:
         """
@@ -135,12 +155,16 @@ class MockSessionStore:
             'last_activity': datetime.now(timezone.utc).isoformat(),
             'expires_at': None  # Optional: set TTL
         }
-        self.data['sessions'].append(session_record)
-        self._save()
+        with FileLock(self.file_path).exclusive():
+            self.data = self._load()
+            self.data.setdefault('sessions', []).append(session_record)
+            self._save()
         return session_id
 
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Retrieve a session by session_id."""
+        # Sessions may have been created by another worker
+        self.data = self._load()
         for session in self.data.get('sessions', []):
             if session.get('session_id') == session_id:
                 return session
@@ -148,8 +172,10 @@ class MockSessionStore:
 
     def invalidate_session(self, session_id: str):
         """Remove a session (logout)."""
-        self.data['sessions'] = [s for s in self.data['sessions'] if s.get('session_id') != session_id]
-        self._save()
+        with FileLock(self.file_path).exclusive():
+            self.data = self._load()
+            self.data['sessions'] = [s for s in self.data.get('sessions', []) if s.get('session_id') != session_id]
+            self._save()
 
 
 # Global instances (singleton pattern for easier access)
@@ -1,26 +1,16 @@
-import json
-import os
 from datetime import datetime
+from pathlib import Path
+from app.data_manager import MockDataManager, data_transaction
 from .models import Notification, NotificationType, EventType, RecipientType
 
 class NotificationService:
     def __init__(self, db_path="database/mock_notification_dtb.json"):
         self.db_path = db_path
+        # Stored through MockDataManager (database directory), indexed by recipient_id
+        self.filename = Path(db_path).name
     
     def _load_notifications(self):
-        try:
-            with open(self.db_path, 'r') as f:
-                data = json.load(f)
-                return data.get('notifications', [])
-        except FileNotFoundError:
-            return []
-    
-    def _save_notifications(self, notifications):
-        with open(self.db_path, 'r') as f:
-            data = json.load(f)
-        data['notifications'] = notifications
-        with open(self.db_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        return MockDataManager.get_index(self.filename).all()
     
     def send_manual_notification(self, recipient_id, recipient_type, title, 
                                 message, sender_id):
@@ -33,9 +23,7 @@ class NotificationService:
             sender_id=sender_id
         )
         
-        notifications = self._load_notifications()
-        notifications.append(notification.to_dict())
-        self._save_notifications(notifications)
+        MockDataManager.append_record(self.filename, notification.to_dict())
         
         return notification.to_dict()
     
@@ -52,9 +40,7 @@ class NotificationService:
             related_data=related_data
         )
         
-        notifications = self._load_notifications()
-        notifications.append(notification.to_dict())
-        self._save_notifications(notifications)
+        MockDataManager.append_record(self.filename, notification.to_dict())
         
         return notification.to_dict()
     
@@ -202,37 +188,29 @@ class NotificationService:
         )
     
     def get_user_notifications(self, user_id, limit=20, skip=0):
-        notifications = self._load_notifications()
-        user_notifs = [n for n in notifications if n['recipient_id'] == user_id]
+        user_notifs = MockDataManager.get_index(self.filename).group('recipient_id', user_id)
         user_notifs.sort(key=lambda x: x['created_at'], reverse=True)
         return user_notifs[skip:skip+limit]
     
     def get_unread_notifications_count(self, user_id):
-        notifications = self._load_notifications()
-        unread = [n for n in notifications if n['recipient_id'] == user_id and not n['is_read']]
+        notifications = MockDataManager.get_index(self.filename).group('recipient_id', user_id)
+        unread = [n for n in notifications if not n['is_read']]
         return len(unread)
     
     def mark_notification_as_read(self, notification_id):
-        notifications = self._load_notifications()
-        for notif in notifications:
-            if notif['id'] == notification_id:
-                notif['is_read'] = True
-                notif['updated_at'] = datetime.utcnow().isoformat()
-                self._save_notifications(notifications)
-                return notif
-        return None
+        return MockDataManager.update_record(self.filename, notification_id, {
+            'is_read': True,
+            'updated_at': datetime.utcnow().isoformat()
+        })
     
     def mark_all_as_read(self, user_id):
-        notifications = self._load_notifications()
-        for notif in notifications:
-            if notif['recipient_id'] == user_id:
-                notif['is_read'] = True
-                notif['updated_at'] = datetime.utcnow().isoformat()
-        self._save_notifications(notifications)
+        # One flush for all of the user's notifications
+        with data_transaction():
+            notifications = MockDataManager.get_index(self.filename).group('recipient_id', user_id)
+            for notif in notifications:
+                self.mark_notification_as_read(notif['id'])
         return True
     
     def delete_notification(self, notification_id):
-        notifications = self._load_notifications()
-        notifications = [n for n in notifications if n['id'] != notification_id]
-        self._save_notifications(notifications)
+        MockDataManager.delete_record(self.filename, notification_id)
         return True
\ No newline at end of file
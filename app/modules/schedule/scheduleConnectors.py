@@ -2,36 +2,139 @@
 Mock SSO, Role Map, and Datacore connectors for simulating HCMUT authentication and data systems.
 """
 import json
+import logging
 import os
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Dict, List
+from contextlib import contextmanager
+
+from app import snapshot
+from app.data_manager import MockDataManager, BASE_DB_PATH
+from app.file_lock import FileLock, atomic_write_json
+
+logger = logging.getLogger(__name__)
 
 
 class MockSchedules:
     """Simulates HCMUT_SSO: stores user credentials (username/password) and issues SSO IDs."""
 
-    def __init__(self, schedule_file: str = "database/mock_schedule.json"):
-        self.file_path = Path(schedule_file)
+    def __init__(self, schedule_file: Optional[str] = None):
+        # Same path MockDataManager uses, so both agree on one FileLock key whatever the working directory
+        self.file_path = Path(schedule_file).resolve() if schedule_file else BASE_DB_PATH / 'mock_schedule.json'
+        # Slot operations applied to self.data but not yet written (write-behind mode)
+        self._pending: List[Dict] = []
+        self._pending_lock = threading.Lock()
         self.data = self._load()
 
     def _load(self):
         """Load SSO data from JSON file."""
+        data = snapshot.lookup(self.file_path)
+        if data is not None:
+            return data
         if self.file_path.exists():
             try:
-                with open(self.file_path, 'r') as f:
+                with FileLock(self.file_path).shared(), open(self.file_path, 'r') as f:
                     return json.load(f)
             except (FileNotFoundError, json.JSONDecodeError) as e:
                 print(f"Error schedule file not found: {e}")
                 # If file is missing or corrupt, return an empty dictionary
                 return {}
 
-    def _save(self):
-        """Writes the current dictionary of schedules back to the JSON file."""
-        with open(self.file_path, 'w') as f:
-            json.dump(self.data, f, indent=4)
+    @staticmethod
+    def _apply(schedules: Dict, entry: Dict) -> None:
+        """Apply one slot operation to schedules; idempotent, so pending entries can be replayed."""
+        if entry['op'] == 'insert':
+            schedule = schedules.setdefault(entry['tutor_id'], dict(entry['schedule'], slots=[]))
+            if all(slot['id'] != entry['slot']['id'] for slot in schedule['slots']):
+                schedule['slots'].append(dict(entry['slot']))
+            return
+        slots = schedules.get(entry['tutor_id'], {}).get('slots', [])
+        for index, slot in enumerate(slots):
+            if slot['id'] == entry['slot_id']:
+                if entry['op'] == 'update':
+                    slot.update(entry['changes'])
+                else:
+                    slots.pop(index)
+                return
+
+    def _record(self, entry: Dict) -> None:
+        """Apply a slot operation to self.data and save it."""
+        self._apply(self.data, entry)
+        self._save([entry])
+
+    def insert_slot(self, tutor_id: str, slot: Dict, schedule: Optional[Dict] = None) -> None:
+        """Add slot to a tutor's schedule; schedule holds the fields of a schedule created for it."""
+        self._record({'op': 'insert', 'tutor_id': tutor_id, 'slot': slot, 'schedule': schedule or {}})
+
+    def update_slot(self, tutor_id: str, slot_id: int, changes: Dict) -> None:
+        """Set fields of one of a tutor's slots."""
+        self._record({'op': 'update', 'tutor_id': tutor_id, 'slot_id': slot_id, 'changes': changes})
+
+    def delete_slot(self, tutor_id: str, slot_id: int) -> None:
+        """Remove one of a tutor's slots."""
+        self._record({'op': 'delete', 'tutor_id': tutor_id, 'slot_id': slot_id})
+
+    def _save(self, entries: Optional[List[Dict]] = None):
+        """
+        Writes the current dictionary of schedules back to the JSON file.
+
+        In write-behind mode, the slot operations in entries are queued instead
+        and replayed onto the current file by the next flush.
+        """
+        if entries is not None and MockDataManager.write_behind is not None:
+            # Coalesce bursts of slot edits into one background write
+            with self._pending_lock:
+                self._pending.extend(entries)
+            MockDataManager.write_behind.mark_dirty(str(self.file_path), self._flush)
+            return
+        with FileLock(self.file_path).exclusive():
+            with self._pending_lock:
+                # self.data already holds them
+                self._pending.clear()
+            atomic_write_json(self.file_path, self.data, indent=4)
         self.data = self._load()
 
+    def _flush(self) -> bool:
+        """Replay deferred slot operations onto the current JSON file (write-behind mode)."""
+        with FileLock(self.file_path).exclusive():
+            with self._pending_lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return True
+            # Reload first, so slot edits other workers wrote meanwhile are kept
+            data = self._load() or {}
+            for entry in entries:
+                self._apply(data, entry)
+            try:
+                atomic_write_json(self.file_path, data, indent=4)
+            except OSError as e:
+                logger.error(f"Error writing {self.file_path.name}: {e}")
+                with self._pending_lock:
+                    self._pending[:0] = entries
+                return False
+            self.data = data
+        return True
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the schedule file's exclusive lock and reload the latest data.
+
+        Wrap only a read-modify-_save() sequence in this, after validating the
+        request and before any notifications, so concurrent workers do not
+        overwrite each other's slots and are not held up by slow requests.
+        Slot operations not yet flushed are replayed onto the reloaded data.
+        """
+        with FileLock(self.file_path).exclusive():
+            data = self._load() or {}
+            with self._pending_lock:
+                for entry in self._pending:
+                    self._apply(data, entry)
+            self.data = data
+            yield self.data
+
 
 
 schedulesData = MockSchedules()
\ No newline at end of file
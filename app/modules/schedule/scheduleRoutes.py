@@ -3,6 +3,8 @@ from flask import Blueprint, Flask, jsonify, request, abort, session
 from datetime import datetime, timezone
 from pathlib import Path
 from app.modules.schedule.scheduleConnectors import schedulesData
+from app.data_manager import SequenceManager
+from app.modules.student import tutorSearchService
 # Using Flask session instead of session_store
 # Linh them
 from app.modules.notification.services import NotificationService
@@ -31,12 +33,16 @@ def get_students_for_tutor(tutor_id):
 
 def generate_new_id(schedules):
     """Generates a unique ID across all slots in all schedules."""
-    max_id = 100 
-    for schedule in schedules.values():
-        if schedule['slots']:
-            current_max = max(slot['id'] for slot in schedule['slots'])
-            max_id = max(max_id, current_max)
-    return max_id + 1
+    def seed():
+        # First use only: continue after the highest existing slot ID
+        max_id = 100 
+        for schedule in schedules.values():
+            if schedule['slots']:
+                current_max = max(slot['id'] for slot in schedule['slots'])
+                max_id = max(max_id, current_max)
+        return max_id
+
+    return SequenceManager.next_value('SLOT', seed=seed)
 
 def validate_times(start_str, end_str):
     """Basic validation and returns datetime objects."""
@@ -93,22 +99,6 @@ def createFreetime(tutor_id):
         if error:
             return jsonify({"error": error}), 400
         
-        schedules = schedulesData.data
-        
-        # 1. Ensure the tutor's schedule structure exists
-        if tutor_id not in schedules:
-            schedules[tutor_id] = {"tutor_id": MOCK_TUTOR_ID, "slots": []}
-
-        tutor_slots = schedules[tutor_id]['slots']
-
-        # 2. Check for overlaps
-        for slot in tutor_slots:
-            slot_start = datetime.fromisoformat(slot['start'].replace('Z', '+00:00'))
-            slot_end = datetime.fromisoformat(slot['end'].replace('Z', '+00:00'))
-            if (start_dt < slot_end and end_dt > slot_start):
-                 return jsonify({"error": "New free time overlaps with an existing slot."}), 409
-
-        # 3. Create the new slot
         # Normalize datetime strings to ISO 8601 with Z
         start_normalized = start_dt.isoformat() if start_dt.tzinfo else start_dt.replace(tzinfo=timezone.utc).isoformat()
         if not start_normalized.endswith('Z'):
@@ -117,14 +107,27 @@ def createFreetime(tutor_id):
         end_normalized = end_dt.isoformat() if end_dt.tzinfo else end_dt.replace(tzinfo=timezone.utc).isoformat()
         if not end_normalized.endswith('Z'):
             end_normalized = end_normalized.replace('+00:00', 'Z')
-        
-        new_slot = {
-            "id": generate_new_id(schedules),
-            "start": start_normalized,
-            "end": end_normalized
-        }
-        tutor_slots.append(new_slot)
-        schedulesData._save()
+
+        # Lock only the read-modify-save, so other workers' slot edits are not overwritten
+        with schedulesData.locked() as schedules:
+            # 1. The tutor's schedule structure is created with the first slot
+            tutor_slots = schedules.get(tutor_id, {}).get('slots', [])
+
+            # 2. Check for overlaps
+            for slot in tutor_slots:
+                slot_start = datetime.fromisoformat(slot['start'].replace('Z', '+00:00'))
+                slot_end = datetime.fromisoformat(slot['end'].replace('Z', '+00:00'))
+                if (start_dt < slot_end and end_dt > slot_start):
+                     return jsonify({"error": "New free time overlaps with an existing slot."}), 409
+
+            # 3. Create the new slot
+            new_slot = {
+                "id": generate_new_id(schedules),
+                "start": start_normalized,
+                "end": end_normalized
+            }
+            schedulesData.insert_slot(tutor_id, new_slot, schedule={"tutor_id": MOCK_TUTOR_ID})
+        tutorSearchService.notify_availability_changed()
 
         #### notification add ####
         student_ids = get_students_for_tutor(tutor_id)
@@ -200,52 +203,50 @@ def editFreetime(tutor_id, slot_id):
     except ValueError:
         return jsonify({"error": "Invalid slot ID format. Must be an integer."}), 400
 
-    schedules = schedulesData.data
-
-    # 2. Check if the tutor exists
-    if tutor_id not in schedules:
-        return jsonify({"message": "Tutor schedule not found."}), 404
+    # Lock only the read-modify-save, so other workers' slot edits are not overwritten
+    with schedulesData.locked() as schedules:
+        # 2. Check if the tutor exists
+        if tutor_id not in schedules:
+            return jsonify({"message": "Tutor schedule not found."}), 404
 
-    tutor_slots = schedules[tutor_id]['slots']
+        tutor_slots = schedules[tutor_id]['slots']
     
-    found_slot = None
+        found_slot = None
     
-    # 3. Find the slot to be edited
-    for slot in tutor_slots:
-        if slot['id'] == slot_id_int:
-            found_slot = slot
-            break
+        # 3. Find the slot to be edited
+        for slot in tutor_slots:
+            if slot['id'] == slot_id_int:
+                found_slot = slot
+                break
     
-    if found_slot is None:
-        return jsonify({"message": f"Free time slot with ID {slot_id} not found for tutor {tutor_id}."}), 404
+        if found_slot is None:
+            return jsonify({"message": f"Free time slot with ID {slot_id} not found for tutor {tutor_id}."}), 404
 
-    # 4. Check for overlaps with *other* slots
-    for slot in tutor_slots:
-        # Skip checking against the slot we are currently editing
-        if slot['id'] == slot_id_int:
-            continue 
+        # 4. Check for overlaps with *other* slots
+        for slot in tutor_slots:
+            # Skip checking against the slot we are currently editing
+            if slot['id'] == slot_id_int:
+                continue 
 
-        # Parse existing slot times
-        slot_start = datetime.fromisoformat(slot['start'].replace('Z', '+00:00'))
-        slot_end = datetime.fromisoformat(slot['end'].replace('Z', '+00:00'))
+            # Parse existing slot times
+            slot_start = datetime.fromisoformat(slot['start'].replace('Z', '+00:00'))
+            slot_end = datetime.fromisoformat(slot['end'].replace('Z', '+00:00'))
 
-        # Overlap check
-        if (start_dt < slot_end and end_dt > slot_start):
-             return jsonify({
-                 "error": "Edited time slot overlaps with an existing slot.",
-                 "overlapping_slot_id": slot['id']
-             }), 409
+            # Overlap check
+            if (start_dt < slot_end and end_dt > slot_start):
+                 return jsonify({
+                     "error": "Edited time slot overlaps with an existing slot.",
+                     "overlapping_slot_id": slot['id']
+                 }), 409
 
-    # 5. Update the found slot's details
-    # Notification: 
-    old_slot = found_slot.copy()
-    #
-    
-    found_slot['start'] = start_str
-    found_slot['end'] = end_str
+        # 5. Update the found slot's details
+        # Notification: 
+        old_slot = found_slot.copy()
+        #
     
-    # 6. Save the modified schedules back to the file
-    schedulesData._save()
+        # 6. Save the modified schedules back to the file
+        schedulesData.update_slot(tutor_id, slot_id_int, {'start': start_str, 'end': end_str})
+    tutorSearchService.notify_availability_changed()
     
     
     #---- Notification add ----
@@ -303,41 +304,39 @@ def deleteFreetime(tutor_id, slot_id):
     
     # Begin
     
-    schedules = schedulesData.data
-
     try:
         slot_id_int = int(slot_id)
     except ValueError:
         return jsonify({"error": "Invalid slot ID format. Must be an integer."}), 400
-    
-    if tutor_id not in schedules:
-        return jsonify({"message": "Tutor schedule not found."}), 404
 
-    tutor_slots = schedules[tutor_id]['slots']
+    # Lock only the read-modify-save, so other workers' slot edits are not overwritten
+    with schedulesData.locked() as schedules:
+        if tutor_id not in schedules:
+            return jsonify({"message": "Tutor schedule not found."}), 404
+
+        tutor_slots = schedules[tutor_id]['slots']
 
-# Initialize a flag or index for tracking the slot
-    slot_index_to_delete = -1
+        # Initialize a flag or index for tracking the slot
+        slot_index_to_delete = -1
     
-    # Linh add
-    deleted_slot_info = None
+        # Linh add
+        deleted_slot_info = None
     
-    # 2. Find the slot by ID and get its index
-    for index, slot in enumerate(tutor_slots):
-        # We compare the URL slot_id (now integer) against the slot's ID field
-        if slot['id'] == slot_id_int:
-            slot_index_to_delete = index
-            deleted_slot_info = slot.copy()
-            break
+        # 2. Find the slot by ID and get its index
+        for index, slot in enumerate(tutor_slots):
+            # We compare the URL slot_id (now integer) against the slot's ID field
+            if slot['id'] == slot_id_int:
+                slot_index_to_delete = index
+                deleted_slot_info = slot.copy()
+                break
             
-    # 3. Handle case where the slot was not found
-    if slot_index_to_delete == -1:
-        return jsonify({"message": f"Free time slot with ID {slot_id} not found for tutor {tutor_id}."}), 404
+        # 3. Handle case where the slot was not found
+        if slot_index_to_delete == -1:
+            return jsonify({"message": f"Free time slot with ID {slot_id} not found for tutor {tutor_id}."}), 404
 
-    # 4. Delete the slot
-    # The .pop() method removes the item at the specified index
-    deleted_slot = tutor_slots.pop(slot_index_to_delete)
-        
-    schedulesData._save()
+        # 4. Delete the slot
+        schedulesData.delete_slot(tutor_id, slot_id_int)
+    tutorSearchService.notify_availability_changed()
     
     # Notify students who booked slots on this schedule
     try:
@@ -0,0 +1,75 @@
+"""
+Availability Summary: per-tutor availability for ranking, precomputed from
+mock_schedule.json and mock_student_bookings.json.
+
+For every row of the search index it holds the earliest free time from now,
+the free hours within the next `horizon_days` days and the number of pending
+bookings. It is built with a few vectorized passes over SlotColumns (the same
+flattened slots the free-slot filter uses), and the search service rebuilds it
+only when the index, the schedule or the bookings change (or it gets old), so
+a search never scans the schedule.
+
+scores() turns the summary into one availability score per row in [0, 1]:
+
+    (soonness + free share) / 2 / (1 + pending bookings)
+
+where soonness falls linearly from 1 (free now) to 0 (nothing free within the
+horizon) and free share is the tutor's free hours over the most free hours of
+any tutor.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+
+from .searchFilters import SlotColumns
+
+
+class AvailabilitySummary(NamedTuple):
+    """Availability of the indexed lecturers as of `as_of`, aligned with the embedding rows."""
+    earliest: np.ndarray     # epoch seconds of the earliest free time at or after as_of; inf if none
+    free_hours: np.ndarray   # free hours in [as_of, as_of + horizon_days)
+    pending: np.ndarray      # bookings with status 'pending'
+    as_of: int
+    horizon_days: float
+
+    @classmethod
+    def build(cls, lecturers: List[Dict], slots: SlotColumns, bookings: List[Dict], now: int,
+              horizon_days: float) -> 'AvailabilitySummary':
+        horizon_end = now + horizon_days * 86400
+        future = slots.ends > now
+        rows = slots.rows[future]
+        starts = np.maximum(slots.starts[future], now)
+
+        earliest = np.full(len(lecturers), np.inf)
+        np.minimum.at(earliest, rows, starts.astype(np.float64))
+
+        overlap = np.clip(np.minimum(slots.ends[future], horizon_end) - starts, 0, None)
+        free_hours = np.bincount(rows, weights=overlap / 3600, minlength=len(lecturers)).astype(np.float32)
+
+        row_of = {lecturer.get('id'): row for row, lecturer in enumerate(lecturers)}
+        pending_rows = [row_of[b.get('tutor_id')] for b in bookings
+                        if b.get('status') == 'pending' and b.get('tutor_id') in row_of]
+        pending = np.bincount(np.asarray(pending_rows, dtype=np.int64), minlength=len(lecturers)).astype(np.int32)
+        return cls(earliest, free_hours, pending, now, horizon_days)
+
+    def scores(self) -> np.ndarray:
+        """Return the availability score of every row (float32, in [0, 1])."""
+        horizon = self.horizon_days * 86400
+        soonness = np.clip(1 - (self.earliest - self.as_of) / horizon, 0, 1) if horizon > 0 \
+            else np.zeros(len(self.earliest))
+        most = float(self.free_hours.max()) if len(self.free_hours) else 0.0
+        free_share = self.free_hours / most if most > 0 else np.zeros(len(self.free_hours))
+        return ((soonness + free_share) / 2 / (1 + self.pending)).astype(np.float32)
+
+    def describe(self, row: int) -> Dict[str, Any]:
+        """Return the availability of one row for API responses."""
+        earliest = self.earliest[row]
+        return {
+            'earliest_free_slot': None if np.isinf(earliest) else
+            datetime.fromtimestamp(int(earliest), timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'free_hours': round(float(self.free_hours[row]), 2),
+            'horizon_days': self.horizon_days,
+            'pending_bookings': int(self.pending[row]),
+        }
@@ -0,0 +1,248 @@
+"""
+Embedding Store: persistent, memory-mapped lecturer embeddings.
+
+Embeddings live in <dir>/<model>.npy (a float32 matrix of L2-normalized rows)
+with a sidecar <model>.json listing, per row, the tutor id and a hash of the
+text that was embedded. On sync, rows whose text hash is unchanged are reused
+and only new or edited tutors are encoded. Readers open the matrix with
+np.load(mmap_mode='r'), so every worker process shares one copy of it through
+the page cache instead of holding a private one.
+
+quantized() derives float16 / int8 copies (<model>.float16.npy, or
+<model>.int8.npy plus <model>.int8.scales.npy) the same way: built once,
+memory-mapped by every worker, and deleted whenever the matrix is rewritten.
+
+publish_columns() stores per-row metadata (ids, ratings, category codes) as
+one structured array, <model>.columns.npy, that workers attach to the same
+way. Every write of the matrix or the columns bumps the counter in
+<model>.version, so a worker can tell from one tiny read that another worker
+published a rebuilt index.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Tuple, Callable
+
+import numpy as np
+
+from app.file_lock import FileLock, atomic_write_bytes, atomic_write_json
+from .quantization import QuantizedMatrix, quantize
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Return the hash that identifies an embedded text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def columns_digest(table: np.ndarray, vocabularies: Dict[str, Dict[str, int]]) -> str:
+    """Return the hash that identifies a published columns table."""
+    digest = hashlib.sha256(table.tobytes())
+    digest.update(json.dumps(vocabularies, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return vectors as float32 with every row scaled to unit length."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingStore:
+    """On-disk embedding matrix for one model, keyed by tutor id and content hash."""
+
+    def __init__(self, directory: Path, model_name: str):
+        self.directory = Path(directory)
+        self.model_name = model_name
+        stem = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.matrix_path = self.directory / f"{stem}.npy"
+        self.meta_path = self.directory / f"{stem}.json"
+        self.columns_path = self.directory / f"{stem}.columns.npy"
+        self.columns_meta_path = self.directory / f"{stem}.columns.json"
+        self.version_path = self.directory / f"{stem}.version"
+        self._stem = stem
+        self.lock = FileLock(self.matrix_path)
+
+    def _read(self) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+        """Return (sidecar, read-only mmap of the matrix), or None if missing or inconsistent."""
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            matrix = np.load(self.matrix_path, mmap_mode='r')
+        except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable embedding store {self.matrix_path}: {e}")
+            return None
+        if (meta.get('model') != self.model_name or matrix.ndim != 2
+                or matrix.shape[0] != len(meta.get('rows', []))):
+            return None
+        return meta, matrix
+
+    def load(self) -> Optional[Tuple[List[str], List[str], np.ndarray]]:
+        """Return (ids, hashes, matrix) as stored, or None if there is no usable store."""
+        with self.lock.shared():
+            stored = self._read()
+        if stored is None:
+            return None
+        meta, matrix = stored
+        return [r['id'] for r in meta['rows']], [r['hash'] for r in meta['rows']], matrix
+
+    def sync(self, items: List[Tuple[str, str]], encode: Callable[[List[str]], np.ndarray],
+             dim: int) -> Tuple[np.ndarray, int]:
+        """
+        Make the store hold exactly items, in order, and return its matrix.
+
+        Args:
+            items: (tutor id, text to embed) pairs
+            encode: Encodes a list of texts into a (len(texts), dim) array
+            dim: Embedding dimension of the model
+
+        Returns:
+            (read-only memory-mapped matrix with one normalized row per item,
+             number of texts that had to be encoded)
+        """
+        ids = [item_id for item_id, _ in items]
+        hashes = [content_hash(text) for _, text in items]
+
+        def up_to_date(stored):
+            return stored is not None and [(r['id'], r['hash']) for r in stored[0]['rows']] == list(zip(ids, hashes))
+
+        with self.lock.shared():
+            stored = self._read()
+            if up_to_date(stored):
+                return stored[1], 0
+
+        with self.lock.exclusive():
+            # Another worker may have rebuilt the store while we waited
+            stored = self._read()
+            if up_to_date(stored):
+                return stored[1], 0
+
+            reusable = {}
+            if stored is not None and stored[1].shape[1] == dim:
+                reusable = {(r['id'], r['hash']): row for row, r in enumerate(stored[0]['rows'])}
+            missing = [i for i, key in enumerate(zip(ids, hashes)) if key not in reusable]
+
+            matrix = np.empty((len(items), dim), dtype=np.float32)
+            for i, key in enumerate(zip(ids, hashes)):
+                if key in reusable:
+                    matrix[i] = stored[1][reusable[key]]
+            if missing:
+                matrix[missing] = normalize_rows(encode([items[i][1] for i in missing]))
+
+            self._write(matrix, [{'id': i, 'hash': h} for i, h in zip(ids, hashes)], dim)
+            logger.info(f"Embedding store {self.matrix_path.name}: encoded {len(missing)} of {len(items)} texts")
+            return np.load(self.matrix_path, mmap_mode='r'), len(missing)
+
+    def _quantized_paths(self, kind: str) -> List[Path]:
+        if kind == 'int8':
+            return [self.directory / f"{self._stem}.int8.npy", self.directory / f"{self._stem}.int8.scales.npy"]
+        return [self.directory / f"{self._stem}.{kind}.npy"]
+
+    def _read_quantized(self, kind: str, rows: int) -> Optional[QuantizedMatrix]:
+        try:
+            arrays = [np.load(path, mmap_mode='r') for path in self._quantized_paths(kind)]
+        except (FileNotFoundError, ValueError):
+            return None
+        if arrays[0].shape[0] != rows:
+            return None
+        return QuantizedMatrix(*arrays)
+
+    def quantized(self, kind: str) -> QuantizedMatrix:
+        """
+        Return the stored matrix as float16 or int8, memory-mapped.
+
+        Built from the float32 matrix on first use after each sync; call sync() first.
+
+        Raises:
+            ValueError: for an unknown kind, or if the store is empty
+        """
+        with self.lock.shared():
+            stored = self._read()
+            if stored is None:
+                raise ValueError(f"Embedding store {self.matrix_path} is empty")
+            matrix = self._read_quantized(kind, stored[1].shape[0])
+            if matrix is not None:
+                return matrix
+        with self.lock.exclusive():
+            stored = self._read()
+            if stored is None:
+                raise ValueError(f"Embedding store {self.matrix_path} is empty")
+            matrix = self._read_quantized(kind, stored[1].shape[0])
+            if matrix is None:
+                built = quantize(stored[1], kind)
+                arrays = [built.data] + ([built.scales] if built.scales is not None else [])
+                for path, array in zip(self._quantized_paths(kind), arrays):
+                    buffer = io.BytesIO()
+                    np.save(buffer, array)
+                    atomic_write_bytes(path, buffer.getvalue())
+                matrix = self._read_quantized(kind, stored[1].shape[0])
+            return matrix
+
+    def version(self) -> int:
+        """Return the publish counter (bumped by every matrix or columns write); 0 before the first."""
+        try:
+            return int(self.version_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _bump_version(self):
+        """Increment the publish counter (under the exclusive lock)."""
+        atomic_write_bytes(self.version_path, str(self.version() + 1).encode('utf-8'))
+
+    def _read_columns(self, digest: str) -> Optional[Tuple[np.ndarray, Dict[str, Dict[str, int]]]]:
+        try:
+            with open(self.columns_meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('hash') != digest:
+                return None
+            return np.load(self.columns_path, mmap_mode='r'), meta['vocabularies']
+        except (FileNotFoundError, ValueError, KeyError, json.JSONDecodeError):
+            return None
+
+    def publish_columns(self, table: np.ndarray,
+                        vocabularies: Dict[str, Dict[str, int]]) -> Tuple[np.ndarray, Dict[str, Dict[str, int]]]:
+        """
+        Store per-row metadata and return it memory-mapped.
+
+        Args:
+            table: Structured array with one row per matrix row
+            vocabularies: Code -> value maps for the categorical fields of table
+
+        Returns:
+            (read-only memory-mapped table, vocabularies). When an identical
+            table is already published it is attached to, not rewritten.
+        """
+        digest = columns_digest(table, vocabularies)
+        with self.lock.shared():
+            published = self._read_columns(digest)
+            if published is not None:
+                return published
+        with self.lock.exclusive():
+            published = self._read_columns(digest)
+            if published is None:
+                buffer = io.BytesIO()
+                np.save(buffer, table)
+                atomic_write_bytes(self.columns_path, buffer.getvalue())
+                atomic_write_json(self.columns_meta_path, {'hash': digest, 'vocabularies': vocabularies})
+                self._bump_version()
+                published = self._read_columns(digest)
+            return published
+
+    def _write(self, matrix: np.ndarray, rows: List[Dict[str, str]], dim: int):
+        """Atomically replace the matrix, then its sidecar (both under the exclusive lock)."""
+        # Quantized copies go first, so a crash can only leave them missing, never stale
+        for kind in ('float16', 'int8'):
+            for path in self._quantized_paths(kind):
+                path.unlink(missing_ok=True)
+        buffer = io.BytesIO()
+        np.save(buffer, matrix)
+        atomic_write_bytes(self.matrix_path, buffer.getvalue())
+        atomic_write_json(self.meta_path, {'model': self.model_name, 'dim': dim, 'dtype': 'float32', 'rows': rows})
+        self._bump_version()
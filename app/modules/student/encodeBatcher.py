@@ -0,0 +1,142 @@
+"""
+Encode Batcher: micro-batches concurrent query encodes into one model call.
+
+Transformer inference on CPU costs much less per text in a batch than one
+text at a time. The batcher owns a worker thread: callers submit a text and
+get a concurrent.futures.Future; the worker takes the first waiting text,
+gathers more for up to max_wait_ms or until max_batch texts, encodes them in
+one call, and resolves every future. Identical texts in a batch are encoded once.
+
+A thread (rather than an asyncio task) is used because Flask runs each async
+view in its own short-lived event loop; async callers await the future with
+asyncio.wrap_future().
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EncodeBatcher:
+    """
+    Batches encode(texts) calls from many threads.
+
+    Args:
+        encode: Encodes a list of texts into a (len(texts), dim) array, or
+            returns a Future of one (e.g. InferencePool.encode), in which case
+            the next batch is collected while this one runs
+        max_batch: Most texts per model call
+        max_wait_ms: How long the first text of a batch waits for company
+            (0 = only batch what queued up while the previous batch ran)
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], max_batch: int = 32, max_wait_ms: float = 5):
+        self._encode = encode
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: 'queue.Queue[Tuple[str, Future]]' = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._largest = 0
+        self._encode_seconds = 0.0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='tutor-search-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue text for encoding; the future resolves to its embedding row."""
+        future = Future()
+        if self._stopped:
+            future.set_exception(RuntimeError("Encode batcher is stopped"))
+        else:
+            self._queue.put((text, future))
+        return future
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Encode one text as part of a batch, without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for the first request, then gather more until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            requests = [(text, future) for text, future in batch if future is not None]
+            if requests:
+                self._process(requests)
+            if len(requests) < len(batch):  # stop() sentinel
+                return
+
+    def _process(self, batch: List[Tuple[str, Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        started = time.perf_counter()
+        try:
+            result = self._encode(texts)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        if isinstance(result, Future):
+            result.add_done_callback(lambda f: self._resolve(batch, texts, started, f))
+        else:
+            self._resolve(batch, texts, started, result)
+
+    def _fail(self, batch: List[Tuple[str, Future]], error: BaseException):
+        logger.error(f"Batched encode of {len(batch)} texts failed: {error}")
+        for _, future in batch:
+            future.set_exception(error)
+
+    def _resolve(self, batch: List[Tuple[str, Future]], texts: List[str], started: float, result):
+        if isinstance(result, Future):
+            if result.exception() is not None:
+                self._fail(batch, result.exception())
+                return
+            result = result.result()
+        elapsed = time.perf_counter() - started
+        rows = np.asarray(result, dtype=np.float32)
+        position = {text: i for i, text in enumerate(texts)}
+        for text, future in batch:
+            future.set_result(rows[position[text]])
+        with self._stats_lock:
+            self._batches += 1
+            self._texts += len(batch)
+            self._largest = max(self._largest, len(batch))
+            self._encode_seconds += elapsed
+
+    def stop(self, timeout: float = 5) -> None:
+        """Finish queued work, then stop the worker thread."""
+        if not self._stopped:
+            self._stopped = True
+            self._queue.put(('', None))
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counts and sizes, and the time spent in the model."""
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'texts': self._texts,
+                'avg_batch': self._texts / self._batches if self._batches else 0.0,
+                'max_batch': self._largest,
+                'encode_ms_total': self._encode_seconds * 1000,
+                'queued': self._queue.qsize(),
+            }
@@ -0,0 +1,161 @@
+"""
+Inference Pool: runs embedding inference and vector search off the request's
+event loop.
+
+kind='thread' loads the model once in this process and runs encodes on a
+ThreadPoolExecutor (PyTorch releases the GIL during inference). kind='process'
+starts `workers` spawned processes that each load the model once, so encodes
+do not contend for this process's GIL at all. Vector search always runs on the
+thread pool, next to the in-memory index.
+
+Every task takes one of workers + max_queue slots; when none is free, the
+submit fails fast with PoolSaturated instead of queueing without bound.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when every worker is busy and the queue is full."""
+
+
+# Model loaded by _init_worker in each pool process
+_worker_model = None
+
+
+def _init_worker(model_name: str):
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _worker_encode(texts: List[str]) -> np.ndarray:
+    return np.asarray(_worker_model.encode(texts), dtype=np.float32)
+
+
+def _worker_dimension() -> int:
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+class InferencePool:
+    """
+    Bounded pool for model.encode and other CPU-bound search work.
+
+    Args:
+        model_name: SentenceTransformer model to load (once per worker process
+            for kind='process', once here for kind='thread')
+        kind: 'thread' or 'process'
+        workers: Concurrent tasks
+        max_queue: Tasks allowed to wait for a worker before submits are rejected
+
+    Raises:
+        ValueError: for an unknown kind
+    """
+
+    def __init__(self, model_name: str, kind: str = 'thread', workers: int = 2, max_queue: int = 64):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown inference pool kind: {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix='tutor-search-pool')
+        self._processes = None
+        self.model = None
+
+        if kind == 'process':
+            # spawn, not fork: forking a process that already runs threads (and
+            # possibly torch) can deadlock the children
+            self._processes = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                                  initializer=_init_worker, initargs=(model_name,))
+            # One task per worker spawns them all now rather than on the first queries
+            warmup = [self._processes.submit(_worker_dimension) for _ in range(self.workers)]
+            self.dimension = warmup[0].result()
+            for future in warmup:
+                future.result()
+        else:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name)
+            self.dimension = self.model.get_sentence_embedding_dimension()
+
+        self._stats_lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def encode(self, texts: List[str]) -> Future:
+        """Encode texts in the pool; the future resolves to a (len(texts), dim) array."""
+        if self._processes is not None:
+            return self._submit(self._processes, _worker_encode, texts)
+        return self._submit(self._threads, self.model.encode, texts)
+
+    def run(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) on the pool's threads (for NumPy work on in-process data)."""
+        return self._submit(self._threads, fn, *args)
+
+    def _submit(self, executor, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            raise PoolSaturated(f"Inference pool saturated ({self.workers} workers, {self.max_queue} queued)")
+        submitted = time.perf_counter()
+        with self._stats_lock:
+            self._submitted += 1
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._finished(submitted, failed=True)
+            raise
+        future.add_done_callback(lambda f: self._finished(submitted, failed=f.exception() is not None))
+        return future
+
+    def _finished(self, submitted: float, failed: bool):
+        latency = time.perf_counter() - submitted
+        with self._stats_lock:
+            self._pending -= 1
+            self._completed += 1
+            self._failed += int(failed)
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        """Stop accepting work and shut the executors down."""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth, saturation and task latency (submit to done)."""
+        with self._stats_lock:
+            return {
+                'kind': self.kind,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'running': min(self._pending, self.workers),
+                'queued': max(0, self._pending - self.workers),
+                'peak_pending': self._peak_pending,
+                'saturation': self._pending / (self.workers + self.max_queue),
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'latency_ms_avg': self._latency_total * 1000 / self._completed if self._completed else 0.0,
+                'latency_ms_max': self._latency_max * 1000,
+            }
@@ -0,0 +1,81 @@
+"""
+Lexical Index: in-memory BM25 inverted index over lecturer text.
+
+Tokens are case-folded word characters, so a course code such as "[CO3031]"
+becomes the token "co3031" and matches exactly, which sentence embeddings do
+poorly. Per-posting BM25 weights are precomputed at build time; a query only
+adds up the postings of its terms.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens (NFC, so composed and decomposed Vietnamese match)."""
+    return _TOKEN.findall(unicodedata.normalize('NFC', text).casefold())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a list of documents.
+
+    Args:
+        documents: One text per row (row i of the index is document i)
+        k1: Term-frequency saturation
+        b: Document-length normalization
+    """
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.size = len(documents)
+        term_rows: Dict[str, List[int]] = defaultdict(list)
+        term_counts: Dict[str, List[int]] = defaultdict(list)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for row, text in enumerate(documents):
+            counts: Dict[str, int] = defaultdict(int)
+            for token in tokenize(text):
+                counts[token] += 1
+            lengths[row] = sum(counts.values())
+            for token, count in counts.items():
+                term_rows[token].append(row)
+                term_counts[token].append(count)
+
+        average = float(lengths.mean()) if self.size and lengths.mean() > 0 else 1.0
+        # term -> (rows, BM25 weight of the term in each of those rows)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, rows in term_rows.items():
+            rows = np.asarray(rows, dtype=np.int64)
+            tf = np.asarray(term_counts[token], dtype=np.float32)
+            idf = np.log(1 + (self.size - len(rows) + 0.5) / (len(rows) + 0.5))
+            weights = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[rows] / average))
+            self.postings[token] = (rows, weights.astype(np.float32))
+
+    def search(self, query: str, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (rows, BM25 scores) of the k best-matching documents, best first.
+
+        Only documents containing at least one query term (and, given a
+        boolean row mask, only rows where it is True) are returned.
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = False
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+                matched = True
+        if not matched:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if mask is not None:
+            scores[~mask] = 0
+        rows = np.flatnonzero(scores)
+        if len(rows) > k:
+            rows = rows[np.argpartition(scores[rows], -k)[-k:]]
+        rows = rows[np.argsort(scores[rows])[::-1]]
+        return rows, scores[rows]
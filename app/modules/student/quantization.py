@@ -0,0 +1,100 @@
+"""
+Quantization: float16 / int8 storage for embedding matrices.
+
+QuantizedMatrix stands in for the float32 matrix wherever the search code uses
+one: `matrix @ query` scores every row straight from the quantized data (in
+chunks, so no full float32 copy is ever made) and `matrix[rows]` returns the
+selected rows dequantized. int8 keeps one float32 scale per row
+(max |value| / 127), so each row loses at most half a step per component.
+
+    float32  4 bytes per component (reference)
+    float16  2 bytes per component
+    int8     1 byte per component + 4 bytes per row
+
+int8 scores about as fast as float32; float16 is slower to score on most CPUs
+(NumPy converts half floats in software), so it only pays off when memory is
+the constraint.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+DTYPES = ('float32', 'float16', 'int8')
+
+# Rows quantized per step, bounding the temporary float32 copies
+QUANTIZE_CHUNK = 32768
+
+
+class QuantizedMatrix:
+    """
+    An (n, dim) matrix stored as float16, or as int8 with per-row scales.
+
+    Args:
+        data: float16 or int8 array of shape (n, dim) (may be memory-mapped)
+        scales: float32 array of shape (n,) for int8 data, else None
+    """
+
+    # Rows dequantized per step of a full product; small enough that the float32
+    # copy stays in cache (larger chunks made int8 scoring ~3x slower)
+    CHUNK = 1024
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.data = data
+        self.scales = scales
+        self.kind = 'int8' if scales is not None else 'float16'
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.data.shape
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, rows) -> np.ndarray:
+        """Return the selected rows (index array or slice) as float32."""
+        values = np.asarray(self.data[rows], dtype=np.float32)
+        if self.scales is not None:
+            values *= self.scales[rows][..., None]
+        return values
+
+    def __matmul__(self, query: np.ndarray) -> np.ndarray:
+        """Score every row against query (dim,) or queries (dim, m); returns float32 of shape (n,) or (n, m)."""
+        query = np.asarray(query, dtype=np.float32)
+        scores = np.empty((len(self),) + query.shape[1:], dtype=np.float32)
+        for start in range(0, len(self), self.CHUNK):
+            chunk = slice(start, start + self.CHUNK)
+            scores[chunk] = np.asarray(self.data[chunk], dtype=np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales.reshape((-1,) + (1,) * (scores.ndim - 1))
+        return scores
+
+
+def quantize(matrix: np.ndarray, kind: str) -> QuantizedMatrix:
+    """
+    Quantize a float32 matrix to kind ('float16' or 'int8').
+
+    Raises:
+        ValueError: for an unknown kind
+    """
+    if kind == 'float16':
+        return QuantizedMatrix(np.asarray(matrix, dtype=np.float16))
+    if kind == 'int8':
+        data = np.empty(matrix.shape, dtype=np.int8)
+        scales = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], QUANTIZE_CHUNK):
+            chunk = np.asarray(matrix[start:start + QUANTIZE_CHUNK], dtype=np.float32)
+            chunk_scales = np.abs(chunk).max(axis=1) / 127
+            chunk_scales[chunk_scales == 0] = 1
+            data[start:start + len(chunk)] = np.rint(chunk / chunk_scales[:, None])
+            scales[start:start + len(chunk)] = chunk_scales
+        return QuantizedMatrix(data, scales)
+    raise ValueError(f"Unknown quantization: {kind} (expected one of {', '.join(DTYPES[1:])})")
@@ -5,18 +5,66 @@ Requires authentication and 'student' role.
 
 import logging
 import json
-from datetime import datetime
 from flask import Blueprint, jsonify, session, request
 from app.modules.auth.routes import auth_required, role_required
 from app.data_manager import (
-    DatacoreManager, ScheduleManager, AssignmentManager, StudentBookingManager, TutorSessionManager
+    DatacoreManager, ScheduleManager, AssignmentManager, StudentBookingManager, TutorSessionManager,
+    SequenceManager, data_transaction, max_id_number
 )
-from . import tutorSearchService
+from . import tutorSearchService, tutorRecommender
+from .searchFilters import SearchFilters, parse_time
 
 logger = logging.getLogger(__name__)
 
 student_bp = Blueprint('student', __name__, url_prefix='/api')
 
+# Limits of POST /student/tutors/search/batch
+MAX_BATCH_QUERIES = 50
+MAX_BATCH_TOP_K = 20
+SEARCH_FILTER_PARAMS = ('department', 'faculty', 'min_rating', 'available_from', 'available_to')
+
+
+def _parse_search_filters(args) -> SearchFilters:
+    """
+    Build SearchFilters from the search endpoint's query parameters.
+
+    Raises:
+        ValueError: with a client-facing message for malformed parameters
+    """
+    min_rating = args.get('min_rating')
+    if min_rating is not None:
+        try:
+            min_rating = float(min_rating)
+        except ValueError:
+            raise ValueError('min_rating must be a number')
+    free_from, free_to = args.get('available_from'), args.get('available_to')
+    if (free_from is None) != (free_to is None):
+        raise ValueError('available_from and available_to must be given together')
+    if free_from is not None:
+        try:
+            free_from, free_to = parse_time(free_from), parse_time(free_to)
+        except ValueError:
+            raise ValueError('available_from and available_to must be ISO 8601 timestamps')
+        if free_to < free_from:
+            raise ValueError('available_to must not be before available_from')
+    return SearchFilters(department=args.get('department') or None, faculty=args.get('faculty') or None,
+                         min_rating=min_rating, free_from=free_from, free_to=free_to)
+
+
+def _format_search_result(tutor: dict) -> dict:
+    """Shape one tutor record (from semantic or exact search) for the search endpoints."""
+    tutor_data = {
+        'tutor_id': tutor.get('id'),
+        'tutor_name': tutor.get('name'),
+        'specialization': tutor.get('bio', 'N/A'),
+        'subjects': tutor.get('subjects', []),
+        'rating': tutor.get('rating', 0),
+        'email': tutor.get('email')
+    }
+    if 'availability' in tutor:
+        tutor_data['availability'] = tutor['availability']
+    return tutor_data
+
 
 @student_bp.route('/student/tutors/search', methods=['GET'])
 @auth_required
@@ -29,6 +77,14 @@ async def search_tutors_by_semantic():
     Requires: authentication, student role
     Query Parameters:
         - course_name: Course code/name to search for (required)
+        - department, faculty: Only tutors of this department / faculty (optional)
+        - min_rating: Only tutors rated at least this (optional)
+        - available_from, available_to: Only tutors with a free slot covering
+          this window, ISO 8601 (optional, given together)
+
+    While the semantic index is still warming up (or its inference queue is
+    full), tutors whose subjects match course_name exactly are returned
+    instead ("search_mode": "exact").
     
     Response (200):
         {
@@ -36,6 +92,8 @@ async def search_tutors_by_semantic():
             "message": "Tutors found",
             "data": {
                 "course_name": "CSC101",
+                "search_mode": "semantic",
+                "index_status": "ready",
                 "tutor_count": 1,
                 "tutors": [
                     {
@@ -44,12 +102,22 @@ async def search_tutors_by_semantic():
                         "specialization": "M.Sc. in Computer Science",
                         "subjects": ["CSC101", "CSC102", "CSC201"],
                         "rating": 4.8,
-                        "email": "tutor1@hcmut.edu.vn"
+                        "email": "tutor1@hcmut.edu.vn",
+                        "availability": {
+                            "earliest_free_slot": "2025-12-10T09:00:00Z",
+                            "free_hours": 12.0,
+                            "horizon_days": 14.0,
+                            "pending_bookings": 1
+                        }
                     },
                     ...
                 ]
             }
         }
+
+    Semantic results are ranked with a boost for tutors who are free soon, have
+    more free hours and fewer pending bookings; "availability" is omitted in
+    exact mode.
     """
     try:
         course_name = request.args.get('course_name')
@@ -61,28 +129,50 @@ async def search_tutors_by_semantic():
                 'message': 'Missing required parameter: course_name',
                 'data': None
             }), 400
+        try:
+            filters = _parse_search_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e),
+                'data': None
+            }), 400
         
         # Find tutors teaching this course
-        tutors = await tutorSearchService.search_tutors_by_meaning(course_name, top_k=5)
+        reason = None
+        if tutorSearchService.is_ready():
+            try:
+                search_mode = 'semantic'
+                tutors = await tutorSearchService.search_tutors_by_meaning(course_name, top_k=5, filters=filters)
+            except tutorSearchService.PoolSaturated:
+                # Inference queue full: shed load to the cheap exact match
+                reason = 'busy'
+        else:
+            # Model still loading: serve exact course matches instead of blocking
+            tutorSearchService.start_warmup()
+            reason = 'unavailable' if tutorSearchService.status()['status'] == 'failed' else 'warming up'
+        if reason is not None:
+            search_mode = 'exact'
+            tutors = DatacoreManager.find_tutors_by_course(course_name)
+            if filters.active:
+                schedule = ScheduleManager.get_schedule() if filters.needs_schedule else {}
+                tutors = [tutor for tutor in tutors if filters.matches(tutor, schedule)]
+            tutors = tutors[:5]
         # Format response
-        tutors_data = []
-        for tutor in tutors:
-            tutors_data.append({
-                'tutor_id': tutor.get('id'),
-                'tutor_name': tutor.get('name'),
-                'specialization': tutor.get('bio', 'N/A'),
-                'subjects': tutor.get('subjects', []),
-                'rating': tutor.get('rating', 0),
-                'email': tutor.get('email')
-            })
+        tutors_data = [_format_search_result(tutor) for tutor in tutors]
         
-        logger.info(f"Found {len(tutors_data)} tutors for course {course_name}")
+        logger.info(f"Found {len(tutors_data)} tutors for course {course_name} ({search_mode} search)")
+        message = f'Found {len(tutors_data)} tutors for course "{course_name}"'
+        if search_mode == 'exact':
+            message += f' (semantic search is {reason}; showing exact course matches)'
         
         return jsonify({
             'status': 'success',
-            'message': f'Found {len(tutors_data)} tutors for course "{course_name}"',
+            'message': message,
             'data': {
                 'course_name': course_name,
+                'search_mode': search_mode,
+                'index_status': tutorSearchService.status()['status'],
                 'tutor_count': len(tutors_data),
                 'tutors': tutors_data
             }
@@ -97,6 +187,140 @@ async def search_tutors_by_semantic():
         }), 500
 
 
+@student_bp.route('/student/tutors/search/batch', methods=['POST'])
+@auth_required
+@role_required('student')
+async def search_tutors_batch():
+    """
+    POST /api/student/tutors/search/batch
+
+    Search tutors for many courses/queries at once (e.g. every enrolled course
+    on the dashboard). All queries are encoded in one model call and scored
+    with one matrix product.
+    Requires: authentication, student role
+
+    Request Body:
+        {
+            "queries": ["CO3031", "Computer Networks", ...],   (required, at most 50)
+            "top_k": 5,                                         (optional, 1-20)
+            "department": "...", "faculty": "...", "min_rating": 4.5,
+            "available_from": "...", "available_to": "..."     (optional filters, as for GET /search)
+        }
+
+    Response (200):
+        {
+            "status": "success",
+            "message": "Found 7 tutors for 2 queries",
+            "data": {
+                "search_mode": "semantic",
+                "index_status": "ready",
+                "query_count": 2,
+                "results": [
+                    {"query": "CO3031", "tutor_count": 5, "tutors": [...]},
+                    ...
+                ],
+                "tutor_count": 7,
+                "tutors": [
+                    {"tutor_id": "LECTURER_001", ..., "matched_queries": ["CO3031"]},
+                    ...
+                ]
+            }
+        }
+
+    "tutors" is the union of all results without duplicates, in order of each
+    tutor's best rank. As with GET /search, exact course matches are returned
+    while the semantic index is unavailable ("search_mode": "exact").
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        queries = body.get('queries')
+        if not isinstance(queries, list) or not queries or \
+                not all(isinstance(q, str) and q.strip() for q in queries):
+            return jsonify({
+                'status': 'error',
+                'message': 'queries must be a non-empty list of strings',
+                'data': None
+            }), 400
+        if len(queries) > MAX_BATCH_QUERIES:
+            return jsonify({
+                'status': 'error',
+                'message': f'At most {MAX_BATCH_QUERIES} queries per batch',
+                'data': None
+            }), 400
+        top_k = body.get('top_k', 5)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_BATCH_TOP_K:
+            return jsonify({
+                'status': 'error',
+                'message': f'top_k must be an integer between 1 and {MAX_BATCH_TOP_K}',
+                'data': None
+            }), 400
+        try:
+            filters = _parse_search_filters({name: str(body[name]) for name in SEARCH_FILTER_PARAMS
+                                             if body.get(name) is not None})
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e),
+                'data': None
+            }), 400
+
+        reason = None
+        if tutorSearchService.is_ready():
+            try:
+                search_mode = 'semantic'
+                results = await tutorSearchService.search_tutors_batch(queries, top_k=top_k, filters=filters)
+            except tutorSearchService.PoolSaturated:
+                reason = 'busy'
+        else:
+            tutorSearchService.start_warmup()
+            reason = 'unavailable' if tutorSearchService.status()['status'] == 'failed' else 'warming up'
+        if reason is not None:
+            search_mode = 'exact'
+            schedule = ScheduleManager.get_schedule() if filters.needs_schedule else {}
+            results = [[tutor for tutor in DatacoreManager.find_tutors_by_course(query)
+                        if filters.matches(tutor, schedule)][:top_k] for query in queries]
+
+        # Union ordered by best rank, then by query order
+        union = {}
+        for rank in range(max(len(tutors) for tutors in results)):
+            for query, tutors in zip(queries, results):
+                if rank < len(tutors):
+                    tutor = tutors[rank]
+                    entry = union.setdefault(tutor.get('id'), {**_format_search_result(tutor), 'matched_queries': []})
+                    if query not in entry['matched_queries']:
+                        entry['matched_queries'].append(query)
+
+        message = f'Found {len(union)} tutors for {len(queries)} queries'
+        if search_mode == 'exact':
+            message += f' (semantic search is {reason}; showing exact course matches)'
+        logger.info(f"Batch search: {len(queries)} queries, {len(union)} tutors ({search_mode} search)")
+
+        return jsonify({
+            'status': 'success',
+            'message': message,
+            'data': {
+                'search_mode': search_mode,
+                'index_status': tutorSearchService.status()['status'],
+                'query_count': len(queries),
+                'results': [{
+                    'query': query,
+                    'tutor_count': len(tutors),
+                    'tutors': [_format_search_result(tutor) for tutor in tutors]
+                } for query, tutors in zip(queries, results)],
+                'tutor_count': len(union),
+                'tutors': list(union.values())
+            }
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error in batch tutor search: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Internal server error',
+            'data': None
+        }), 500
+
+
 @student_bp.route('/student/tutors/<tutor_id>', methods=['GET'])
 @auth_required
 @role_required('student')
@@ -178,7 +402,9 @@ def get_tutors_for_my_courses():
     """
     GET /api/student/tutors/my-courses
     
-    Get list of tutors teaching courses that the current student is enrolled in.
+    Get list of tutors teaching courses that the current student is enrolled in,
+    best match first by the precomputed student-tutor affinity (tutors without
+    one follow in course order).
     Requires: authentication, student role
     
     Response (200):
@@ -196,7 +422,8 @@ def get_tutors_for_my_courses():
                         "tutor_name": "Phạm Thị Tú",
                         "specialization": "M.Sc. in Computer Science",
                         "teaching_courses": ["CSC101", "CSC102", "CSC201"],
-                        "rating": 4.8
+                        "rating": 4.8,
+                        "affinity_score": 0.87
                     },
                     ...
                 ]
@@ -228,17 +455,24 @@ def get_tutors_for_my_courses():
                 if tutor_id not in tutors_by_course:
                     tutors_by_course[tutor_id] = tutor
         
+        # Best affinity first; sorted() is stable, so unscored tutors keep course order
+        affinities = tutorRecommender.affinities(student_id)
+        ranked = sorted(tutors_by_course.values(), key=lambda t: -affinities.get(t.get('id'), float('-inf')))
+
         # Format response
         tutors_data = []
-        for tutor in tutors_by_course.values():
-            tutors_data.append({
+        for tutor in ranked:
+            tutor_data = {
                 'tutor_id': tutor.get('id'),
                 'tutor_name': tutor.get('name'),
                 'specialization': tutor.get('bio', 'N/A'),
                 'teaching_courses': tutor.get('subjects', []),
                 'rating': tutor.get('rating', 0),
                 'email': tutor.get('email')
-            })
+            }
+            if tutor.get('id') in affinities:
+                tutor_data['affinity_score'] = affinities[tutor.get('id')]
+            tutors_data.append(tutor_data)
         
         logger.info(f"Retrieved {len(tutors_data)} tutors for student {student_id}")
         
@@ -263,6 +497,122 @@ def get_tutors_for_my_courses():
         }), 500
 
 
+@student_bp.route('/student/tutors/recommended', methods=['GET'])
+@auth_required
+@role_required('student')
+def get_recommended_tutors():
+    """
+    GET /api/student/tutors/recommended?limit=10
+
+    Get the tutors best matching the current student's enrolled courses, from
+    the precomputed student-tutor affinity table (no model call per request).
+    Requires: authentication, student role
+    Query Parameters:
+        - limit: Number of tutors, 1-50 (optional, default 10)
+
+    Until the table includes the student (e.g. while the model loads), tutors
+    teaching the most of the student's courses are returned instead
+    ("source": "course_match").
+
+    Response (200):
+        {
+            "status": "success",
+            "message": "3 recommended tutors",
+            "data": {
+                "student_id": "SE2025001",
+                "source": "affinity",
+                "tutor_count": 3,
+                "tutors": [
+                    {
+                        "tutor_id": "LECTURER_001",
+                        "tutor_name": "Bùi Hoài Thắng",
+                        "specialization": "...",
+                        "teaching_courses": ["[CO2017] - Hệ điều hành", ...],
+                        "shared_courses": ["[CO2017] - Hệ điều hành"],
+                        "rating": 4.8,
+                        "email": "bhthang@hcmut.edu.vn",
+                        "affinity_score": 0.87
+                    },
+                    ...
+                ]
+            }
+        }
+    """
+    try:
+        student_id = session.get('user_id')
+        try:
+            limit = int(request.args.get('limit', 10))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 50:
+            return jsonify({
+                'status': 'error',
+                'message': 'limit must be an integer between 1 and 50',
+                'data': None
+            }), 400
+
+        student_profile = DatacoreManager.get_student_by_id(student_id)
+        if not student_profile:
+            logger.warning(f"Student profile not found: {student_id}")
+            return jsonify({
+                'status': 'error',
+                'message': 'Student profile not found',
+                'data': None
+            }), 404
+        enrolled_courses = student_profile.get('courses', [])
+
+        recommended = tutorRecommender.recommend(student_id, limit)
+        if recommended is not None:
+            source = 'affinity'
+            tutors = [(DatacoreManager.get_tutor_by_id(tutor_id), score) for tutor_id, score in recommended]
+            tutors = [(tutor, score) for tutor, score in tutors if tutor]
+        else:
+            # Most shared courses first, then rating
+            source = 'course_match'
+            shared_counts = {}
+            for course in enrolled_courses:
+                for tutor in DatacoreManager.find_tutors_by_course(course):
+                    shared_counts.setdefault(tutor.get('id'), [tutor, 0])[1] += 1
+            ranked = sorted(shared_counts.values(), key=lambda e: (-e[1], -float(e[0].get('rating') or 0)))
+            tutors = [(tutor, None) for tutor, _ in ranked[:limit]]
+
+        tutors_data = []
+        for tutor, score in tutors:
+            tutor_data = {
+                'tutor_id': tutor.get('id'),
+                'tutor_name': tutor.get('name'),
+                'specialization': tutor.get('bio', 'N/A'),
+                'teaching_courses': tutor.get('subjects', []),
+                'shared_courses': [c for c in enrolled_courses if c in tutor.get('subjects', [])],
+                'rating': tutor.get('rating', 0),
+                'email': tutor.get('email')
+            }
+            if score is not None:
+                tutor_data['affinity_score'] = score
+            tutors_data.append(tutor_data)
+
+        logger.info(f"Recommended {len(tutors_data)} tutors for student {student_id} ({source})")
+
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(tutors_data)} recommended tutors',
+            'data': {
+                'student_id': student_id,
+                'source': source,
+                'tutor_count': len(tutors_data),
+                'tutors': tutors_data
+            }
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error recommending tutors: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Internal server error',
+            'data': None
+        }), 500
+
+
 @student_bp.route('/student/sessions/book', methods=['POST'])
 @auth_required
 @role_required('student')
@@ -319,11 +669,15 @@ def book_tutoring_session():
                 'data': None
             }), 404
         
+        # Unique slot-session ID, continuing after the existing SL<number> IDs
+        session_id = "SL{}".format(SequenceManager.next_value('SL', seed=lambda: max_id_number(
+            [b.get('session_id') for b in StudentBookingManager.get_all_bookings()], 'SL')))
+
         # Create booking using StudentBookingManager (status='pending' initially)
         booking_id = StudentBookingManager.create_booking(
             student_id=student_id,
             tutor_id=tutor_id,
-            session_id=f"SL{int(datetime.now().timestamp())}",  # Generate unique ID
+            session_id=session_id,
             course_name=course_name,
             tutor_name=tutor_profile.get('name'),
             date_time=slot_start,
@@ -338,6 +692,7 @@ def book_tutoring_session():
             }), 409
         
         logger.info(f"Student {student_id} booked slot with tutor {tutor_id}")
+        tutorSearchService.notify_availability_changed()
         
         # Send notification to tutor
         from app.modules.notification.services import NotificationService
@@ -415,6 +770,7 @@ def cancel_booking(booking_id):
         
         # Cancel booking
         StudentBookingManager.cancel_booking(booking_id)
+        tutorSearchService.notify_availability_changed()
         
         logger.info(f"Student {student_id} cancelled booking {booking_id}")
         
@@ -467,28 +823,25 @@ def approve_booking(booking_id):
                 'data': None
             }), 403
         
-        # Approve booking
-        StudentBookingManager.approve_booking(booking_id)
-        
-        logger.info(f"Tutor {tutor_id} approved booking {booking_id}")
-        
-        # Mark the original booking notification (for this tutor) as read
-        try:
-            from app.modules.notification.services import NotificationService
-            notif_service = NotificationService()
-            # find tutor notifications related to this booking and mark as read
+        from app.modules.notification.services import NotificationService
+        notif_service = NotificationService()
+        tutor_profile = DatacoreManager.get_user_profile(tutor_id)
+        tutor_name = tutor_profile.get('name', 'Unknown') if tutor_profile else 'Unknown'
+
+        # All steps are staged and flushed together; any failure leaves nothing applied
+        with data_transaction():
+            # Approve booking
+            if not StudentBookingManager.approve_booking(booking_id):
+                raise RuntimeError(f"Failed to approve booking {booking_id}")
+
+            # Mark the original booking notification (for this tutor) as read
             tutor_notifs = notif_service.get_user_notifications(tutor_id, limit=200)
             for n in tutor_notifs:
                 rd = n.get('related_data') or {}
                 if rd.get('booking_id') == booking_id:
                     notif_service.mark_notification_as_read(n.get('id'))
-        except Exception:
-            logger.exception('Failed to mark booking notification as read for tutor')
 
-        # Create a scheduled session for the tutor so it appears in sessions list
-        try:
-            from app.data_manager import TutorSessionManager
-            # Use booking info to create a session
+            # Create a scheduled session for the tutor so it appears in sessions list
             TutorSessionManager.create_session(
                 tutor_id=tutor_id,
                 course_name=booking.get('course_name', 'Unknown'),
@@ -497,16 +850,8 @@ def approve_booking(booking_id):
                 student_count=1,
                 duration_minutes=booking.get('duration_minutes', 60) or 60
             )
-        except Exception:
-            logger.exception('Failed to create tutor session after approval')
 
-        # Send notification to student
-        from app.modules.notification.services import NotificationService
-        notif_service = NotificationService()
-        try:
-            tutor_profile = DatacoreManager.get_user_profile(tutor_id)
-            tutor_name = tutor_profile.get('name', 'Unknown') if tutor_profile else 'Unknown'
-            
+            # Send notification to student
             notif_service.notify_booking_approved(
                 student_id=booking.get('student_id'),
                 tutor_name=tutor_name,
@@ -516,8 +861,9 @@ def approve_booking(booking_id):
                     'date_time': booking.get('date_time')
                 }
             )
-        except Exception as e:
-            logger.error(f"Failed to send approval notification: {e}")
+        
+        logger.info(f"Tutor {tutor_id} approved booking {booking_id}")
+        tutorSearchService.notify_availability_changed()
         
         return jsonify({
             'status': 'success',
@@ -568,30 +914,25 @@ def reject_booking(booking_id):
                 'data': None
             }), 403
         
-        # Reject booking
-        StudentBookingManager.reject_booking(booking_id)
-        
-        logger.info(f"Tutor {tutor_id} rejected booking {booking_id}")
-        
-        # Mark the original booking notification (for this tutor) as read
-        try:
-            from app.modules.notification.services import NotificationService
-            notif_service = NotificationService()
+        from app.modules.notification.services import NotificationService
+        notif_service = NotificationService()
+        tutor_profile = DatacoreManager.get_user_profile(tutor_id)
+        tutor_name = tutor_profile.get('name', 'Unknown') if tutor_profile else 'Unknown'
+
+        # All steps are staged and flushed together; any failure leaves nothing applied
+        with data_transaction():
+            # Reject booking
+            if not StudentBookingManager.reject_booking(booking_id):
+                raise RuntimeError(f"Failed to reject booking {booking_id}")
+
+            # Mark the original booking notification (for this tutor) as read
             tutor_notifs = notif_service.get_user_notifications(tutor_id, limit=200)
             for n in tutor_notifs:
                 rd = n.get('related_data') or {}
                 if rd.get('booking_id') == booking_id:
                     notif_service.mark_notification_as_read(n.get('id'))
-        except Exception:
-            logger.exception('Failed to mark booking notification as read for tutor')
 
-        # Send notification to student about rejection
-        from app.modules.notification.services import NotificationService
-        notif_service = NotificationService()
-        try:
-            tutor_profile = DatacoreManager.get_user_profile(tutor_id)
-            tutor_name = tutor_profile.get('name', 'Unknown') if tutor_profile else 'Unknown'
-            
+            # Send notification to student about rejection
             notif_service.notify_booking_rejected(
                 student_id=booking.get('student_id'),
                 tutor_name=tutor_name,
@@ -601,8 +942,9 @@ def reject_booking(booking_id):
                     'date_time': booking.get('date_time')
                 }
             )
-        except Exception as e:
-            logger.error(f"Failed to send rejection notification: {e}")
+        
+        logger.info(f"Tutor {tutor_id} rejected booking {booking_id}")
+        tutorSearchService.notify_availability_changed()
         
         return jsonify({
             'status': 'success',
@@ -0,0 +1,161 @@
+"""
+Search Filters: attribute filters for tutor search, evaluated as NumPy masks.
+
+TutorColumns holds one array per filterable attribute, aligned row for row
+with the index's embedding matrix; SlotColumns flattens every free slot in
+mock_schedule.json into (row, start, end) arrays. build_mask() turns a
+SearchFilters into a boolean row mask with a few vectorized comparisons, so a
+filtered search costs about the same as an unfiltered one.
+
+A tutor passes the free-slot filter when one of their slots covers the whole
+window (slot start <= window start and slot end >= window end), as in
+ScheduleManager.get_available_tutors_for_time_slot().
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+def parse_time(value: str) -> int:
+    """
+    Parse an ISO 8601 timestamp ('Z' or an offset; naive means UTC) into epoch seconds.
+
+    Raises:
+        ValueError: if value is not a valid timestamp
+    """
+    parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+class SearchFilters(NamedTuple):
+    """Filters for a tutor search; None means "any"."""
+    department: Optional[str] = None
+    faculty: Optional[str] = None
+    min_rating: Optional[float] = None
+    free_from: Optional[int] = None   # epoch seconds
+    free_to: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return any(value is not None for value in self)
+
+    @property
+    def needs_schedule(self) -> bool:
+        return self.free_from is not None
+
+    def matches(self, tutor: Dict[str, Any], schedule: Dict[str, Any]) -> bool:
+        """Evaluate the filters on one tutor record (for the exact-match fallback)."""
+        if self.department is not None and str(tutor.get('department', '')).casefold() != self.department.casefold():
+            return False
+        if self.faculty is not None and str(tutor.get('faculty', '')).casefold() != self.faculty.casefold():
+            return False
+        if self.min_rating is not None and float(tutor.get('rating') or 0) < self.min_rating:
+            return False
+        if self.needs_schedule:
+            for slot in schedule.get(tutor.get('id'), {}).get('slots', []):
+                try:
+                    if parse_time(slot['start']) <= self.free_from and parse_time(slot['end']) >= self.free_to:
+                        return True
+                except (KeyError, TypeError, ValueError):
+                    continue
+            return False
+        return True
+
+
+class _Codes(NamedTuple):
+    """A categorical column: one int code per row plus the case-folded value -> code map."""
+    codes: np.ndarray
+    vocabulary: Dict[str, int]
+
+    @classmethod
+    def build(cls, values: List[Any]) -> '_Codes':
+        vocabulary: Dict[str, int] = {}
+        codes = np.fromiter((vocabulary.setdefault(str(v or '').casefold(), len(vocabulary)) for v in values),
+                            dtype=np.int32, count=len(values))
+        return cls(codes, vocabulary)
+
+    def equals(self, value: str) -> np.ndarray:
+        code = self.vocabulary.get(value.casefold())
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+
+class TutorColumns(NamedTuple):
+    """Filterable lecturer attributes, aligned with the embedding rows."""
+    department: _Codes
+    faculty: _Codes
+    rating: np.ndarray
+
+    @classmethod
+    def build(cls, lecturers: List[Dict]) -> 'TutorColumns':
+        return cls.attach(*cls.table(lecturers))
+
+    @staticmethod
+    def table(lecturers: List[Dict]) -> Tuple[np.ndarray, Dict[str, Dict[str, int]]]:
+        """
+        Return the columns as one structured array (id, rating, department and
+        faculty code per row) plus the code vocabularies, ready to be published
+        to an EmbeddingStore that other workers attach to.
+        """
+        department = _Codes.build([l.get('department') for l in lecturers])
+        faculty = _Codes.build([l.get('faculty') for l in lecturers])
+        ids = [str(l.get('id', '')) for l in lecturers]
+        table = np.zeros(len(lecturers), dtype=[('id', f"U{max(map(len, ids), default=1) or 1}"), ('rating', 'f4'),
+                                                 ('department', 'i4'), ('faculty', 'i4')])
+        table['id'] = ids
+        table['rating'] = [float(l.get('rating') or 0) for l in lecturers]
+        table['department'] = department.codes
+        table['faculty'] = faculty.codes
+        return table, {'department': department.vocabulary, 'faculty': faculty.vocabulary}
+
+    @classmethod
+    def attach(cls, table: np.ndarray, vocabularies: Dict[str, Dict[str, int]]) -> 'TutorColumns':
+        """Wrap a table from table() (possibly memory-mapped) without copying it."""
+        return cls(_Codes(table['department'], vocabularies['department']),
+                   _Codes(table['faculty'], vocabularies['faculty']), table['rating'])
+
+
+class SlotColumns(NamedTuple):
+    """Every free slot of the indexed lecturers as parallel arrays."""
+    rows: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @classmethod
+    def build(cls, lecturers: List[Dict], schedule: Dict[str, Any]) -> 'SlotColumns':
+        rows, starts, ends = [], [], []
+        for row, lecturer in enumerate(lecturers):
+            for slot in schedule.get(lecturer.get('id'), {}).get('slots', []):
+                try:
+                    start, end = parse_time(slot['start']), parse_time(slot['end'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                rows.append(row)
+                starts.append(start)
+                ends.append(end)
+        return cls(np.asarray(rows, dtype=np.int64), np.asarray(starts, dtype=np.int64),
+                   np.asarray(ends, dtype=np.int64))
+
+
+def build_mask(filters: SearchFilters, columns: TutorColumns, slots: Optional[SlotColumns]) -> Optional[np.ndarray]:
+    """Return the boolean row mask for filters, or None when no filter is set."""
+    if not filters.active:
+        return None
+    mask = np.ones(len(columns.rating), dtype=bool)
+    if filters.department is not None:
+        mask &= columns.department.equals(filters.department)
+    if filters.faculty is not None:
+        mask &= columns.faculty.equals(filters.faculty)
+    if filters.min_rating is not None:
+        mask &= columns.rating >= filters.min_rating
+    if filters.needs_schedule:
+        free = np.zeros(len(mask), dtype=bool)
+        covering = (slots.starts <= filters.free_from) & (slots.ends >= filters.free_to)
+        free[slots.rows[covering]] = True
+        mask &= free
+    return mask
@@ -0,0 +1,164 @@
+"""
+Tutor Recommender: personalized tutor recommendations from a precomputed
+student x tutor affinity table.
+
+Each student's enrolled `courses` are embedded with the search model (and
+kept in their own EmbeddingStore, so only students whose courses changed are
+re-encoded). Affinity combines two matrix products over a chunk of students
+at a time:
+
+    semantic_weight * cosine(student courses, tutor profile)
+        + (1 - semantic_weight) * share of the student's courses the tutor teaches
+
+and only the top_n tutors of each student are kept. Requests are answered from
+that table, never by running the model.
+
+The table is refreshed from tutorSearchService's refresh listener, i.e. after
+the search index loads and whenever a datacore poll finds the file changed:
+students whose courses changed (or who are new) are recomputed, deleted
+students are dropped, and a new tutor index version (tutors added, edited or
+removed) recomputes everyone.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.data_manager import DatacoreManager
+from . import tutorSearchService
+from .embeddingStore import EmbeddingStore, content_hash
+
+logger = logging.getLogger(__name__)
+
+# Overridden from RECOMMENDATIONS_* by configure()
+top_n = 50
+semantic_weight = 0.5
+# Students scored per matrix product (bounds the (chunk, tutors) temporaries)
+CHUNK = 4096
+
+
+class Recommendation(NamedTuple):
+    """One student's precomputed top tutors."""
+    courses_hash: str
+    tutor_ids: Tuple[str, ...]
+    scores: np.ndarray
+
+
+# Table state; 'students' is replaced as a whole on every refresh
+_state: Dict[str, Any] = {
+    'students': {},            # student id -> Recommendation
+    'tutor_version': None,
+    'last_refresh': None,
+    'refresh_seconds': None,
+}
+_refresh_lock = threading.Lock()
+
+
+def student_text(student: Dict) -> str:
+    """Return the string we embed for a student's enrollments."""
+    return "Courses: " + ", ".join(student.get('courses', []))
+
+
+def configure(config: Dict[str, Any]) -> None:
+    """Apply settings from a Flask config mapping and follow the search index's refreshes."""
+    global top_n, semantic_weight
+    top_n = int(config.get('RECOMMENDATIONS_TOP_N', top_n))
+    semantic_weight = float(config.get('RECOMMENDATIONS_SEMANTIC_WEIGHT', semantic_weight))
+    tutorSearchService.add_refresh_listener(refresh)
+
+
+def _affinity(student_embeddings: np.ndarray, student_courses: List[List[str]],
+              index: 'tutorSearchService.SearchIndex') -> Tuple[np.ndarray, np.ndarray]:
+    """Return (top tutor rows, scores) of shape (students, top_n) for one chunk of students."""
+    cosine = (index.embeddings @ np.asarray(student_embeddings, dtype=np.float32).T).T
+
+    # Course incidence matrices: (students, courses) @ (courses, tutors) = shared course counts
+    vocabulary: Dict[str, int] = {}
+    for courses in student_courses:
+        for course in courses:
+            vocabulary.setdefault(course, len(vocabulary))
+    enrolled = np.zeros((len(student_courses), len(vocabulary)), dtype=np.float32)
+    for row, courses in enumerate(student_courses):
+        enrolled[row, [vocabulary[c] for c in courses]] = 1
+    teaches = np.zeros((len(vocabulary), len(index.lecturers)), dtype=np.float32)
+    for column, lecturer in enumerate(index.lecturers):
+        rows = [vocabulary[s] for s in lecturer.get('subjects', []) if s in vocabulary]
+        teaches[rows, column] = 1
+    shared = (enrolled @ teaches) / np.maximum(enrolled.sum(axis=1, keepdims=True), 1)
+
+    affinity = semantic_weight * cosine + (1 - semantic_weight) * shared
+    n = min(top_n, affinity.shape[1])
+    if n <= 0:
+        empty = np.empty((len(affinity), 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    best = np.argpartition(-affinity, n - 1, axis=1)[:, :n] if n < affinity.shape[1] \
+        else np.tile(np.arange(affinity.shape[1]), (len(affinity), 1))
+    scores = np.take_along_axis(affinity, best, axis=1)
+    order = np.argsort(-scores, axis=1)
+    return np.take_along_axis(best, order, axis=1), np.take_along_axis(scores, order, axis=1).astype(np.float32)
+
+
+def refresh(index: 'tutorSearchService.SearchIndex', pool) -> int:
+    """
+    Bring the affinity table up to date with the datacore and the tutor index.
+
+    Returns:
+        Number of students whose recommendations were recomputed.
+    """
+    with _refresh_lock:
+        started = time.perf_counter()
+        students = DatacoreManager.get_all_students()
+        items = [(s['id'], student_text(s)) for s in students]
+        hashes = [content_hash(text) for _, text in items]
+        current = _state['students']
+        everyone = _state['tutor_version'] != index.version
+        stale = [i for i, (student, courses_hash) in enumerate(zip(students, hashes))
+                 if everyone or getattr(current.get(student['id']), 'courses_hash', None) != courses_hash]
+        if not stale and len(current) == len(students):
+            return 0
+
+        table = {s['id']: current[s['id']] for s in students if s['id'] in current}
+        if stale:
+            store = EmbeddingStore(tutorSearchService.embedding_store_dir / 'students', tutorSearchService.MODEL_NAME)
+            embeddings, _ = store.sync(items, lambda texts: pool.encode(texts).result(), pool.dimension)
+            tutor_ids = [lecturer['id'] for lecturer in index.lecturers]
+            for start in range(0, len(stale), CHUNK):
+                chunk = stale[start:start + CHUNK]
+                rows, scores = _affinity(embeddings[chunk], [students[i].get('courses', []) for i in chunk], index)
+                for i, student_rows, student_scores in zip(chunk, rows, scores):
+                    table[students[i]['id']] = Recommendation(
+                        hashes[i], tuple(tutor_ids[r] for r in student_rows), student_scores)
+
+        _state.update(students=table, tutor_version=index.version, last_refresh=time.time(),
+                      refresh_seconds=time.perf_counter() - started)
+        logger.info(f"Tutor recommendations: {len(stale)} of {len(students)} students recomputed "
+                    f"in {_state['refresh_seconds']:.2f}s")
+        return len(stale)
+
+
+def recommend(student_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+    """Return the student's top k (tutor id, affinity) pairs, or None if not computed yet."""
+    recommendation = _state['students'].get(student_id)
+    if recommendation is None:
+        return None
+    return [(tutor_id, float(score)) for tutor_id, score in
+            zip(recommendation.tutor_ids[:k], recommendation.scores[:k])]
+
+
+def affinities(student_id: str) -> Dict[str, float]:
+    """Return {tutor id: affinity} for the student's top tutors (empty if not computed yet)."""
+    return dict(recommend(student_id, top_n) or [])
+
+
+def status() -> Dict[str, Any]:
+    """Return table size and freshness for health checks."""
+    return {
+        'students': len(_state['students']),
+        'top_n': top_n,
+        'tutor_index_version': _state['tutor_version'],
+        'last_refresh': _state['last_refresh'],
+        'refresh_seconds': _state['refresh_seconds'],
+    }
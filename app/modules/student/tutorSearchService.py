@@ -1,46 +1,616 @@
+"""
+Tutor Search Service: semantic tutor search over lecturer bios, subjects and
+qualifications.
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from app.data_manager import DatacoreManager
-import numpy as np
+The SentenceTransformer model and the lecturer embedding matrix are built
+lazily, normally by a background warm-up thread started from create_app(), so
+importing this module (and starting the server) never waits for the model.
+Until the index is ready, is_ready() is False and callers should fall back to
+exact course matching.
+
+Lecturer embeddings are persisted in an EmbeddingStore, so a restart only
+encodes tutors whose text changed. The matrix and the filter columns (ids,
+ratings, department and faculty codes) are published there as files that
+every worker process memory-maps, so N workers share one copy in the page
+cache. The store's version counter is polled every version_poll seconds; when
+another worker published a rebuild, this one refreshes and attaches to it.
+Once ready, a watcher thread polls the datacore file's signature and, when it
+changed, re-embeds new or edited tutors, drops deleted ones and swaps in a new
+SearchIndex, so search stays fresh without a restart; an unchanged file costs
+one stat per poll. Tables derived from the index (see tutorRecommender) follow
+it through add_refresh_listener().
+Top-k lookup goes through a vectorIndex backend: exact by default, or IVF for
+large catalogs (SEMANTIC_SEARCH_INDEX=ivf). Query embeddings and ranked results
+are kept in LRU caches; results are keyed by index version, so a refresh never
+serves a stale ranking. Cache misses from concurrent requests are encoded
+together by an EncodeBatcher, and both encoding and vector search run on an
+InferencePool (threads, or processes that each load the model), so the
+request's event loop is never blocked by inference.
+search_tutors_batch() serves many queries with one encode call and one
+matrix product.
+
+In 'hybrid' retrieval (the default), a BM25 lexical index picks candidates
+and the embeddings only rerank them, with a fused score; exact course codes
+like "[CO3031]" then match precisely and each query scores a handful of rows
+instead of the whole catalog.
+
+Filters (department, faculty, minimum rating, free slot) are applied as NumPy
+row masks over attribute columns aligned with the embeddings, before top-k.
+
+Ranking also favours tutors who are actually bookable: an AvailabilitySummary
+(earliest free slot, free hours in the coming days, pending bookings) is
+precomputed per index row and rebuilt only when the schedule, the bookings or
+the index change, and availability_weight times its score is added to every
+candidate's relevance.
+"""
+
+import asyncio
 import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Any, NamedTuple, Tuple, Callable
+
+import numpy as np
+
+from app.data_manager import DatacoreManager, ScheduleManager, StudentBookingManager, BASE_DB_PATH
+from .availabilitySummary import AvailabilitySummary
+from .embeddingStore import EmbeddingStore, columns_digest, content_hash
+from .encodeBatcher import EncodeBatcher
+from .inferencePool import InferencePool, PoolSaturated
+from .lexicalIndex import BM25Index
+from .searchCache import LRUCache, normalize_query
+from .searchFilters import SearchFilters, SlotColumns, TutorColumns, build_mask
+from . import vectorIndex
+from .vectorIndex import VectorIndex, create_index
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+# Overridden from EMBEDDING_STORE_DIR / SEMANTIC_SEARCH_* by configure()
+embedding_store_dir = BASE_DB_PATH / 'embeddings'
+reindex_interval = 5.0
+# How often the watcher checks the store's version counter for rebuilds published by other workers
+version_poll = 1.0
+index_kind = 'exact'
+# 'float32', or a quantized form ('float16', 'int8') scored directly by the vector index
+embedding_dtype = 'float32'
+index_options: Dict[str, Any] = {}
+# EncodeBatcher settings; max_batch <= 1 encodes each query on its own
+batch_options: Dict[str, Any] = {'max_batch': 32, 'max_wait_ms': 5}
+pool_options: Dict[str, Any] = {'kind': 'thread', 'workers': 2, 'max_queue': 64}
+# 'hybrid' (BM25 candidates reranked by embeddings) or 'semantic' (embeddings only)
+retrieval = 'hybrid'
+# Lexical candidates reranked per query, and the semantic share of the fused score
+candidate_count = 50
+fusion_weight = 0.7
+# Boost added to relevance per unit of availability score (0 ranks by relevance alone),
+# the look-ahead for free hours, and the oldest an availability summary may get
+availability_weight = 0.1
+availability_days = 14.0
+availability_refresh = 60.0
+# Seconds between checks of the schedule and bookings for edits by other workers
+# (edits in this process call notify_availability_changed() and show at once)
+AVAILABILITY_CHECK_SECONDS = 1.0
 
-lecturers_data = DatacoreManager.get_all_tutors()
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+class SearchIndex(NamedTuple):
+    """One immutable generation of the index; searches read it once and never see a half-swap."""
+    lecturers: List[Dict]
+    embeddings: np.ndarray
+    keys: List[Tuple[str, str]]   # (tutor id, content hash) per row
+    version: int
+    vectors: VectorIndex
+    lexical: Optional[BM25Index]
+    columns: TutorColumns
+    columns_digest: str
+    store_version: int            # EmbeddingStore.version() this index was attached at
+    datacore_signature: Optional[Tuple]  # DatacoreManager.signature() the lecturers were read at
 
-lecturer_texts = []
 
-for l in lecturers_data:
-    # Combine bio, subjects, and qualifications into one string
-    subjects_str = ", ".join(l.get("subjects", []))
-    qual_str = ", ".join(l.get("qualifications", []))
-    bio_str = l.get("bio", "")
-    
+# Index state; 'index' is replaced as a whole on every refresh
+_state: Dict[str, Any] = {
+    'status': 'cold',         # cold -> warming_up -> ready | failed
+    'error': None,
+    'pool': None,
+    'batcher': None,
+    'index': None,
+    'warmup_seconds': None,
+    'last_refresh': None,
+}
+_state_lock = threading.Lock()
+# Serializes refreshes (watcher thread vs. explicit refresh_index() calls)
+_refresh_lock = threading.Lock()
+_ready = threading.Event()
+# Set when warm-up finishes, successfully or not
+_done = threading.Event()
+# callback(index, pool), run after the index loads and after every refresh that saw the datacore change
+_refresh_listeners: List[Callable[[SearchIndex, InferencePool], Any]] = []
+
+# Free-slot columns for the current index and schedule; the schedule changes
+# independently of the index, so they are rebuilt whenever either changes
+_slots: Dict[str, Any] = {'version': None, 'schedule': None, 'columns': None, 'generation': 0}
+_slots_lock = threading.Lock()
+
+# Availability summary (and its per-row scores) for the current slot columns and
+# bookings; 'stale' is set by notify_availability_changed()
+_availability: Dict[str, Any] = {'summary': None, 'scores': None, 'slot_generation': None, 'bookings': None,
+                                 'stale': False, 'generation': 0, 'version': None, 'checked': 0.0}
+_availability_lock = threading.Lock()
+
+# Normalized query -> unit query embedding
+_query_cache = LRUCache(1024, 3600)
+# (normalized query, top_k, index version, filters, slot generation, availability generation)
+# -> (row indices, scores)
+_result_cache = LRUCache(1024, 3600)
+
+
+def build_lecturer_text(lecturer: Dict) -> str:
+    """Combine bio, subjects, and qualifications into the string we embed for a lecturer."""
+    subjects_str = ", ".join(lecturer.get("subjects", []))
+    qual_str = ", ".join(lecturer.get("qualifications", []))
+    bio_str = lecturer.get("bio", "")
     # This string represents the "meaning" of the lecturer
-    combined_text = f"{bio_str} Subjects: {subjects_str} Qualifications: {qual_str}"
-    lecturer_texts.append(combined_text)
-
-lecturer_embeddings = model.encode(lecturer_texts)
-
-async def search_tutors_by_meaning(query, top_k=5):
-    query_embedding = model.encode([query])
-    
-    similarities = cosine_similarity(query_embedding, lecturer_embeddings)[0]
-    
-    top_k_indices = np.argsort(similarities)[-top_k:][::-1]
-    
+    return f"{bio_str} Subjects: {subjects_str} Qualifications: {qual_str}"
+
+
+def configure(config: Dict[str, Any]) -> None:
+    """Apply search settings from a Flask config mapping and start warm-up if requested."""
+    global embedding_store_dir, reindex_interval, index_kind, index_options, batch_options, pool_options
+    global retrieval, candidate_count, fusion_weight, embedding_dtype, _query_cache, _result_cache
+    global availability_weight, availability_days, availability_refresh, version_poll
+    if config.get('EMBEDDING_STORE_DIR'):
+        embedding_store_dir = Path(config['EMBEDDING_STORE_DIR'])
+    reindex_interval = float(config.get('SEMANTIC_SEARCH_REINDEX_SECONDS', reindex_interval))
+    version_poll = float(config.get('SEMANTIC_SEARCH_VERSION_POLL_SECONDS', version_poll))
+    index_kind = config.get('SEMANTIC_SEARCH_INDEX', index_kind)
+    embedding_dtype = config.get('SEMANTIC_SEARCH_EMBEDDING_DTYPE', embedding_dtype)
+    if index_kind == 'ivf':
+        index_options = {'n_lists': int(config.get('SEMANTIC_SEARCH_IVF_LISTS', 0)),
+                         'nprobe': int(config.get('SEMANTIC_SEARCH_IVF_NPROBE', 8))}
+    batch_options = {'max_batch': int(config.get('SEMANTIC_SEARCH_BATCH_SIZE', batch_options['max_batch'])),
+                     'max_wait_ms': float(config.get('SEMANTIC_SEARCH_BATCH_WAIT_MS', batch_options['max_wait_ms']))}
+    pool_options = {'kind': config.get('SEMANTIC_SEARCH_POOL', pool_options['kind']),
+                    'workers': int(config.get('SEMANTIC_SEARCH_POOL_WORKERS', pool_options['workers'])),
+                    'max_queue': int(config.get('SEMANTIC_SEARCH_POOL_MAX_QUEUE', pool_options['max_queue']))}
+    retrieval = config.get('SEMANTIC_SEARCH_RETRIEVAL', retrieval)
+    candidate_count = int(config.get('SEMANTIC_SEARCH_CANDIDATES', candidate_count))
+    fusion_weight = float(config.get('SEMANTIC_SEARCH_FUSION_WEIGHT', fusion_weight))
+    availability_weight = float(config.get('SEMANTIC_SEARCH_AVAILABILITY_WEIGHT', availability_weight))
+    availability_days = float(config.get('SEMANTIC_SEARCH_AVAILABILITY_DAYS', availability_days))
+    availability_refresh = float(config.get('SEMANTIC_SEARCH_AVAILABILITY_REFRESH_SECONDS', availability_refresh))
+    ttl = float(config.get('SEMANTIC_SEARCH_CACHE_TTL_SECONDS', _query_cache.ttl_seconds))
+    _query_cache = LRUCache(int(config.get('SEMANTIC_SEARCH_QUERY_CACHE_SIZE', _query_cache.max_entries)), ttl)
+    _result_cache = LRUCache(int(config.get('SEMANTIC_SEARCH_RESULT_CACHE_SIZE', _result_cache.max_entries)), ttl)
+    # Spawned inference pool processes re-run the main module as __mp_main__ (and
+    # so create_app()); they must not start a warm-up, and a pool, of their own
+    in_pool_worker = '__mp_main__' in sys.modules
+    if config.get('SEMANTIC_SEARCH_WARMUP', 'background') == 'background' and not in_pool_worker:
+        start_warmup()
+
+
+def _build_index(pool: InferencePool, version: int, current: Optional[SearchIndex] = None,
+                 signature: Optional[Tuple] = None) -> Optional[SearchIndex]:
+    """Embed the datacore's current lecturers (read at signature); returns None if they match current."""
+    lecturers = DatacoreManager.get_all_tutors()
+    items = [(l['id'], build_lecturer_text(l)) for l in lecturers]
+    keys = [(tutor_id, content_hash(text)) for tutor_id, text in items]
+    table, vocabularies = TutorColumns.table(lecturers)
+    digest = columns_digest(table, vocabularies)
+    if current is not None and keys == current.keys and digest == current.columns_digest:
+        return None
+    # Rows are stored normalized, so cosine similarity is a plain dot product.
+    # The store reuses rows whose (id, hash) is unchanged and encodes only the rest.
+    store = EmbeddingStore(embedding_store_dir, MODEL_NAME)
+    embeddings, encoded = store.sync(items, lambda texts: pool.encode(texts).result(), pool.dimension)
+    if embedding_dtype != 'float32':
+        embeddings = store.quantized(embedding_dtype)
+    if current is not None:
+        logger.info(f"Semantic index v{version}: {len(lecturers)} lecturers, {encoded} re-embedded")
+    vectors = create_index(index_kind, embeddings, current.vectors if current else None, **index_options)
+    lexical = BM25Index([text for _, text in items]) if retrieval == 'hybrid' else None
+    columns = TutorColumns.attach(*store.publish_columns(table, vocabularies))
+    return SearchIndex(lecturers, embeddings, keys, version, vectors, lexical, columns, digest, store.version(),
+                       signature)
+
+
+def _load_index():
+    """Load the model and embed every lecturer (slow; runs on the warm-up thread)."""
+    started = time.perf_counter()
+    try:
+        # Loads the model (in this process or in each pool process); importing
+        # sentence_transformers (and torch) alone takes seconds
+        pool = InferencePool(MODEL_NAME, **pool_options)
+        with _refresh_lock:
+            index = _build_index(pool, 1, signature=DatacoreManager.signature())
+    except Exception as e:
+        logger.error(f"Semantic search unavailable: {e}")
+        with _state_lock:
+            _state.update(status='failed', error=str(e))
+        _done.set()
+        return
+
+    batcher = EncodeBatcher(pool.encode, **batch_options) if batch_options['max_batch'] > 1 else None
+    elapsed = time.perf_counter() - started
+    _query_cache.clear()
+    _result_cache.clear()
+    with _state_lock:
+        _state.update(status='ready', error=None, pool=pool, batcher=batcher, index=index,
+                      warmup_seconds=elapsed, last_refresh=time.time())
+    _ready.set()
+    _done.set()
+    logger.info(f"Semantic search ready: {len(index.lecturers)} lecturers indexed in {elapsed:.1f}s")
+    _notify_listeners()
+    if reindex_interval > 0:
+        threading.Thread(target=_watch_datacore, name='tutor-search-reindex', daemon=True).start()
+
+
+def refresh_index() -> bool:
+    """
+    Bring the index up to date with the datacore.
+
+    Does nothing while the datacore file is unchanged since the current index
+    was built. Otherwise re-embeds only new or edited lecturers, drops deleted
+    ones, swaps the new SearchIndex in atomically (searches in flight keep the
+    old one) and runs the refresh listeners.
+
+    Returns:
+        True if a new index version was installed, False if nothing changed
+        (or the index is not ready yet).
+    """
+    if not is_ready():
+        return False
+    with _refresh_lock:
+        current = _state['index']
+        signature = DatacoreManager.signature()
+        changed = signature is None or signature != current.datacore_signature
+        index = _build_index(_state['pool'], current.version + 1, current, signature) if changed else None
+        store_version = EmbeddingStore(embedding_store_dir, MODEL_NAME).version()
+        with _state_lock:
+            _state['last_refresh'] = time.time()
+            if index is not None:
+                _state['index'] = index
+            elif changed or store_version != current.store_version:
+                # Remember what this index is current with (e.g. another worker
+                # published what this one already serves), so it is not re-checked
+                _state['index'] = current._replace(store_version=store_version, datacore_signature=signature)
+        if index is not None:
+            # Entries for older versions can no longer be hit; free them
+            _result_cache.clear()
+    if changed:
+        _notify_listeners()
+    return index is not None
+
+
+def add_refresh_listener(callback: Callable[[SearchIndex, InferencePool], Any]) -> None:
+    """
+    Call callback(index, pool) once the index is ready and after every refresh
+    that found the datacore changed, whether or not its tutors did (e.g. to
+    keep tables derived from students current).
+    """
+    if callback not in _refresh_listeners:
+        _refresh_listeners.append(callback)
+    if is_ready():
+        threading.Thread(target=_notify_listeners, name='tutor-search-listeners', daemon=True).start()
+
+
+def _notify_listeners():
+    index, pool = _state['index'], _state['pool']
+    for callback in list(_refresh_listeners):
+        try:
+            callback(index, pool)
+        except Exception as e:
+            logger.error(f"Semantic index refresh listener {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+def notify_availability_changed() -> None:
+    """Rebuild the availability summary on the next search (call after a slot or booking change)."""
+    with _availability_lock:
+        _availability['stale'] = True
+
+
+def _watch_datacore():
+    """
+    Check the datacore every reindex_interval seconds, or as soon as another
+    worker publishes a new store version.
+    """
+    store = EmbeddingStore(embedding_store_dir, MODEL_NAME)
+    last_refresh = time.monotonic()
+    while True:
+        time.sleep(min(reindex_interval, version_poll))
+        if not (time.monotonic() - last_refresh >= reindex_interval
+                or store.version() != _state['index'].store_version):
+            continue
+        last_refresh = time.monotonic()
+        try:
+            refresh_index()
+        except Exception as e:
+            # Keep serving the previous index; the next poll retries
+            logger.error(f"Semantic index refresh failed: {e}")
+
+
+def start_warmup() -> None:
+    """Start loading the model and index on a background thread (no-op if already started)."""
+    with _state_lock:
+        if _state['status'] != 'cold':
+            return
+        _state['status'] = 'warming_up'
+    threading.Thread(target=_load_index, name='tutor-search-warmup', daemon=True).start()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """Block until the index is ready (starting warm-up if needed); returns is_ready()."""
+    start_warmup()
+    _done.wait(timeout)
+    return is_ready()
+
+
+def is_ready() -> bool:
+    """True once the model is loaded and every lecturer is embedded."""
+    return _ready.is_set()
+
+
+def status() -> Dict[str, Any]:
+    """Return the index status for health checks and API responses."""
+    with _state_lock:
+        index = _state['index']
+        return {
+            'status': _state['status'],
+            'error': _state['error'],
+            'lecturer_count': len(index.lecturers) if index else 0,
+            'index_version': index.version if index else None,
+            'vector_index': index.vectors.describe() if index else None,
+            'embedding_dtype': embedding_dtype,
+            'embedding_bytes': index.embeddings.nbytes if index else 0,
+            'store_version': index.store_version if index else None,
+            'warmup_seconds': _state['warmup_seconds'],
+            'last_refresh': _state['last_refresh'],
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss counters of the query-embedding and result caches."""
+    return {'query_embeddings': _query_cache.stats(), 'results': _result_cache.stats()}
+
+
+def pool_stats() -> Optional[Dict[str, Any]]:
+    """Return InferencePool size, queue depth and saturation (None before the model is loaded)."""
+    pool = _state['pool']
+    return pool.stats() if pool is not None else None
+
+
+def batch_stats() -> Optional[Dict[str, Any]]:
+    """Return EncodeBatcher counters (None when batching is off or the model is not loaded)."""
+    batcher = _state['batcher']
+    return batcher.stats() if batcher is not None else None
+
+
+async def _embed_query(query: str) -> np.ndarray:
+    """Return the unit embedding of a normalized query, from the cache when possible."""
+    embedding = _query_cache.get(query)
+    if embedding is None:
+        batcher = _state['batcher']
+        if batcher is not None:
+            row = await batcher.encode(query)
+        else:
+            row = (await asyncio.wrap_future(_state['pool'].encode([query])))[0]
+        # Copy: batched rows are views into one shared array
+        embedding = np.array(row, dtype=np.float32)
+        embedding /= np.linalg.norm(embedding) or 1
+        embedding.setflags(write=False)
+        _query_cache.put(query, embedding)
+    return embedding
+
+
+def _slot_columns(index: SearchIndex) -> Tuple[SlotColumns, int]:
+    """Return the free-slot columns for index and the current schedule, and their generation."""
+    schedule = ScheduleManager.get_schedule()
+    with _slots_lock:
+        # The data layer hands out a new object whenever the file changes
+        if _slots['version'] != index.version or _slots['schedule'] is not schedule:
+            _slots.update(version=index.version, schedule=schedule,
+                          columns=SlotColumns.build(index.lecturers, schedule), generation=_slots['generation'] + 1)
+        return _slots['columns'], _slots['generation']
+
+
+def _availability_summary(index: SearchIndex) -> Tuple[AvailabilitySummary, np.ndarray, int]:
+    """Return the availability summary for index, its per-row scores, and its generation."""
+    with _availability_lock:
+        if (_availability['summary'] is not None and not _availability['stale']
+                and _availability['version'] == index.version
+                and time.monotonic() - _availability['checked'] < AVAILABILITY_CHECK_SECONDS):
+            return _availability['summary'], _availability['scores'], _availability['generation']
+    slots, slot_generation = _slot_columns(index)
+    bookings = StudentBookingManager.get_all_bookings()
+    now = int(time.time())
+    with _availability_lock:
+        summary = _availability['summary']
+        if (summary is None or _availability['stale'] or _availability['slot_generation'] != slot_generation
+                or _availability['bookings'] is not bookings or now - summary.as_of >= availability_refresh):
+            summary = AvailabilitySummary.build(index.lecturers, slots, bookings, now, availability_days)
+            _availability.update(summary=summary, scores=summary.scores(), slot_generation=slot_generation,
+                                 bookings=bookings, stale=False, generation=_availability['generation'] + 1,
+                                 version=index.version)
+        _availability['checked'] = time.monotonic()
+        return summary, _availability['scores'], _availability['generation']
+
+
+def _rank(index: SearchIndex, query: str, query_embedding: Optional[np.ndarray], k: int,
+          mask: Optional[np.ndarray] = None, availability: Optional[np.ndarray] = None):
+    """
+    Return (rows, scores) of the k best lecturers for a normalized query.
+
+    Hybrid: score = fusion_weight * cosine + (1 - fusion_weight) * BM25 / best BM25,
+    over the top lexical candidates. When fewer than k lecturers share a term
+    with the query, the vector index's top k are added as candidates. Only
+    rows where mask (if given) is True are considered. Given per-row
+    availability scores, availability_weight times them is added to each
+    candidate's score before the final top k.
+    """
+    embeddings = query_embedding[None, :] if query_embedding is not None else None
+    return _rank_batch(index, [query], embeddings, k, mask, availability)[0]
+
+
+def _rank_batch(index: SearchIndex, queries: List[str], query_embeddings: Optional[np.ndarray], k: int,
+                mask: Optional[np.ndarray] = None, availability: Optional[np.ndarray] = None):
+    """
+    _rank() for several queries at once; returns one (rows, scores) per query.
+
+    Cosine similarities come from one matrix product: the vector index's
+    search_batch() in semantic retrieval, or the union of every query's
+    candidate rows against all query embeddings (m, dim) in hybrid retrieval.
+    """
+    if index.lexical is None:
+        if availability is None:
+            return index.vectors.search_batch(query_embeddings, k, mask)
+        ranked = []
+        for rows, scores in index.vectors.search_batch(query_embeddings, max(candidate_count, k), mask):
+            scores = scores + availability_weight * availability[rows]
+            best = vectorIndex.top_k(scores, k)
+            ranked.append((rows[best], scores[best]))
+        return ranked
+
+    candidates = [index.lexical.search(query, max(candidate_count, k), mask) for query in queries]
+    short = [i for i, (rows, _) in enumerate(candidates) if len(rows) < k]
+    if short and query_embeddings is not None:
+        for i, (extra, _) in zip(short, index.vectors.search_batch(query_embeddings[short], k, mask)):
+            rows, lexical = candidates[i]
+            extra = extra[~np.isin(extra, rows)]
+            candidates[i] = (np.concatenate([rows, extra]),
+                             np.concatenate([lexical, np.zeros(len(extra), dtype=np.float32)]))
+
+    union = np.unique(np.concatenate([rows for rows, _ in candidates]))
+    if query_embeddings is not None and len(union):
+        similarities = index.embeddings[union] @ np.asarray(query_embeddings, dtype=np.float32).T
+    ranked = []
+    for i, (rows, lexical) in enumerate(candidates):
+        if len(rows) == 0:
+            ranked.append((rows, lexical))
+            continue
+        if lexical[0] > 0:
+            lexical = lexical / lexical[0]
+        fused = (1 - fusion_weight) * lexical
+        if query_embeddings is not None:
+            fused = fused + fusion_weight * similarities[np.searchsorted(union, rows), i]
+        if availability is not None:
+            fused = fused + availability_weight * availability[rows]
+        best = vectorIndex.top_k(fused, k)
+        ranked.append((rows[best], fused[best]))
+    return ranked
+
+
+async def search_tutors_by_meaning(query, top_k=5, filters: Optional[SearchFilters] = None):
+    """
+    Return the top_k lecturers most similar to query, each with a similarity_score
+    (cosine similarity, or the fused score in hybrid retrieval, plus the
+    availability boost) and an 'availability' summary.
+
+    Only lecturers passing filters are ranked, so a filtered search still
+    returns up to top_k results.
+
+    Raises:
+        RuntimeError: if the index is not ready yet (check is_ready() first).
+        PoolSaturated: if the inference pool's queue is full.
+    """
+    if not is_ready():
+        start_warmup()
+        raise RuntimeError("Semantic search index is warming up")
+    index = _state['index']
+    query = normalize_query(query)
+
+    filters = filters if filters is not None and filters.active else None
+    slots, slot_generation = _slot_columns(index) if filters is not None and filters.needs_schedule else (None, None)
+
+    # Ranking only reads availability when it is weighted in; otherwise the
+    # summary is only needed to describe the results
+    summary, availability, availability_generation = \
+        _availability_summary(index) if availability_weight > 0 else (None, None, None)
+
+    key = (query, top_k, index.version, filters, slot_generation, availability_generation)
+    ranked = _result_cache.get(key)
+    if ranked is None:
+        mask = build_mask(filters, index.columns, slots) if filters is not None else None
+        # A purely lexical fusion (weight 0) needs no model call at all
+        query_embedding = await _embed_query(query) if index.lexical is None or fusion_weight > 0 else None
+        ranked = await asyncio.wrap_future(_state['pool'].run(_rank, index, query, query_embedding, top_k, mask,
+                                                              availability))
+        _result_cache.put(key, ranked)
+    return _describe(index, summary if summary is not None else _availability_summary(index)[0], ranked)
+
+
+async def search_tutors_batch(queries: List[str], top_k=5,
+                              filters: Optional[SearchFilters] = None) -> List[List[Dict]]:
+    """
+    search_tutors_by_meaning() for many queries at once; returns one result list per query.
+
+    Queries missing from the result cache are encoded in one model call and
+    ranked together by _rank_batch(), so a batch costs about one search.
+
+    Raises:
+        RuntimeError: if the index is not ready yet (check is_ready() first).
+        PoolSaturated: if the inference pool's queue is full.
+    """
+    if not is_ready():
+        start_warmup()
+        raise RuntimeError("Semantic search index is warming up")
+    index = _state['index']
+    queries = [normalize_query(query) for query in queries]
+
+    filters = filters if filters is not None and filters.active else None
+    slots, slot_generation = _slot_columns(index) if filters is not None and filters.needs_schedule else (None, None)
+
+    # Ranking only reads availability when it is weighted in; otherwise the
+    # summary is only needed to describe the results
+    summary, availability, availability_generation = \
+        _availability_summary(index) if availability_weight > 0 else (None, None, None)
+
+    keys = [(query, top_k, index.version, filters, slot_generation, availability_generation) for query in queries]
+    ranked = [_result_cache.get(key) for key in keys]
+    # Each distinct uncached query is ranked once, however often it repeats in the batch
+    missing = list(dict.fromkeys(query for query, hit in zip(queries, ranked) if hit is None))
+    if missing:
+        mask = build_mask(filters, index.columns, slots) if filters is not None else None
+        embeddings = await _embed_queries(missing) if index.lexical is None or fusion_weight > 0 else None
+        fresh = dict(zip(missing, await asyncio.wrap_future(
+            _state['pool'].run(_rank_batch, index, missing, embeddings, top_k, mask, availability))))
+        for i, query in enumerate(queries):
+            if ranked[i] is None:
+                ranked[i] = fresh[query]
+                _result_cache.put(keys[i], ranked[i])
+    summary = summary if summary is not None else _availability_summary(index)[0]
+    return [_describe(index, summary, item) for item in ranked]
+
+
+async def _embed_queries(queries: List[str]) -> np.ndarray:
+    """Return the unit embeddings (m, dim) of normalized queries, encoding the uncached ones in one call."""
+    embeddings = [_query_cache.get(query) for query in queries]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        rows = await asyncio.wrap_future(_state['pool'].encode([queries[i] for i in missing]))
+        for i, row in zip(missing, rows):
+            embedding = np.array(row, dtype=np.float32)
+            embedding /= np.linalg.norm(embedding) or 1
+            embedding.setflags(write=False)
+            _query_cache.put(queries[i], embedding)
+            embeddings[i] = embedding
+    return np.stack(embeddings)
+
+
+def _describe(index: SearchIndex, summary: AvailabilitySummary, ranked) -> List[Dict]:
+    """Turn ranked (rows, scores) into lecturer records with similarity_score and availability."""
     results = []
-    for idx in top_k_indices:
-        tutor_info = lecturers_data[idx].copy()
-        tutor_info["similarity_score"] = float(similarities[idx])
+    for idx, score in zip(*ranked):
+        tutor_info = index.lecturers[idx].copy()
+        tutor_info["similarity_score"] = float(score)
+        tutor_info["availability"] = summary.describe(idx)
         results.append(tutor_info)
-    
     return results
 
 
 if __name__ == "__main__":
     test_query = "Introduction to Algorithms"
-    import asyncio
+    wait_until_ready()
     results = asyncio.run(search_tutors_by_meaning(test_query, top_k=3))
-    print(json.dumps(results, indent=2))
\ No newline at end of file
+    print(json.dumps(results, indent=2))
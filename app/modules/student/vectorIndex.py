@@ -0,0 +1,206 @@
+"""
+Vector Index: top-k inner-product search over L2-normalized embeddings.
+
+Two interchangeable backends share the VectorIndex interface:
+
+- ExactIndex scores every row with one matrix-vector product (one
+  matrix-matrix product for search_batch) and selects the top k with
+  np.argpartition (O(n) instead of a full O(n log n) sort).
+- IVFIndex (inverted file) clusters rows with k-means into n_lists lists and
+  scores only the rows of the nprobe lists whose centroids are closest to the
+  query. Raising nprobe trades latency for recall; nprobe == n_lists is exact.
+
+Both are pure NumPy, so they work on the memory-mapped matrix from the
+EmbeddingStore without copying it. Both accept a boolean row mask (see
+searchFilters) and only return rows where it is True.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the k largest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+def masked_top_k(scores: np.ndarray, k: int, mask: Optional[np.ndarray]) -> np.ndarray:
+    """top_k() restricted to rows where mask is True (all rows when mask is None)."""
+    if mask is None:
+        return top_k(scores, k)
+    best = top_k(np.where(mask, scores, -np.inf), k)
+    return best[mask[best]]
+
+
+class VectorIndex:
+    """Interface for a top-k index over the rows of an (n, dim) matrix of unit vectors."""
+
+    kind = None
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def search(self, query: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows with the highest inner product with query.
+
+        Args:
+            query: Unit vector of length dim
+            k: Number of results
+            mask: Optional boolean array over rows; only True rows are returned
+
+        Returns:
+            (row indices, scores), best first; fewer than k if the index is smaller
+        """
+        raise NotImplementedError
+
+    def search_batch(self, queries: np.ndarray, k: int,
+                     mask: Optional[np.ndarray] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """search() for every row of queries (m, dim); returns one (row indices, scores) per query."""
+        return [self.search(query, k, mask) for query in queries]
+
+    def describe(self):
+        """Return the backend name and knobs for status reports."""
+        return {'kind': self.kind, 'size': len(self)}
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force index: exact results, one pass over the whole matrix per query."""
+
+    kind = 'exact'
+
+    def search(self, query, k, mask=None):
+        # A float64 query would upcast the whole matrix for the product
+        scores = self.matrix @ np.asarray(query, dtype=np.float32)
+        indices = masked_top_k(scores, k, mask)
+        return indices, scores[indices]
+
+    def search_batch(self, queries, k, mask=None):
+        # One matrix-matrix product scores every row against every query
+        scores = self.matrix @ np.asarray(queries, dtype=np.float32).T
+        results = []
+        for column in range(scores.shape[1]):
+            indices = masked_top_k(scores[:, column], k, mask)
+            results.append((indices, scores[indices, column]))
+        return results
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file index over k-means clusters of the rows.
+
+    Args:
+        matrix: (n, dim) unit vectors
+        n_lists: Number of clusters; 0 picks about sqrt(n)
+        nprobe: Lists scanned per query (recall/latency knob, clamped to n_lists)
+        centroids: Reuse these instead of training (e.g. from the previous
+            index generation, so a refresh only re-assigns rows)
+        train_iters: Lloyd iterations when training
+        train_size: Rows sampled for training
+        seed: Sampling seed, for reproducible builds
+    """
+
+    kind = 'ivf'
+
+    # Rows assigned to centroids per matrix product, to bound temporary memory
+    ASSIGN_CHUNK = 65536
+
+    def __init__(self, matrix: np.ndarray, n_lists: int = 0, nprobe: int = 8,
+                 centroids: Optional[np.ndarray] = None, train_iters: int = 10,
+                 train_size: int = 50000, seed: int = 0):
+        super().__init__(matrix)
+        n = matrix.shape[0]
+        if centroids is None or centroids.shape[1] != matrix.shape[1]:
+            n_lists = n_lists or max(1, int(np.sqrt(n)))
+            centroids = self._train(matrix, min(n_lists, max(n, 1)), train_iters, train_size, seed)
+        self.centroids = centroids
+        self.nprobe = max(1, min(nprobe, len(centroids)))
+
+        assignments = self._assign(matrix, centroids)
+        # Row ids grouped by list: list i is order[offsets[i]:offsets[i + 1]]
+        self.order = np.argsort(assignments, kind='stable')
+        self.offsets = np.searchsorted(assignments[self.order], np.arange(len(centroids) + 1))
+
+    @classmethod
+    def _assign(cls, matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Return the nearest centroid (highest inner product) for every row."""
+        assignments = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], cls.ASSIGN_CHUNK):
+            chunk = np.asarray(matrix[start:start + cls.ASSIGN_CHUNK], dtype=np.float32)
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignments
+
+    @classmethod
+    def _train(cls, matrix: np.ndarray, n_lists: int, iters: int, train_size: int, seed: int) -> np.ndarray:
+        """Spherical k-means on a sample of the rows."""
+        rng = np.random.default_rng(seed)
+        n = matrix.shape[0]
+        if n == 0:
+            return np.zeros((1, matrix.shape[1]), dtype=np.float32)
+        sample = matrix[np.sort(rng.choice(n, min(n, max(train_size, n_lists)), replace=False))]
+        sample = np.asarray(sample, dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iters):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            # Empty clusters keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = sums[filled]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1, norms)
+        return centroids
+
+    def search(self, query, k, mask=None, nprobe: Optional[int] = None):
+        nprobe = max(1, min(nprobe or self.nprobe, len(self.centroids)))
+        query = np.asarray(query, dtype=np.float32)
+        lists = top_k(self.centroids @ query, nprobe)
+        rows = np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            # A selective filter leaves fewer rows than the probed lists hold:
+            # scoring just those is cheaper, and exact
+            rows = allowed if len(allowed) <= len(rows) else rows[mask[rows]]
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+        rows.sort()  # sequential reads from a memory-mapped matrix
+        scores = self.matrix[rows] @ query
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def describe(self):
+        return {'kind': self.kind, 'size': len(self), 'n_lists': len(self.centroids), 'nprobe': self.nprobe}
+
+
+def create_index(kind: str, matrix: np.ndarray, previous: Optional[VectorIndex] = None, **options) -> VectorIndex:
+    """
+    Build a VectorIndex backend by name.
+
+    Args:
+        kind: 'exact' or 'ivf'
+        matrix: (n, dim) unit vectors
+        previous: Index being replaced; an IVF rebuild reuses its centroids
+        **options: Backend knobs (IVFIndex: n_lists, nprobe, ...)
+
+    Raises:
+        ValueError: for an unknown kind
+    """
+    if kind == 'exact':
+        return ExactIndex(matrix)
+    if kind == 'ivf':
+        if isinstance(previous, IVFIndex) and options.get('n_lists', 0) in (0, len(previous.centroids)):
+            options['centroids'] = previous.centroids
+        return IVFIndex(matrix, **options)
+    raise ValueError(f"Unknown vector index kind: {kind}")
@@ -0,0 +1,174 @@
+"""
+Snapshot Module: one compact binary file holding every JSON collection, for
+fast cold start.
+
+`dump_snapshot()` marshals the parsed contents of database/*.json together with
+each file's (mtime, size, inode) signature. At boot the connectors and
+MockDataManager take a file's data from the snapshot only while that signature
+still matches the file on disk; any file written since the dump is parsed from
+JSON as before, so a stale snapshot is never served.
+
+    python -m app.tools.snapshot_dump [--path database/snapshot.bin]
+"""
+
+import gc
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from app.file_lock import FileLock, atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# marshal's format may change between Python versions, so the header names the
+# interpreter that wrote the file and any other interpreter ignores it
+SNAPSHOT_MAGIC = f"TSSNAP1 py{sys.version_info[0]}.{sys.version_info[1]}\n".encode()
+SNAPSHOT_VERSION = 1
+DB_PATH = Path(__file__).parent.parent / 'database'
+
+# Read at import time because the connectors load before the Flask config
+snapshot_path = Path(os.environ.get('DATA_SNAPSHOT_PATH') or DB_PATH / 'snapshot.bin')
+
+_loaded: Optional[Dict[str, Dict[str, Any]]] = None
+_lock = threading.Lock()
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Return a file's (mtime, size, inode), or None if it does not exist."""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def dump_snapshot(path: Optional[Path] = None, db_path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Write every JSON file in db_path into a single snapshot file.
+
+    Write-ahead logs are compacted first so each file on disk is complete.
+
+    Returns:
+        Size in bytes of each file's JSON source, by filename.
+    """
+    from app.data_manager import MockDataManager, INDEXED_COLLECTIONS
+
+    path = Path(path or snapshot_path)
+    db_path = Path(db_path or DB_PATH)
+    for filename in INDEXED_COLLECTIONS:
+        MockDataManager.compact(filename)
+    MockDataManager.flush_pending()
+
+    files = {}
+    sizes = {}
+    for file_path in sorted(db_path.glob('*.json')):
+        with FileLock(file_path).shared():
+            signature = file_signature(file_path)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping {file_path.name} in snapshot: {e}")
+                continue
+        files[str(file_path.resolve())] = {'signature': signature, 'data': data}
+        sizes[file_path.name] = signature[1]
+
+    payload = {
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'files': files
+    }
+    atomic_write_bytes(path, SNAPSHOT_MAGIC + marshal.dumps(payload))
+    logger.info(f"Wrote snapshot of {len(files)} files to {path}")
+    return sizes
+
+
+def load_snapshot(path: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a snapshot file.
+
+    Returns:
+        Absolute file path -> {'signature', 'data'}, or an empty dict if the
+        snapshot is missing, unreadable or from another format version.
+    """
+    path = Path(path or snapshot_path)
+    try:
+        with open(path, 'rb') as f:
+            if f.readline() != SNAPSHOT_MAGIC:
+                logger.warning(f"Ignoring {path}: not a snapshot file for this Python version")
+                return {}
+            # Loading allocates millions of small containers; the cyclic GC
+            # would otherwise rescan them repeatedly during the load
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                payload = marshal.loads(f.read())
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return {}
+    if not isinstance(payload, dict) or payload.get('version') != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot {path}: unsupported format version")
+        return {}
+    return payload.get('files', {})
+
+
+def _entries() -> Dict[str, Dict[str, Any]]:
+    global _loaded
+    with _lock:
+        if _loaded is None:
+            _loaded = load_snapshot()
+            if _loaded:
+                logger.info(f"Loaded snapshot of {len(_loaded)} files from {snapshot_path}")
+        return _loaded
+
+
+def lookup(path: Path) -> Optional[Any]:
+    """
+    Return the snapshot's data for a JSON file if the file is unchanged since
+    the dump, else None (the caller should parse the file).
+    """
+    file_path = Path(path).resolve()
+    entry = _entries().get(str(file_path))
+    if entry is None or entry['signature'] != file_signature(file_path):
+        return None
+    return entry['data']
+
+
+def fresh_entries(db_path: Path) -> Dict[str, Tuple[Tuple[int, int, int], Any]]:
+    """Return filename -> (signature, data) for every up-to-date file of db_path in the snapshot."""
+    db_path = Path(db_path).resolve()
+    result = {}
+    for key, entry in _entries().items():
+        file_path = Path(key)
+        if file_path.parent == db_path and entry['signature'] == file_signature(file_path):
+            result[file_path.name] = (entry['signature'], entry['data'])
+    return result
+
+
+def use(path: Path) -> None:
+    """Switch to another snapshot file (e.g. from the Flask config)."""
+    global snapshot_path, _loaded
+    path = Path(path)
+    with _lock:
+        if path.resolve() != snapshot_path.resolve():
+            snapshot_path = path
+            _loaded = None
+
+
+def release() -> None:
+    """Drop the loaded snapshot once boot is complete; the caches keep what they took."""
+    global _loaded
+    with _lock:
+        _loaded = {}
+
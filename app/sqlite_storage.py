@@ -0,0 +1,220 @@
+"""
+SQLite Storage Module: persists the indexed data_manager collections in a local
+SQLite database instead of whole-file JSON.
+
+Each collection gets one table holding the full record as JSON plus copies of
+the fields we look records up by, so lookups use B-tree indexes rather than a
+full-file parse. List-valued fields (e.g. a lecturer's 'subjects') are exploded
+into a side table.
+
+One-shot import from the JSON files:
+    python -m app.tools.sqlite_import [--db database/tutor_support.sqlite3]
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# filename -> (table, collection key, unique field, indexed fields, list-valued indexed fields)
+SQLITE_TABLES = {
+    'mock_datacore.json': ('users', 'users', 'id', ('role_in_school',), ('subjects',)),
+    'mock_tutor_sessions.json': ('sessions', 'sessions', 'session_id', ('tutor_id', 'date_time'), ()),
+    'mock_assignments.json': ('assignments', 'assignments', 'assignment_id', ('tutor_id', 'student_id'), ()),
+    'mock_student_bookings.json': ('bookings', 'bookings', 'booking_id',
+                                   ('student_id', 'tutor_id', 'session_id', 'date_time'), ()),
+}
+
+
+class SqliteCollection:
+    """Read view over one table with the same lookup interface as RecordIndex."""
+
+    def __init__(self, storage: 'SqliteStorage', filename: str):
+        self.storage = storage
+        self.filename = filename
+        self.table, self.collection, self.key_field, self.fields, self.list_fields = SQLITE_TABLES[filename]
+
+    def _rows(self, sql: str, params: Tuple = ()) -> List[Dict]:
+        cursor = self.storage.connection().execute(sql, params)
+        return [json.loads(row[0]) for row in cursor]
+
+    def get(self, value: Any) -> Optional[Dict]:
+        """Return the record whose unique field equals value."""
+        rows = self._rows(f'SELECT data FROM {self.table} WHERE "{self.key_field}" = ?', (value,))
+        return rows[0] if rows else None
+
+    def group(self, field: str, value: Any) -> List[Dict]:
+        """Return all records whose indexed field equals (or contains) value."""
+        if field in self.list_fields:
+            return self._rows(
+                f'SELECT t.data FROM {self.table} t JOIN {self.table}_{field} s ON s.key = t."{self.key_field}" '
+                f'WHERE s.value = ? ORDER BY t.rowid', (value,))
+        if field not in self.fields:
+            raise KeyError(field)
+        return self._rows(f'SELECT data FROM {self.table} WHERE "{field}" = ? ORDER BY rowid', (value,))
+
+    def all(self) -> List[Dict]:
+        """Return every record in insertion order."""
+        return self._rows(f'SELECT data FROM {self.table} ORDER BY rowid')
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The collection in its JSON-file shape."""
+        return {self.collection: self.all()}
+
+
+class SqliteStorage:
+    """SQLite-backed store for the collections in SQLITE_TABLES."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._create_schema()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Yield this thread's connection inside BEGIN IMMEDIATE, committed on exit
+        (rolled back if the block raises). Writes inside an enclosing
+        transaction() join it, so several collections can commit together.
+
+        sqlite3 only begins a transaction at the first INSERT/UPDATE/DELETE, so a
+        read-modify-write would read outside it; taking the write lock up front
+        keeps another process from writing between the read and the write.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+
+    def _create_schema(self):
+        conn = self.connection()
+        with conn:
+            for table, _, key_field, fields, list_fields in SQLITE_TABLES.values():
+                columns = ''.join(f', "{field}" TEXT' for field in fields)
+                conn.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                             f'("{key_field}" TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)')
+                for field in fields:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{field} ON {table}("{field}")')
+                for field in list_fields:
+                    conn.execute(f'CREATE TABLE IF NOT EXISTS {table}_{field} (value TEXT, key TEXT)')
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{field}_value ON {table}_{field}(value)')
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{field}_key ON {table}_{field}(key)')
+
+    def collection(self, filename: str) -> SqliteCollection:
+        """Return a lookup view over the table backing filename."""
+        return SqliteCollection(self, filename)
+
+    def _write_row(self, conn: sqlite3.Connection, filename: str, record: Dict[str, Any], update: bool = False) -> int:
+        table, _, key_field, fields, list_fields = SQLITE_TABLES[filename]
+        key = record.get(key_field)
+        values = [record.get(field) for field in fields]
+        data = json.dumps(record, ensure_ascii=False)
+        if update:
+            assignments = ''.join(f'"{field}" = ?, ' for field in fields)
+            cursor = conn.execute(f'UPDATE {table} SET {assignments}data = ? WHERE "{key_field}" = ?',
+                                  (*values, data, key))
+        else:
+            columns = ''.join(f', "{field}"' for field in fields)
+            placeholders = ', '.join('?' * (len(fields) + 2))
+            cursor = conn.execute(f'INSERT OR IGNORE INTO {table} ("{key_field}"{columns}, data) '
+                                  f'VALUES ({placeholders})', (key, *values, data))
+        if cursor.rowcount:
+            for field in list_fields:
+                conn.execute(f'DELETE FROM {table}_{field} WHERE key = ?', (key,))
+                conn.executemany(f'INSERT INTO {table}_{field} (value, key) VALUES (?, ?)',
+                                 [(value, key) for value in record.get(field) or []])
+        return cursor.rowcount
+
+    def insert(self, filename: str, record: Dict[str, Any]) -> bool:
+        """Insert a record; returns False if its key already exists."""
+        with self.transaction() as conn:
+            return bool(self._write_row(conn, filename, record))
+
+    def update(self, filename: str, key: Any, changes: Dict[str, Any]) -> Optional[Dict]:
+        """Set fields on the record with the given key; returns the updated record."""
+        with self.transaction() as conn:
+            record = self.collection(filename).get(key)
+            if record is None:
+                return None
+            record.update(changes)
+            self._write_row(conn, filename, record, update=True)
+            return record
+
+    def delete(self, filename: str, key: Any) -> bool:
+        """Delete the record with the given key; returns False if it did not exist."""
+        with self.transaction() as conn:
+            return bool(self._delete_row(conn, filename, key))
+
+    def _delete_row(self, conn: sqlite3.Connection, filename: str, key: Any) -> int:
+        table, _, key_field, _, list_fields = SQLITE_TABLES[filename]
+        for field in list_fields:
+            conn.execute(f'DELETE FROM {table}_{field} WHERE key = ?', (key,))
+        return conn.execute(f'DELETE FROM {table} WHERE "{key_field}" = ?', (key,)).rowcount
+
+    def apply(self, filename: str, entries: List[Dict[str, Any]]):
+        """Apply insert/update/delete log entries in a single SQLite transaction."""
+        view = self.collection(filename)
+        with self.transaction() as conn:
+            for entry in entries:
+                if entry['op'] == 'insert':
+                    self._write_row(conn, filename, entry['record'])
+                elif entry['op'] == 'update':
+                    record = view.get(entry['key'])
+                    if record is not None:
+                        record.update(entry['changes'])
+                        self._write_row(conn, filename, record, update=True)
+                elif entry['op'] == 'delete':
+                    self._delete_row(conn, filename, entry['key'])
+
+    def replace_all(self, filename: str, records: List[Dict[str, Any]]):
+        """Replace the whole table with records (first record wins on duplicate keys)."""
+        table, _, _, _, list_fields = SQLITE_TABLES[filename]
+        with self.transaction() as conn:
+            conn.execute(f'DELETE FROM {table}')
+            for field in list_fields:
+                conn.execute(f'DELETE FROM {table}_{field}')
+            for record in records:
+                self._write_row(conn, filename, record)
+
+
+def import_json_files(db_path: Path) -> Dict[str, int]:
+    """
+    Copy every collection in SQLITE_TABLES from the JSON database into SQLite.
+
+    Existing table contents are replaced. Reads go through MockDataManager with
+    the JSON engine, so pending write-ahead logs are included.
+
+    Returns:
+        Number of records imported per file.
+    """
+    from app.data_manager import MockDataManager
+
+    storage = SqliteStorage(db_path)
+    counts = {}
+    for filename, (_, collection, _, _, _) in SQLITE_TABLES.items():
+        records = MockDataManager.load_json(filename).get(collection, [])
+        storage.replace_all(filename, records)
+        counts[filename] = len(records)
+        logger.info(f"Imported {len(records)} records from {filename}")
+    return counts
+
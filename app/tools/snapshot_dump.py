@@ -0,0 +1,28 @@
+"""
+Write every database/*.json into one binary snapshot (see app/snapshot.py).
+
+    python -m app.tools.snapshot_dump [--path database/snapshot.bin]
+"""
+
+import argparse
+from pathlib import Path
+
+from app.Config import Config
+from app.data_manager import MockDataManager
+from app.snapshot import dump_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Write database/*.json into one snapshot file')
+    parser.add_argument('--path', default=Config.DATA_SNAPSHOT_PATH, help='Snapshot file')
+    args = parser.parse_args()
+
+    settings = {k: v for k, v in vars(Config).items() if k.isupper()}
+    settings['DATA_STORAGE_ENGINE'] = 'json'
+    MockDataManager.configure(settings)
+    for name, size in dump_snapshot(Path(args.path)).items():
+        print(f"{name}: {size} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+One-shot import of the JSON database into SQLite (see app/sqlite_storage.py).
+
+    python -m app.tools.sqlite_import [--db database/tutor_support.sqlite3]
+"""
+
+import argparse
+from pathlib import Path
+
+from app.Config import Config
+from app.data_manager import MockDataManager
+from app.sqlite_storage import import_json_files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load database/*.json into SQLite')
+    parser.add_argument('--db', default=Config.SQLITE_DB_PATH, help='SQLite database file')
+    args = parser.parse_args()
+
+    settings = {k: v for k, v in vars(Config).items() if k.isupper()}
+    settings['DATA_STORAGE_ENGINE'] = 'json'
+    MockDataManager.configure(settings)
+    for name, count in import_json_files(Path(args.db)).items():
+        print(f"{name}: {count} records")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Write-Behind Module: debounced background flushing for hot JSON collections.
+
+Callers apply a mutation in memory and mark its collection dirty; a daemon
+thread flushes the collection once it has been quiet for interval_ms, and never
+later than max_staleness_ms after its first unflushed write. A burst of slot
+edits or mark-as-read calls therefore costs one file write instead of one per
+call. Pending writes are flushed on interpreter exit and on SIGTERM.
+"""
+
+import atexit
+import logging
+import signal
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFlusher:
+    """Debounces flushes of dirty collections onto a background thread."""
+
+    def __init__(self, interval_ms: int = 200, max_staleness_ms: int = 2000):
+        self.interval = interval_ms / 1000.0
+        self.max_staleness = max(max_staleness_ms, interval_ms) / 1000.0
+        self._lock = threading.Condition()
+        # key -> [flush callback, first unflushed write, last write]
+        self._dirty: Dict[str, list] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._stats = {'writes': 0, 'coalesced_writes': 0, 'flushes': 0, 'failed_flushes': 0,
+                       'flush_ms_total': 0.0, 'flush_ms_max': 0.0, 'flush_ms_last': 0.0}
+
+    def mark_dirty(self, key: str, flush: Callable[[], bool]) -> None:
+        """
+        Record a write to key; flush() persists it and returns True on success.
+
+        Writes made while key is already dirty are coalesced into its next flush.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._stats['writes'] += 1
+            entry = self._dirty.get(key)
+            if entry is None:
+                self._dirty[key] = [flush, now, now]
+            else:
+                self._stats['coalesced_writes'] += 1
+                entry[0] = flush
+                entry[2] = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+            self._lock.notify()
+
+    def _due(self, entry: list) -> float:
+        """Return the time at which a dirty entry must be flushed."""
+        return min(entry[2] + self.interval, entry[1] + self.max_staleness)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._stopped:
+                    now = time.monotonic()
+                    due = [key for key, entry in self._dirty.items() if self._due(entry) <= now]
+                    if due:
+                        break
+                    timeout = min((self._due(entry) for entry in self._dirty.values()), default=None)
+                    self._lock.wait(None if timeout is None else timeout - now)
+                if self._stopped:
+                    return
+            for key in due:
+                self.flush(key)
+
+    def flush(self, key: Optional[str] = None) -> bool:
+        """
+        Flush one dirty key now, or every dirty key when key is None.
+
+        Returns:
+            True if every flush succeeded, False otherwise.
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._dirty)
+        ok = True
+        for name in keys:
+            with self._lock:
+                entry = self._dirty.pop(name, None)
+            if entry is None:
+                continue
+            started = time.perf_counter()
+            try:
+                flushed = entry[0]()
+            except Exception as e:
+                logger.error(f"Write-behind flush of {name} failed: {e}")
+                flushed = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['flush_ms_total'] += elapsed
+                self._stats['flush_ms_max'] = max(self._stats['flush_ms_max'], elapsed)
+                self._stats['flush_ms_last'] = elapsed
+                if not flushed:
+                    # Keep the key dirty and retry on the next pass
+                    self._stats['failed_flushes'] += 1
+                    self._dirty.setdefault(name, [entry[0], entry[1], time.monotonic()])
+                    ok = False
+        return ok
+
+    def stop(self) -> None:
+        """Flush everything and stop the background thread."""
+        self.flush()
+        with self._lock:
+            self._stopped = True
+            self._lock.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return write, coalescing and flush-latency counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['dirty'] = len(self._dirty)
+        stats['flush_ms_avg'] = stats['flush_ms_total'] / stats['flushes'] if stats['flushes'] else 0.0
+        return stats
+
+
+_shutdown_hooks_installed = False
+
+
+def install_shutdown_hooks(flush_all: Callable[[], Any]) -> None:
+    """
+    Flush pending writes at interpreter exit and on SIGTERM.
+
+    The SIGTERM handler chains to any handler already installed (e.g. a
+    gunicorn worker's) and is only installed from the main thread.
+    """
+    global _shutdown_hooks_installed
+    if _shutdown_hooks_installed:
+        return
+    _shutdown_hooks_installed = True
+    atexit.register(flush_all)
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def on_sigterm(signum, frame):
+        flush_all()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
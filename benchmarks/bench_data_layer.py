@@ -0,0 +1,206 @@
+"""
+Scale benchmark for the data layer.
+
+For each scale, generates a synthetic database (see generate_data.py) in a
+temporary directory and times every public data_manager.py manager method and
+NotificationService method against it. Like pytest-benchmark, each case runs
+for at least --min-time seconds (write cases for --write-rounds rounds) and
+reports min/max/mean/median/stddev per call. The report is written as JSON, and
+--compare fails the run when a case got slower than --threshold times a
+previous report.
+
+    python benchmarks/bench_data_layer.py --scales 1000 10000 100000 --output report.json
+    python benchmarks/bench_data_layer.py --compare baseline.json --threshold 1.5
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import app.data_manager as data_manager  # noqa: E402
+from app.data_manager import (MockDataManager, DatacoreManager, TutorSessionManager,  # noqa: E402
+                              AssignmentManager, ScheduleManager, StudentBookingManager)
+from app.modules.notification.services import NotificationService  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+
+def build_cases(db_path: Path):
+    """Return (name, callable, is_write) for every benchmarked method, using IDs from the generated data."""
+    datacore = json.loads((db_path / 'mock_datacore.json').read_text(encoding='utf-8'))['users']
+    sessions = json.loads((db_path / 'mock_tutor_sessions.json').read_text(encoding='utf-8'))['sessions']
+    notifications = json.loads((db_path / 'mock_notification_dtb.json').read_text(encoding='utf-8'))['notifications']
+    bookings = json.loads((db_path / 'mock_student_bookings.json').read_text(encoding='utf-8'))['bookings']
+
+    # Pick records from the middle so linear scans are not flattered
+    student = next(u for u in datacore[len(datacore) // 2:] if u['role_in_school'] == 'student')
+    tutor = next(u for u in datacore[len(datacore) // 2:] if u['role_in_school'] == 'lecturer')
+    session = sessions[len(sessions) // 2]
+    booking = bookings[len(bookings) // 2]
+    # create_booking refuses a second booking of the same session, so rotate students
+    bookers = itertools.cycle(u['id'] for u in datacore if u['role_in_school'] == 'student')
+    notification_ids = itertools.cycle(n['id'] for n in notifications[len(notifications) // 2:])
+    deletable = iter(n['id'] for n in notifications)
+    course = tutor['subjects'][0]
+    notif_service = NotificationService()
+
+    return [
+        ('MockDataManager.load_json[cold]',
+         lambda: (MockDataManager.invalidate(), MockDataManager.load_json('mock_datacore.json')), False),
+        ('MockDataManager.load_json[warm]', lambda: MockDataManager.load_json('mock_datacore.json'), False),
+        ('DatacoreManager.get_user_profile', lambda: DatacoreManager.get_user_profile(student['id']), False),
+        ('DatacoreManager.get_all_users', DatacoreManager.get_all_users, False),
+        ('DatacoreManager.get_all_tutors', DatacoreManager.get_all_tutors, False),
+        ('DatacoreManager.get_all_students', DatacoreManager.get_all_students, False),
+        ('DatacoreManager.find_tutors_by_course', lambda: DatacoreManager.find_tutors_by_course(course), False),
+        ('DatacoreManager.get_tutor_by_id', lambda: DatacoreManager.get_tutor_by_id(tutor['id']), False),
+        ('DatacoreManager.get_student_by_id', lambda: DatacoreManager.get_student_by_id(student['id']), False),
+        ('TutorSessionManager.get_all_sessions', TutorSessionManager.get_all_sessions, False),
+        ('TutorSessionManager.get_sessions_by_tutor', lambda: TutorSessionManager.get_sessions_by_tutor(tutor['id']), False),
+        ('TutorSessionManager.get_session_by_id', lambda: TutorSessionManager.get_session_by_id(session['session_id']), False),
+        ('TutorSessionManager.create_session',
+         lambda: TutorSessionManager.create_session(tutor['id'], course, '2026-01-05T09:00:00.000Z'), True),
+        ('TutorSessionManager.update_session',
+         lambda: TutorSessionManager.update_session(session['session_id'], {'location': 'H6-101'}), True),
+        ('AssignmentManager.get_all_assignments', AssignmentManager.get_all_assignments, False),
+        ('AssignmentManager.get_assignments_by_tutor', lambda: AssignmentManager.get_assignments_by_tutor(tutor['id']), False),
+        ('AssignmentManager.get_assignments_by_student',
+         lambda: AssignmentManager.get_assignments_by_student(student['id']), False),
+        ('AssignmentManager.get_assignment_by_id', lambda: AssignmentManager.get_assignment_by_id('ASN001'), False),
+        ('AssignmentManager.create_assignment',
+         lambda: AssignmentManager.create_assignment(tutor['id'], student['id'], student['name'], course,
+                                                     'SE-K2024-1', '2026-01-05'), True),
+        ('ScheduleManager.get_schedule', ScheduleManager.get_schedule, False),
+        ('ScheduleManager.get_tutor_slots', lambda: ScheduleManager.get_tutor_slots(tutor['id']), False),
+        ('ScheduleManager.get_available_tutors_for_time_slot',
+         lambda: ScheduleManager.get_available_tutors_for_time_slot('2025-12-10T09:00:00Z', '2025-12-10T10:00:00Z'), False),
+        ('StudentBookingManager.get_all_bookings', StudentBookingManager.get_all_bookings, False),
+        ('StudentBookingManager.get_bookings_by_student',
+         lambda: StudentBookingManager.get_bookings_by_student(student['id']), False),
+        ('StudentBookingManager.get_bookings_by_tutor', lambda: StudentBookingManager.get_bookings_by_tutor(tutor['id']), False),
+        ('StudentBookingManager.get_booking_by_id', lambda: StudentBookingManager.get_booking_by_id(booking['booking_id']), False),
+        ('StudentBookingManager.create_booking',
+         lambda: StudentBookingManager.create_booking(next(bookers), session['tutor_id'], session['session_id'],
+                                                      session['course_name'], tutor['name'], session['date_time']), True),
+        ('StudentBookingManager.approve_booking', lambda: StudentBookingManager.approve_booking(booking['booking_id']), True),
+        ('StudentBookingManager.reject_booking', lambda: StudentBookingManager.reject_booking(booking['booking_id']), True),
+        ('StudentBookingManager.cancel_booking', lambda: StudentBookingManager.cancel_booking(booking['booking_id']), True),
+        ('NotificationService._load_notifications', notif_service._load_notifications, False),
+        ('NotificationService.get_user_notifications', lambda: notif_service.get_user_notifications(student['id']), False),
+        ('NotificationService.get_unread_notifications_count',
+         lambda: notif_service.get_unread_notifications_count(student['id']), False),
+        ('NotificationService.send_manual_notification',
+         lambda: notif_service.send_manual_notification(student['id'], 'student', 'Reminder', 'Session soon', tutor['id']), True),
+        ('NotificationService.notify_booking_created',
+         lambda: notif_service.notify_booking_created(student['id'], tutor['id'], booking), True),
+        ('NotificationService.mark_notification_as_read',
+         lambda: notif_service.mark_notification_as_read(next(notification_ids)), True),
+        ('NotificationService.mark_all_as_read', lambda: notif_service.mark_all_as_read(student['id']), True),
+        ('NotificationService.delete_notification', lambda: notif_service.delete_notification(next(deletable)), True),
+    ]
+
+
+def run_case(fn, is_write: bool, min_time: float, write_rounds: int, max_rounds: int):
+    """Time fn like pytest-benchmark's pedantic mode and return per-call statistics in milliseconds."""
+    fn()  # warm-up (also primes caches for warm cases)
+    timings = []
+    deadline = time.perf_counter() + min_time
+    rounds = write_rounds if is_write else max_rounds
+    while len(timings) < rounds:
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+        if not is_write and len(timings) >= 3 and time.perf_counter() >= deadline:
+            break
+    return {
+        'rounds': len(timings),
+        'min_ms': min(timings),
+        'max_ms': max(timings),
+        'mean_ms': statistics.fmean(timings),
+        'median_ms': statistics.median(timings),
+        'stddev_ms': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def run_scale(users: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp)
+        started = time.perf_counter()
+        counts = generate(db_path, users, args.seed)
+        print(f"\n== {users} users (generated in {time.perf_counter() - started:.1f}s)")
+
+        original_path = data_manager.BASE_DB_PATH
+        data_manager.BASE_DB_PATH = db_path
+        try:
+            MockDataManager.configure({'DATA_WRITE_MODE': args.write_mode, 'DATA_STORAGE_ENGINE': 'json'})
+            results = {}
+            for name, fn, is_write in build_cases(db_path):
+                if args.filter and args.filter not in name:
+                    continue
+                stats = run_case(fn, is_write, args.min_time, args.write_rounds, args.max_rounds)
+                results[name] = stats
+                print(f"{name:<58} {stats['median_ms']:>10.3f} ms  (rounds={stats['rounds']})")
+            MockDataManager.flush_pending()
+        finally:
+            data_manager.BASE_DB_PATH = original_path
+            MockDataManager.invalidate()
+    return {'records': counts, 'results': results}
+
+
+def compare(report: dict, baseline_path: Path, threshold: float) -> list:
+    """Return (scale, case, old median, new median) for every case slower than threshold x baseline."""
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    regressions = []
+    for scale, data in report['scales'].items():
+        old_results = baseline.get('scales', {}).get(scale, {}).get('results', {})
+        for name, stats in data['results'].items():
+            old = old_results.get(name)
+            if old and stats['median_ms'] > old['median_ms'] * threshold:
+                regressions.append((scale, name, old['median_ms'], stats['median_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000, 100000], help='Numbers of users')
+    parser.add_argument('--output', default='data_layer_report.json', help='JSON report path')
+    parser.add_argument('--compare', help='Previous report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.5, help='Allowed slowdown factor vs --compare')
+    parser.add_argument('--filter', help='Only run cases whose name contains this string')
+    parser.add_argument('--write-mode', default='snapshot', choices=['snapshot', 'wal', 'write_behind'])
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per read case')
+    parser.add_argument('--max-rounds', type=int, default=1000, help='Maximum rounds per read case')
+    parser.add_argument('--write-rounds', type=int, default=5, help='Rounds per write case')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'write_mode': args.write_mode,
+        'scales': {str(users): run_scale(users, args) for users in args.scales},
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        regressions = compare(report, Path(args.compare), args.threshold)
+        for scale, name, old, new in regressions:
+            print(f"REGRESSION {scale} users {name}: {old:.3f} ms -> {new:.3f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
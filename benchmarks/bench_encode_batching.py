@@ -0,0 +1,90 @@
+"""
+Query encoding under concurrency: one model.encode call per query vs. the
+EncodeBatcher, with --clients threads each encoding --queries distinct queries.
+
+Reports throughput and p50/p95 per-query latency. Needs sentence-transformers
+(the model is downloaded on first use).
+
+    python benchmarks/bench_encode_batching.py --clients 16 --queries 50
+    python benchmarks/bench_encode_batching.py --wait-ms 0 2 5 10 --max-batch 64
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.student.encodeBatcher import EncodeBatcher  # noqa: E402
+from app.modules.student.tutorSearchService import MODEL_NAME  # noqa: E402
+
+WORDS = ['introduction', 'advanced', 'operating', 'systems', 'algorithms', 'network', 'security', 'database',
+         'machine', 'learning', 'software', 'architecture', 'web', 'programming', 'cryptography', 'data', 'mining']
+
+
+def make_queries(count: int, offset: int):
+    """Distinct short course-like queries, so no two clients share a text."""
+    return [' '.join(WORDS[(offset + i * 7 + j) % len(WORDS)] for j in range(3)) + f" {offset}-{i}"
+            for i in range(count)]
+
+
+def run_clients(encode_one, clients: int, queries: int):
+    """Run clients threads that each encode their queries one at a time; return (seconds, latencies in ms)."""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+
+    def client(offset):
+        mine = []
+        barrier.wait()
+        for text in make_queries(queries, offset):
+            started = time.perf_counter()
+            encode_one(text)
+            mine.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(c * queries,)) for c in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def report(label, seconds, latencies):
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{label:<28} {len(latencies) / seconds:9.1f} queries/s   p50 {statistics.median(latencies):8.2f} ms"
+          f"   p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent request threads')
+    parser.add_argument('--queries', type=int, default=50, help='Queries per client')
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--wait-ms', type=float, nargs='+', default=[0, 2, 5, 10])
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(MODEL_NAME)
+    model.encode(['warm up'])
+
+    seconds, latencies = run_clients(lambda text: model.encode([text]), args.clients, args.queries)
+    report('unbatched', seconds, latencies)
+    for wait_ms in args.wait_ms:
+        batcher = EncodeBatcher(model.encode, max_batch=args.max_batch, max_wait_ms=wait_ms)
+        seconds, latencies = run_clients(lambda text: batcher.submit(text).result(), args.clients, args.queries)
+        stats = batcher.stats()
+        batcher.stop()
+        report(f"batched wait={wait_ms:g}ms", seconds, latencies)
+        print(f"{'':<28} avg batch {stats['avg_batch']:.1f}, largest {stats['max_batch']}")
+
+
+if __name__ == '__main__':
+    main()
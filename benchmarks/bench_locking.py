@@ -0,0 +1,67 @@
+"""
+Reader throughput of the JSON store under shared vs exclusive file locks.
+
+Each worker process repeatedly takes the lock on a copy of
+mock_datacore.json and parses it. With shared locks, throughput should grow
+with the number of processes; with exclusive locks, readers serialize.
+
+    python benchmarks/bench_locking.py [--seconds 2] [--procs 1 2 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.file_lock import FileLock  # noqa: E402
+
+
+def _reader(path: str, exclusive: bool, seconds: float, counter):
+    lock = FileLock(Path(path))
+    reads = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        with (lock.exclusive() if exclusive else lock.shared()):
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+        reads += 1
+    with counter.get_lock():
+        counter.value += reads
+
+
+def run(path: Path, procs: int, exclusive: bool, seconds: float) -> float:
+    counter = multiprocessing.Value('i', 0)
+    workers = [multiprocessing.Process(target=_reader, args=(str(path), exclusive, seconds, counter))
+               for _ in range(procs)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return counter.value / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--procs', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'mock_datacore.json'
+        shutil.copy(ROOT / 'database' / 'mock_datacore.json', path)
+        print(f"{'procs':>5}  {'shared reads/s':>15}  {'exclusive reads/s':>18}")
+        for procs in args.procs:
+            shared = run(path, procs, False, args.seconds)
+            exclusive = run(path, procs, True, args.seconds)
+            print(f"{procs:>5}  {shared:>15.0f}  {exclusive:>18.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Quantized embeddings: memory footprint, exact-search latency and recall@k of
+float16 and int8 (per-row scale) storage against float32.
+
+Uses the same synthetic clustered vectors as bench_vector_index.py; the
+float32 exact search gives the ground truth for recall.
+
+    python benchmarks/bench_quantization.py --sizes 100000 1000000
+    python benchmarks/bench_quantization.py --sizes 50000 --k 5 --dim 768
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.student.quantization import quantize  # noqa: E402
+from app.modules.student.vectorIndex import ExactIndex  # noqa: E402
+from bench_vector_index import make_vectors, time_queries  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--dim', type=int, default=384, help='Embedding size (all-MiniLM-L6-v2: 384)')
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--topics', type=int, default=200, help='Clusters in the synthetic data')
+    parser.add_argument('--noise', type=float, default=3.0, help='Spread around each topic')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        matrix = make_vectors(n, args.dim, args.topics, args.noise, args.seed)
+        rng = np.random.default_rng(args.seed + 1)
+        queries = matrix[rng.integers(n, size=args.queries)] + \
+            0.5 * rng.standard_normal((args.queries, args.dim), dtype=np.float32) / np.sqrt(args.dim)
+        queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+        print(f"\n== {n} vectors x {args.dim}")
+
+        latencies, truth = time_queries(ExactIndex(matrix).search, queries, args.k)
+        print(f"  {'float32':<8} {matrix.nbytes / 2**20:9.1f} MiB   p50 {statistics.median(latencies):8.3f} ms"
+              f"   recall@{args.k} {1:6.3f}")
+        for kind in ('float16', 'int8'):
+            started = time.perf_counter()
+            quantized = quantize(matrix, kind)
+            build_s = time.perf_counter() - started
+            latencies, found = time_queries(ExactIndex(quantized).search, queries, args.k)
+            recall = statistics.fmean(len(np.intersect1d(a, b)) / len(a) for a, b in zip(truth, found))
+            print(f"  {kind:<8} {quantized.nbytes / 2**20:9.1f} MiB   p50 {statistics.median(latencies):8.3f} ms"
+                  f"   recall@{args.k} {recall:6.3f}   (quantized in {build_s:.2f} s)")
+        del matrix
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Search quality and latency of tutorSearchService.
+
+Runs the labeled queries in search_queries.json (course codes, Vietnamese and
+English course names, free-text needs) through search_tutors_by_meaning() for
+every combination of --retrieval, --index and --cache, and reports per setting:
+
+    recall@k    found relevant tutors / min(k, relevant tutors), averaged over queries
+    mrr         mean reciprocal rank of the first relevant tutor (0 if none in the top k)
+    latency     p50/p95/p99 of --repeats sequential passes over the query set
+    throughput  queries/s with --concurrency searches in flight
+
+Each setting runs in its own process (the service holds one model and index
+per process), against database/ and the real model. The report is written as
+JSON; --min-recall / --min-mrr gate on absolute quality and --compare fails
+the run when a setting lost quality or got slower than --threshold times a
+previous report, so the exit status can gate a release.
+
+    python benchmarks/bench_search_quality.py --output search_quality_report.json
+    python benchmarks/bench_search_quality.py --retrieval hybrid --index exact ivf --min-recall 0.8
+    python benchmarks/bench_search_quality.py --compare baseline.json --threshold 1.5
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+QUERIES = Path(__file__).resolve().parent / 'search_queries.json'
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def score(found, relevant, k):
+    """Return (recall@k, reciprocal rank) of one ranked result list."""
+    hits = [i for i, tutor_id in enumerate(found[:k]) if tutor_id in relevant]
+    return len(hits) / min(k, len(relevant)), 1 / (hits[0] + 1) if hits else 0.0
+
+
+async def run_setting(service, queries, args) -> dict:
+    """Measure one configured service; runs inside the worker process."""
+    latencies, per_query = [], []
+    for repeat in range(args.repeats):
+        for item in queries:
+            started = time.perf_counter()
+            results = await service.search_tutors_by_meaning(item['query'], top_k=args.k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if repeat == 0:
+                recall, rr = score([r['id'] for r in results], set(item['relevant']), args.k)
+                per_query.append({'query': item['query'], 'category': item['category'], 'recall': recall, 'rr': rr,
+                                  'found': [r['id'] for r in results]})
+
+    rejected = 0
+
+    async def client(texts):
+        nonlocal rejected
+        for text in texts:
+            try:
+                await service.search_tutors_by_meaning(text, top_k=args.k)
+            except service.PoolSaturated:
+                rejected += 1
+
+    texts = [item['query'] for item in queries] * args.repeats
+    started = time.perf_counter()
+    await asyncio.gather(*(client(texts[c::args.concurrency]) for c in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    categories = {}
+    for category, rows in itertools.groupby(sorted(per_query, key=lambda r: r['category']), lambda r: r['category']):
+        rows = list(rows)
+        categories[category] = {'queries': len(rows), 'recall_at_k': statistics.fmean(r['recall'] for r in rows),
+                                'mrr': statistics.fmean(r['rr'] for r in rows)}
+    return {
+        'lecturers': service.status()['lecturer_count'],
+        'recall_at_k': statistics.fmean(r['recall'] for r in per_query),
+        'mrr': statistics.fmean(r['rr'] for r in per_query),
+        'categories': categories,
+        'latency_ms': {'p50': percentile(latencies, 0.5), 'p95': percentile(latencies, 0.95),
+                       'p99': percentile(latencies, 0.99), 'mean': statistics.fmean(latencies)},
+        'throughput_qps': len(texts) / elapsed,
+        'rejected': rejected,
+        'caches': service.cache_stats(),
+        'misses': [{'query': r['query'], 'found': r['found']} for r in per_query if r['recall'] == 0],
+    }
+
+
+def worker(settings: dict, args) -> None:
+    """Configure the service with settings, run the query set and print the result as JSON."""
+    from app.modules.student import tutorSearchService as service
+    service.configure(settings)
+    if not service.wait_until_ready(args.timeout):
+        result = {'error': service.status()['error'] or 'index not ready'}
+    else:
+        queries = json.loads(Path(args.queries).read_text(encoding='utf-8'))['queries']
+        result = asyncio.run(run_setting(service, queries, args))
+    print(json.dumps(result))
+
+
+def run_settings(name: str, settings: dict, args) -> dict:
+    command = [sys.executable, __file__, '--worker', json.dumps(settings), '--queries', str(args.queries),
+               '--k', str(args.k), '--repeats', str(args.repeats), '--concurrency', str(args.concurrency),
+               '--timeout', str(args.timeout)]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        result = {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'no output'}
+    else:
+        result = json.loads(lines[-1])
+    result['settings'] = {key: value for key, value in settings.items() if key != 'EMBEDDING_STORE_DIR'}
+    if 'error' in result:
+        print(f"{name:<28} FAILED: {result['error']}")
+    else:
+        latency = result['latency_ms']
+        print(f"{name:<28} recall@{args.k} {result['recall_at_k']:6.3f}   mrr {result['mrr']:6.3f}"
+              f"   p50 {latency['p50']:7.2f} ms   p95 {latency['p95']:7.2f} ms   p99 {latency['p99']:7.2f} ms"
+              f"   {result['throughput_qps']:8.1f} q/s")
+    return result
+
+
+def check(report: dict, args) -> list:
+    """Return a message for every gate the report fails."""
+    failures = []
+    baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))['settings'] if args.compare else {}
+    for name, result in report['settings'].items():
+        if 'error' in result:
+            failures.append(f"{name}: {result['error']}")
+            continue
+        if result['recall_at_k'] < args.min_recall:
+            failures.append(f"{name}: recall@{args.k} {result['recall_at_k']:.3f} < {args.min_recall}")
+        if result['mrr'] < args.min_mrr:
+            failures.append(f"{name}: mrr {result['mrr']:.3f} < {args.min_mrr}")
+        old = baseline.get(name)
+        if old and 'error' not in old:
+            for metric in ('recall_at_k', 'mrr'):
+                if result[metric] < old[metric] - args.quality_tolerance:
+                    failures.append(f"{name}: {metric} {old[metric]:.3f} -> {result[metric]:.3f}")
+            if result['latency_ms']['p95'] > old['latency_ms']['p95'] * args.threshold:
+                failures.append(f"{name}: p95 {old['latency_ms']['p95']:.2f} ms -> {result['latency_ms']['p95']:.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--queries', default=str(QUERIES), help='Labeled query set')
+    parser.add_argument('--k', type=int, default=5, help='Results per search (top_k)')
+    parser.add_argument('--retrieval', nargs='+', default=['hybrid', 'semantic'])
+    parser.add_argument('--index', nargs='+', default=['exact', 'ivf'])
+    parser.add_argument('--cache', nargs='+', default=['off', 'on'], choices=['off', 'on'])
+    parser.add_argument('--dtype', default='float32', choices=['float32', 'float16', 'int8'])
+    parser.add_argument('--repeats', type=int, default=5, help='Passes over the query set')
+    parser.add_argument('--concurrency', type=int, default=8, help='Searches in flight for the throughput run')
+    parser.add_argument('--timeout', type=float, default=600, help='Seconds to wait for each warm-up')
+    parser.add_argument('--output', default='search_quality_report.json', help='JSON report path')
+    parser.add_argument('--min-recall', type=float, default=0.0, help='Fail below this recall@k')
+    parser.add_argument('--min-mrr', type=float, default=0.0, help='Fail below this MRR')
+    parser.add_argument('--compare', help='Previous report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.5, help='Allowed p95 slowdown factor vs --compare')
+    parser.add_argument('--quality-tolerance', type=float, default=0.0,
+                        help='Allowed recall@k / MRR drop vs --compare')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(json.loads(args.worker), args)
+        return
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'queries': len(json.loads(Path(args.queries).read_text(encoding='utf-8'))['queries']),
+        'k': args.k,
+        'settings': {},
+    }
+    # One store for all settings, so the lecturers are encoded once
+    with tempfile.TemporaryDirectory() as store_dir:
+        for retrieval, index, cache in itertools.product(args.retrieval, args.index, args.cache):
+            name = f"{retrieval}/{index}/cache={cache}"
+            settings = {
+                'EMBEDDING_STORE_DIR': store_dir,
+                'SEMANTIC_SEARCH_REINDEX_SECONDS': 0,
+                'SEMANTIC_SEARCH_RETRIEVAL': retrieval,
+                'SEMANTIC_SEARCH_INDEX': index,
+                'SEMANTIC_SEARCH_EMBEDDING_DTYPE': args.dtype,
+                'SEMANTIC_SEARCH_QUERY_CACHE_SIZE': 1024 if cache == 'on' else 0,
+                'SEMANTIC_SEARCH_RESULT_CACHE_SIZE': 1024 if cache == 'on' else 0,
+            }
+            report['settings'][name] = run_settings(name, settings, args)
+
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\nReport written to {args.output}")
+
+    failures = check(report, args)
+    for failure in failures:
+        print(f"FAILED {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start time of the JSON files vs the binary snapshot.
+
+Generates a database for --users users in a temporary directory (see
+generate_data.py). JSON boot parses them the way the app does today: every
+file is parsed by its connector or manager, and mock_datacore.json twice (by
+MockDatacore and by DatacoreManager). Snapshot boot loads one file, checks
+every entry for staleness and serves all readers from it.
+
+    python benchmarks/bench_snapshot.py [--users 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app import snapshot  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp)
+        generate(db_path, args.users)
+        snapshot_file = db_path / 'snapshot.bin'
+        snapshot.dump_snapshot(snapshot_file, db_path)
+
+        def json_boot():
+            for file_path in sorted(db_path.glob('*.json')) + [db_path / 'mock_datacore.json']:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+
+        def snapshot_boot():
+            snapshot.use(snapshot_file)
+            snapshot._loaded = None
+            for name in ('mock_sso.json', 'mock_role_map.json', 'mock_datacore.json'):
+                assert snapshot.lookup(db_path / name) is not None
+            assert len(snapshot.fresh_entries(db_path)) == len(list(db_path.glob('*.json')))
+
+        json_bytes = sum(p.stat().st_size for p in db_path.glob('*.json'))
+        json_time = best_of(args.repeat, json_boot)
+        snapshot_time = best_of(args.repeat, snapshot_boot)
+        print(f"users: {args.users}")
+        print(f"json:     {json_time * 1000:8.1f} ms  ({json_bytes / 1e6:.1f} MB)")
+        print(f"snapshot: {snapshot_time * 1000:8.1f} ms  ({snapshot_file.stat().st_size / 1e6:.1f} MB)")
+        print(f"speedup:  {json_time / snapshot_time:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Server startup time: how long create_app() takes, and how long until semantic
+tutor search is ready.
+
+Each run uses a fresh interpreter so imports are measured cold.
+
+    python benchmarks/bench_startup.py [--runs 3]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r'''
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from app import create_app
+create_app()
+app_ready = time.perf_counter() - started
+from app.modules.student import tutorSearchService
+search_ready = tutorSearchService.wait_until_ready(timeout=600)
+print(json.dumps({
+    'create_app_s': app_ready,
+    'search_ready_s': time.perf_counter() - started if search_ready else None,
+    'search_status': tutorSearchService.status()['status'],
+}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, '-c', PROBE, str(ROOT)], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"create_app():        {statistics.median(r['create_app_s'] for r in runs):7.2f} s (median of {len(runs)})")
+    ready = [r['search_ready_s'] for r in runs if r['search_ready_s'] is not None]
+    if ready:
+        print(f"semantic search up:  {statistics.median(ready):7.2f} s")
+    else:
+        print(f"semantic search:     {runs[-1]['search_status']} (exact-match fallback only)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Vector index benchmark: exact top-k vs. IVF at several nprobe settings.
+
+Embeddings are synthetic but clustered like real sentence embeddings (unit
+vectors scattered around random topic centres). For each size, the exact
+backend gives the ground truth; every IVF setting reports build time, query
+latency and recall@k against it.
+
+    python benchmarks/bench_vector_index.py --sizes 10000 100000 1000000
+    python benchmarks/bench_vector_index.py --sizes 100000 --nprobe 1 4 16 64 --lists 512
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.student.vectorIndex import ExactIndex, IVFIndex  # noqa: E402
+
+CHUNK = 100000
+
+
+def make_vectors(n: int, dim: int, topics: int, noise: float, seed: int) -> np.ndarray:
+    """Return n unit vectors clustered around `topics` random centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim), dtype=np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    matrix = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, CHUNK):
+        size = min(CHUNK, n - start)
+        chunk = centres[rng.integers(topics, size=size)]
+        chunk += noise * rng.standard_normal((size, dim), dtype=np.float32) / np.sqrt(dim)
+        chunk /= np.linalg.norm(chunk, axis=1, keepdims=True)
+        matrix[start:start + size] = chunk
+    return matrix
+
+
+def time_queries(search, queries, k):
+    """Run every query and return (per-query latencies in ms, results)."""
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        indices, _ = search(query, k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append(indices)
+    return latencies, results
+
+
+def report(label, build_s, latencies, recall=None):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    recall_str = f"{recall:8.3f}" if recall is not None else f"{'1.000':>8}"
+    print(f"  {label:<26} build {build_s:7.2f} s   p50 {statistics.median(latencies):8.3f} ms"
+          f"   p95 {p95:8.3f} ms   recall {recall_str}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--dim', type=int, default=384, help='Embedding size (all-MiniLM-L6-v2: 384)')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--lists', type=int, default=0, help='IVF lists (0 = about sqrt(n))')
+    parser.add_argument('--topics', type=int, default=200, help='Clusters in the synthetic data')
+    parser.add_argument('--noise', type=float, default=3.0, help='Spread around each topic')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        started = time.perf_counter()
+        matrix = make_vectors(n, args.dim, args.topics, args.noise, args.seed)
+        rng = np.random.default_rng(args.seed + 1)
+        queries = matrix[rng.integers(n, size=args.queries)] + \
+            0.5 * rng.standard_normal((args.queries, args.dim), dtype=np.float32) / np.sqrt(args.dim)
+        queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+        print(f"\n== {n} vectors x {args.dim} (generated in {time.perf_counter() - started:.1f}s)")
+
+        exact = ExactIndex(matrix)
+        latencies, truth = time_queries(exact.search, queries, args.k)
+        report('exact', 0.0, latencies)
+
+        started = time.perf_counter()
+        ivf = IVFIndex(matrix, n_lists=args.lists, seed=args.seed)
+        build_s = time.perf_counter() - started
+        for nprobe in args.nprobe:
+            latencies, found = time_queries(lambda q, k: ivf.search(q, k, nprobe=nprobe), queries, args.k)
+            recall = statistics.fmean(len(np.intersect1d(a, b)) / len(a) for a, b in zip(truth, found))
+            report(f"ivf lists={len(ivf.centroids)} nprobe={nprobe}", build_s, latencies, recall)
+        del matrix, exact, ivf
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Synthetic data generator for the JSON database.
+
+Writes a consistent set of database files (datacore, SSO, role map, schedule,
+tutor sessions, bookings, assignments, notifications, auth sessions) for a
+given number of users. Every booking, assignment and notification refers to
+users, tutors and sessions that exist in the same set, and the output is
+deterministic for a given --seed.
+
+    python benchmarks/generate_data.py --users 100000 --out /tmp/tss_db
+"""
+
+import argparse
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict
+
+COURSES = [
+    '[CO2017] - Hệ điều hành', '[CO2039] - Lập trình nâng cao', '[CO3005] - Nguyên lý Ngôn ngữ Lập trình',
+    '[CO3017] - Kiến trúc Phần mềm', '[CO3021] - Hệ Quản trị Cơ sở Dữ Liệu', '[CO3029] - Khai phá Dữ liệu',
+    '[CO3031] - Phân tích và Thiết kế Giải Thuật', '[CO3033] - Bảo mật Hệ thống Thông tin',
+    '[CO3047] - Mạng máy tính nâng cao', '[CO3049] - Lập trình Web', '[CO3065] - Công nghệ Phần mềm Nâng cao',
+    '[CO3069] - Mật mã và An ninh mạng', '[CO3093] - Mạng máy tính', '[CO3129] - Bảo mật Phần mềm',
+    '[CO3151] - Quản trị mạng', '[CO3153] - Đánh giá an toàn mạng máy tính', '[CO4025] - Mạng xã hội và Thông tin',
+]
+DEPARTMENTS = ['Software Engineering', 'Computer Science', 'Network Computing']
+FAMILY_NAMES = ['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng', 'Bùi', 'Đỗ']
+GIVEN_NAMES = ['An', 'Bình', 'Chi', 'Dũng', 'Giang', 'Hà', 'Hải', 'Hùng', 'Khoa', 'Lan', 'Linh', 'Minh',
+               'Nam', 'Ngọc', 'Phúc', 'Quân', 'Sơn', 'Thảo', 'Thắng', 'Trang', 'Tú', 'Vy']
+BIOS = [
+    'Expert in object-oriented programming and software development.',
+    'Researches distributed systems and cloud computing.',
+    'Works on network security, cryptography and secure protocols.',
+    'Focuses on databases, data mining and machine learning.',
+    'Teaches algorithms, complexity and competitive programming.',
+]
+BASE_TIME = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+# Per user, roughly; lecturers are 1 in LECTURER_RATIO users
+LECTURER_RATIO = 20
+SESSIONS_PER_TUTOR = 5
+SLOTS_PER_TUTOR = 4
+BOOKINGS_PER_STUDENT = 2
+ASSIGNMENTS_PER_STUDENT = 1
+NOTIFICATIONS_PER_USER = 3
+AUTH_SESSION_RATIO = 10
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _write(out_dir: Path, filename: str, data, indent: int = 2):
+    with open(out_dir / filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def generate(out_dir: Path, users: int, seed: int = 2025) -> Dict[str, int]:
+    """
+    Write a synthetic database of about `users` users into out_dir.
+
+    Returns:
+        Number of records written per file.
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lecturer_count = max(1, users // LECTURER_RATIO)
+    student_count = max(1, users - lecturer_count)
+
+    datacore, sso, role_map = [], [], []
+    lecturers, students = [], []
+    for i in range(lecturer_count):
+        lecturer_id = f"LECTURER_{i + 1:03d}"
+        name = f"{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)} {rng.choice(GIVEN_NAMES)}"
+        lecturer = {
+            'id': lecturer_id, 'name': name, 'faculty': 'Computer Science',
+            'department': rng.choice(DEPARTMENTS), 'role_in_school': 'lecturer', 'lecturer_id': lecturer_id,
+            'subjects': rng.sample(COURSES, 3), 'qualifications': ['Ph.D. in Computer Science'],
+            'bio': rng.choice(BIOS), 'rating': round(rng.uniform(3.5, 5.0), 1),
+            'email': f"lecturer{i + 1}@hcmut.edu.vn", 'phone': f"+84{330000000 + i}",
+            'avatar_url': None, 'last_modified': '2025-11-27T09:00:00Z'
+        }
+        lecturers.append(lecturer)
+    for i in range(student_count):
+        student_id = f"SE{2025000000 + i + 1}"
+        students.append({
+            'id': student_id, 'name': f"{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)} {rng.choice(GIVEN_NAMES)}",
+            'faculty': 'Computer Science', 'department': rng.choice(DEPARTMENTS), 'role_in_school': 'student',
+            'student_id': student_id, 'courses': rng.sample(COURSES, 3),
+            'email': f"student{i + 1}@hcmut.edu.vn", 'phone': f"+84{340000000 + i}",
+            'avatar_url': None, 'last_modified': '2025-11-27T08:00:00Z'
+        })
+    for user in students + lecturers:
+        datacore.append(user)
+        username = user['email'].split('@')[0]
+        sso.append({'id': user['id'], 'username': username, 'password': f"{username}2025!",
+                    'email': user['email'], 'created_at': '2025-09-01T10:00:00Z', 'last_login': None})
+        role_map.append({'sso_id': user['id'], 'role': 'tutor' if user['role_in_school'] == 'lecturer' else 'student'})
+
+    schedule, sessions = {}, []
+    slot_id = 100
+    for lecturer in lecturers:
+        slots = []
+        for _ in range(SLOTS_PER_TUTOR):
+            slot_id += 1
+            start = BASE_TIME + timedelta(days=rng.randrange(60), hours=rng.randrange(7, 18))
+            slots.append({'id': slot_id, 'start': _iso(start), 'end': _iso(start + timedelta(hours=2))})
+        schedule[lecturer['id']] = {'tutor_id': lecturer['id'], 'slots': slots}
+        for _ in range(SESSIONS_PER_TUTOR):
+            start = BASE_TIME + timedelta(days=rng.randrange(60), hours=rng.randrange(7, 18))
+            sessions.append({
+                'session_id': f"TS{len(sessions) + 1:03d}", 'tutor_id': lecturer['id'],
+                'course_name': rng.choice(lecturer['subjects']), 'date_time': start.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'location': f"H6-{rng.randrange(100, 800)}", 'status': 'scheduled', 'student_count': 0,
+                'duration_minutes': 60
+            })
+
+    lecturers_by_id = {lecturer['id']: lecturer for lecturer in lecturers}
+    bookings, assignments, notifications = [], [], []
+    for student in students:
+        for _ in range(BOOKINGS_PER_STUDENT):
+            session = rng.choice(sessions)
+            session['student_count'] += 1
+            bookings.append({
+                'booking_id': f"BK{len(bookings) + 1:03d}", 'student_id': student['id'],
+                'tutor_id': session['tutor_id'], 'session_id': session['session_id'],
+                'course_name': session['course_name'], 'tutor_name': lecturers_by_id[session['tutor_id']]['name'],
+                'date_time': session['date_time'].replace('.000Z', 'Z'),
+                'status': rng.choice(['pending', 'confirmed', 'cancelled']), 'booked_at': '2025-11-27T08:00:00Z'
+            })
+        for _ in range(ASSIGNMENTS_PER_STUDENT):
+            lecturer = rng.choice(lecturers)
+            assignments.append({
+                'assignment_id': f"ASN{len(assignments) + 1:03d}", 'tutor_id': lecturer['id'],
+                'student_id': student['id'], 'student_name': student['name'],
+                'course_name': rng.choice(lecturer['subjects']), 'class_name': 'SE-K2024-1',
+                'start_date': '2025-11-20', 'rating': round(rng.uniform(3.0, 5.0), 1)
+            })
+    for user in students + lecturers:
+        is_student = user['role_in_school'] == 'student'
+        for _ in range(NOTIFICATIONS_PER_USER):
+            created = BASE_TIME - timedelta(minutes=rng.randrange(60 * 24 * 30))
+            notifications.append({
+                'id': f"notif_{len(notifications) + 1:08x}", 'recipient_id': user['id'],
+                'recipient_type': 'student' if is_student else 'tutor', 'sender_id': 'SYSTEM',
+                'title': 'Schedule created', 'message': 'Teacher has just created a schedule',
+                'type': 'event', 'event_type': 'schedule_create', 'related_data': {},
+                'is_read': rng.random() < 0.5, 'created_at': created.isoformat(), 'updated_at': None
+            })
+    enrollments = [{'id': i + 1, 'student_id': a['student_id'], 'tutor_id': a['tutor_id'], 'course_id': f"course_{i + 1:03d}"}
+                   for i, a in enumerate(assignments)]
+
+    auth_sessions = []
+    for user in rng.sample(datacore, max(1, len(datacore) // AUTH_SESSION_RATIO)):
+        auth_sessions.append({
+            'session_id': str(uuid.UUID(int=rng.getrandbits(128), version=4)), 'sso_id': user['id'],
+            'username': user['email'].split('@')[0], 'role': 'student' if user['role_in_school'] == 'student' else 'tutor',
+            'email': user['email'], 'display_name': user['name'], 'created_at': '2025-11-27T06:55:15+00:00',
+            'last_activity': '2025-11-27T06:55:15+00:00', 'expires_at': None
+        })
+
+    _write(out_dir, 'mock_datacore.json', {'users': datacore})
+    _write(out_dir, 'mock_sso.json', {'users': sso})
+    _write(out_dir, 'mock_role_map.json', {'mappings': role_map})
+    _write(out_dir, 'mock_schedule.json', schedule, indent=4)
+    _write(out_dir, 'mock_tutor_sessions.json', {'sessions': sessions})
+    _write(out_dir, 'mock_student_bookings.json', {'bookings': bookings})
+    _write(out_dir, 'mock_assignments.json', {'assignments': assignments})
+    _write(out_dir, 'mock_notification_dtb.json', {'notifications': notifications, 'enrollments': enrollments})
+    _write(out_dir, 'mock_sessions.json', {'sessions': auth_sessions})
+    _write(out_dir, 'mock_db.json', {'users': [], 'sessions': []}, indent=4)
+    return {
+        'mock_datacore.json': len(datacore), 'mock_sso.json': len(sso), 'mock_role_map.json': len(role_map),
+        'mock_schedule.json': slot_id - 100, 'mock_tutor_sessions.json': len(sessions),
+        'mock_student_bookings.json': len(bookings), 'mock_assignments.json': len(assignments),
+        'mock_notification_dtb.json': len(notifications), 'mock_sessions.json': len(auth_sessions),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='Number of users (students + lecturers)')
+    parser.add_argument('--out', required=True, help='Output directory (never the live database/ folder)')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    out_dir = Path(args.out).resolve()
+    if out_dir == (Path(__file__).resolve().parent.parent / 'database'):
+        sys.exit('Refusing to overwrite the fixture database; choose another --out directory')
+    for name, count in generate(out_dir, args.users, args.seed).items():
+        print(f"{name}: {count} records")
+
+
+if __name__ == '__main__':
+    main()